@@ -0,0 +1,499 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from data_info.catalog import (
+    ProductDictionary,
+    decode_products,
+    encode_sheet,
+    rows_frame
+)
+from data_info.outliers import score_prices
+from data_info.schema import (
+    SHEET_DISTRIBUTION,
+    SHEET_POS,
+    SHEET_PRICES,
+    SHEET_PRODUCTS,
+    SHEET_SURVEYS
+)
+from data_info.search import PosIndex
+from data_info.synthetic import generate_tables
+from data_info.transforms import (
+    brand_present,
+    brand_presence,
+    cascade_options,
+    columns_to_frame,
+    filter_products,
+    frame_to_columns,
+    last_readings,
+    mean_by,
+    normalize_code,
+    price_groups,
+    price_summary,
+    product_codes,
+    sum_by,
+    value_counts
+)
+
+
+# =========================================================
+# BENCHMARKS
+# =========================================================
+
+# Chaque cas est chronométré sur des tables synthétiques ;
+# les résultats sont ajoutés à RESULTS_PATH et comparés à la
+# mesure précédente du même cas à la même taille.
+
+RESULTS_PATH = os.path.join(
+    "benchmarks",
+    "results.jsonl"
+)
+
+DEFAULT_SIZES = [
+    1_000,
+    10_000,
+    100_000
+]
+
+REGRESSION_THRESHOLD = 1.25
+
+
+def timed(func, repeat):
+
+    timings = []
+
+    for _ in range(repeat):
+
+        started = time.perf_counter()
+
+        func()
+
+        timings.append(
+            time.perf_counter() - started
+        )
+
+    return timings
+
+
+def build_cases(tables, seed=0):
+
+    rng = np.random.default_rng(seed)
+
+    products = tables[SHEET_PRODUCTS]
+    distribution = tables[SHEET_DISTRIBUTION]
+    prices = tables[SHEET_PRICES]
+    surveys = tables[SHEET_SURVEYS]
+    pos = tables[SHEET_POS]
+
+    payloads = {
+        name: frame_to_columns(df)
+        for name, df in tables.items()
+    }
+
+    # Distribution codée par ID_Produit (data_info.catalog),
+    # telle que lue après migration.
+    dictionary = ProductDictionary(products)
+
+    encoded = rows_frame(
+        encode_sheet(
+            [list(distribution.columns)]
+            + distribution.astype(str).values.tolist(),
+            dictionary
+        )
+    )
+
+    targets = products.iloc[
+        rng.integers(0, len(products), size=20)
+    ].to_dict("records")
+
+    checks = list(
+        zip(
+            distribution["ID_POS"].sample(
+                20,
+                replace=True,
+                random_state=seed
+            ),
+            distribution["Marque"].sample(
+                20,
+                replace=True,
+                random_state=seed + 1
+            )
+        )
+    )
+
+    def parse_all():
+
+        for payload in payloads.values():
+            columns_to_frame(payload)
+
+    def filter_20():
+
+        for target in targets:
+
+            filter_products(
+                products,
+                marque=target["Marque"],
+                categorie=target["Catégorie"]
+            )
+
+    def cascade_20():
+
+        # Un parcours complet des 5 listes, comme un agent
+        # qui choisit un produit dans product_cascade.
+        for target in targets:
+
+            cascade_options(products, "Marque")
+
+            cascade_options(
+                products,
+                "Catégorie",
+                marque=target["Marque"]
+            )
+
+            cascade_options(
+                products,
+                "Famille",
+                marque=target["Marque"],
+                categorie=target["Catégorie"]
+            )
+
+            cascade_options(
+                products,
+                "Produit",
+                marque=target["Marque"],
+                categorie=target["Catégorie"],
+                famille=target["Famille"]
+            )
+
+            cascade_options(
+                products,
+                "Capacité_Dimension",
+                marque=target["Marque"],
+                categorie=target["Catégorie"],
+                famille=target["Famille"],
+                produit=target["Produit"]
+            )
+
+    # Même parcours que cascade_20, par code-barres : un accès
+    # dict dans l'index construit une fois par version.
+    codes = product_codes(products)
+
+    scanned = [
+        target.get("Code_EAN", "")
+        for target in targets
+    ]
+
+    def code_lookup_20():
+
+        for code in scanned:
+            codes.get(normalize_code(code))
+
+    def conformity_20():
+
+        for pos, brand in checks:
+            brand_present(distribution, pos, brand)
+
+    # Index construit une fois par version de la feuille
+    # (data_info.projections), puis recherches dict.
+    presence = brand_presence(distribution)
+
+    def conformity_index_20():
+
+        for pos, brand in checks:
+            brand.lower() in presence.get(pos, {})
+
+    # Saisies de pos_picker : ID partiel, nom, commune, fragment.
+    searches = [
+        query
+        for row in pos.sample(
+            5,
+            replace=True,
+            random_state=seed
+        ).to_dict("records")
+        for query in (
+            row["ID_POS"][-4:],
+            row["Nom_POS"],
+            row["Commune"],
+            row["Wilaya"][1:5]
+        )
+    ]
+
+    index = PosIndex(pos)
+
+    def pos_search_20():
+
+        for query in searches:
+            index.search(query)
+
+    return {
+        "load_sheet_parse_all": parse_all,
+        "load_sheet_parse_distribution": lambda: columns_to_frame(
+            payloads[SHEET_DISTRIBUTION]
+        ),
+        "load_sheet_decode_distribution": lambda: decode_products(
+            encoded,
+            dictionary
+        ),
+        "filter_products_x20": filter_20,
+        "product_cascade_x20": cascade_20,
+        "product_code_index_build": lambda: product_codes(products),
+        "product_code_lookup_x20": code_lookup_20,
+        "material_conformity_x20": conformity_20,
+        "material_presence_index_build": lambda: brand_presence(
+            distribution
+        ),
+        "material_conformity_index_x20": conformity_index_20,
+        "pos_index_build": lambda: PosIndex(pos),
+        "pos_search_x20": pos_search_20,
+        "price_history_index_build": lambda: price_groups(
+            prices
+        ),
+        "price_last_reading_index_build": lambda: last_readings(
+            prices,
+            "Date_Releve",
+            ["Prix_Vente", "Prix_Promo", "Promotion"]
+        ),
+        "price_outlier_scoring": lambda: score_prices(
+            prices,
+            pos,
+            by_wilaya=True
+        ),
+        "stats_distribution_by_brand": lambda: sum_by(
+            distribution,
+            "Marque",
+            "Quantite"
+        ),
+        "stats_distribution_by_category": lambda: sum_by(
+            distribution,
+            "Catégorie",
+            "Quantite"
+        ),
+        "stats_price_mean_by_brand": lambda: mean_by(
+            prices,
+            "Marque",
+            "Prix_Vente"
+        ),
+        "stats_price_summary": lambda: price_summary(
+            prices,
+            "Prix_Vente"
+        ),
+        "stats_survey_brand_counts": lambda: value_counts(
+            surveys,
+            "Marque"
+        ),
+        "stats_survey_frequency_by_brand": lambda: mean_by(
+            surveys,
+            "Marque",
+            "Frequence_Vente_Jour"
+        )
+    }
+
+
+def git_commit():
+
+    try:
+
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout.strip()
+
+    except (OSError, subprocess.CalledProcessError):
+
+        return ""
+
+
+def load_previous(path):
+
+    previous = {}
+
+    if not os.path.exists(path):
+        return previous
+
+    with open(path, encoding="utf-8") as f:
+
+        for line in f:
+
+            if not line.strip():
+                continue
+
+            result = json.loads(line)
+
+            previous[
+                (result["case"], result["rows"])
+            ] = result
+
+    return previous
+
+
+def run(sizes, repeat=5, seed=42, only=None):
+
+    results = []
+
+    run_at = datetime.now().isoformat(timespec="seconds")
+
+    commit = git_commit()
+
+    for rows in sizes:
+
+        tables = generate_tables(rows, seed)
+
+        for case, func in build_cases(tables, seed).items():
+
+            if only and only not in case:
+                continue
+
+            # Premier appel hors mesure (imports, caches pandas).
+            func()
+
+            timings = timed(func, repeat)
+
+            results.append(
+                {
+                    "case": case,
+                    "rows": rows,
+                    "median_ms": round(
+                        statistics.median(timings) * 1000,
+                        3
+                    ),
+                    "min_ms": round(
+                        min(timings) * 1000,
+                        3
+                    ),
+                    "repeat": repeat,
+                    "seed": seed,
+                    "run_at": run_at,
+                    "commit": commit,
+                    "python": platform.python_version(),
+                    "pandas": pd.__version__
+                }
+            )
+
+    return results
+
+
+def compare(results, previous, threshold=REGRESSION_THRESHOLD):
+
+    regressions = []
+
+    for result in results:
+
+        before = previous.get(
+            (result["case"], result["rows"])
+        )
+
+        if before is None or not before["median_ms"]:
+
+            result["ratio"] = None
+
+            continue
+
+        result["ratio"] = round(
+            result["median_ms"] / before["median_ms"],
+            3
+        )
+
+        if result["ratio"] > threshold:
+            regressions.append(result)
+
+    return regressions
+
+
+def save(results, path):
+
+    directory = os.path.dirname(path)
+
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    with open(path, "a", encoding="utf-8") as f:
+
+        for result in results:
+
+            f.write(
+                json.dumps(result, ensure_ascii=False)
+                + "\n"
+            )
+
+
+def print_table(results):
+
+    print(
+        f"{'cas':<34} {'lignes':>9} "
+        f"{'médiane ms':>12} {'min ms':>10} {'ratio':>7}"
+    )
+
+    for result in results:
+
+        ratio = result.get("ratio")
+
+        print(
+            f"{result['case']:<34} {result['rows']:>9} "
+            f"{result['median_ms']:>12.2f} {result['min_ms']:>10.2f} "
+            f"{'' if ratio is None else f'{ratio:.2f}':>7}"
+        )
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(
+        description="Benchmarks Data_Info sur données synthétiques."
+    )
+
+    parser.add_argument(
+        "--rows",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SIZES,
+        help="Tailles des tables de faits (1000 à 1000000)."
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--only", default=None)
+    parser.add_argument("--results", default=RESULTS_PATH)
+    parser.add_argument("--no-save", action="store_true")
+    parser.add_argument("--fail-on-regression", action="store_true")
+
+    args = parser.parse_args(argv)
+
+    previous = load_previous(args.results)
+
+    results = run(
+        args.rows,
+        repeat=args.repeat,
+        seed=args.seed,
+        only=args.only
+    )
+
+    regressions = compare(results, previous)
+
+    print_table(results)
+
+    if not args.no_save:
+        save(results, args.results)
+
+    for result in regressions:
+
+        print(
+            f"RÉGRESSION {result['case']} ({result['rows']} lignes) : "
+            f"x{result['ratio']:.2f}"
+        )
+
+    if regressions and args.fail_on_regression:
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,494 @@
+import uuid
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from data_info.schema import (
+    SHEET_COLUMNS,
+    SHEET_DISTRIBUTION,
+    SHEET_PRICES,
+    SHEET_SURVEYS
+)
+from data_info.transforms import (
+    PRODUCT_LEVELS,
+    clean_text,
+    iso_dates,
+    parse_booleans
+)
+
+
+# =========================================================
+# IMPORT EN MASSE
+# =========================================================
+
+# Relevés saisis sur papier ou dans Excel : le fichier est
+# validé d'un bloc (colonnes entières, pas de boucle par
+# ligne) contre les POS et la hiérarchie Produits, puis les
+# lignes valides partent par paquets (core.append_rows).
+
+IMPORT_SPECS = {
+    SHEET_PRICES: {
+        "label": "💰 Relevé Prix",
+        "id": "ID_Releve",
+        "date": "Date_Releve",
+        "required": ["ID_POS", "Marque", "Produit", "Prix_Vente"],
+        "numbers": ["Prix_Vente", "Prix_Promo"],
+        "integers": [],
+        # Comme le formulaire de saisie : prix > 0.
+        "positive": ["Prix_Vente"],
+        "booleans": ["Promotion"]
+    },
+    SHEET_DISTRIBUTION: {
+        "label": "📦 Distribution Numérique",
+        "id": "ID_Distribution",
+        "date": "Date_Visite",
+        "required": ["ID_POS", "Marque", "Produit", "Quantite"],
+        "numbers": [],
+        "integers": ["Quantite"],
+        "positive": [],
+        "booleans": []
+    },
+    SHEET_SURVEYS: {
+        "label": "📝 Enquête",
+        "id": "ID_Enquete",
+        "date": "Date",
+        "required": ["Sujet", "ID_POS", "Marque", "Produit"],
+        "numbers": ["Prix", "Frequence_Vente_Jour"],
+        "integers": [],
+        "positive": [],
+        "booleans": ["Stock_Disponible", "Promotion"]
+    }
+}
+
+# Ligne 1 du fichier = en-tête.
+FIRST_LINE = 2
+
+# Ligne sans identifiant : uuid5 de son contenu (et de son rang
+# parmi les lignes identiques du fichier). Réimporter le même
+# fichier redonne les mêmes ID, et les lignes dont l'ID est
+# déjà dans la feuille sont écartées (ALREADY_IMPORTED).
+IMPORT_NAMESPACE = uuid.uuid5(
+    uuid.NAMESPACE_URL,
+    "data_info/bulk_import"
+)
+
+ALREADY_IMPORTED = "déjà dans la feuille (ignorée)"
+
+
+def read_table(source, name=None):
+
+    # Tout est lu en texte : la validation décide des types.
+    name = str(name or source).lower()
+
+    if name.endswith((".xlsx", ".xlsm")):
+
+        df = pd.read_excel(
+            source,
+            dtype=str,
+            engine="openpyxl"
+        )
+
+    else:
+
+        df = pd.read_csv(
+            source,
+            dtype=str,
+            keep_default_na=False,
+            sep=None,
+            engine="python",
+            encoding="utf-8-sig"
+        )
+
+    df.columns = [
+        str(column).strip()
+        for column in df.columns
+    ]
+
+    return df.fillna("")
+
+
+def template(sheet_name):
+
+    # Colonnes à remplir : sans identifiant, utilisateur ni
+    # ID_Produit, ajoutés à l'import.
+    spec = IMPORT_SPECS[sheet_name]
+
+    return pd.DataFrame(
+        columns=[
+            column
+            for column in SHEET_COLUMNS[sheet_name]
+            if column not in (spec["id"], "ID_User", "ID_Produit")
+        ]
+    )
+
+
+class ImportCheck:
+
+    def __init__(self, df):
+
+        self.df = df
+        self.errors = []
+
+    def fail(self, mask, column, message):
+
+        mask = np.asarray(mask, dtype=bool)
+
+        if not mask.any():
+            return
+
+        self.errors.append(
+            pd.DataFrame(
+                {
+                    "Ligne": self.df.index[mask] + FIRST_LINE,
+                    "Colonne": column,
+                    "Valeur": self.df[column].to_numpy()[mask]
+                    if column in self.df.columns
+                    else "",
+                    "Erreur": message
+                }
+            )
+        )
+
+    def invalid(self):
+
+        if not self.errors:
+            return np.zeros(len(self.df), dtype=bool)
+
+        lines = pd.concat(self.errors)["Ligne"]
+
+        return (self.df.index + FIRST_LINE).isin(lines)
+
+    def report(self):
+
+        if not self.errors:
+
+            return pd.DataFrame(
+                columns=["Ligne", "Colonne", "Valeur", "Erreur"]
+            )
+
+        return pd.concat(
+            self.errors,
+            ignore_index=True
+        ).sort_values(
+            ["Ligne", "Colonne"],
+            kind="stable"
+        ).reset_index(drop=True)
+
+
+def parse_numbers(values):
+
+    return pd.to_numeric(
+        values
+        .str.replace(" ", "", regex=False)
+        .str.replace(" ", "", regex=False)
+        .str.replace(",", ".", regex=False),
+        errors="coerce"
+    )
+
+
+def parse_dates(values, today):
+
+    empty = values.eq("")
+
+    dates = iso_dates(values)
+
+    return dates.where(~empty, str(today)), dates.isna() & ~empty
+
+
+def content_ids(sheet_name, rows):
+
+    content = rows.map(str).agg("\x1f".join, axis=1)
+
+    rank = content.groupby(content).cumcount()
+
+    return [
+        str(uuid.uuid5(IMPORT_NAMESPACE, f"{sheet_name}\x1f{text}\x1f{n}"))
+        for text, n in zip(content, rank)
+    ]
+
+
+def known_keys(df_products, keys):
+
+    return pd.MultiIndex.from_frame(
+        df_products[keys]
+        .astype(str)
+        .apply(lambda column: column.str.strip())
+        .drop_duplicates()
+    )
+
+
+def validate(
+    sheet_name,
+    df,
+    df_pos,
+    df_products,
+    user_id="",
+    today=None,
+    existing_ids=()
+):
+
+    # Renvoie (lignes valides dans l'ordre SHEET_COLUMNS,
+    # erreurs par ligne et par colonne). existing_ids : ID
+    # déjà présents dans la feuille.
+
+    spec = IMPORT_SPECS[sheet_name]
+
+    columns = SHEET_COLUMNS[sheet_name]
+
+    today = today or datetime.now().date()
+
+    text = df.reindex(
+        columns=list(
+            dict.fromkeys(list(df.columns) + columns)
+        ),
+        fill_value=""
+    ).astype(str).apply(
+        lambda column: column.str.strip()
+    ).reset_index(drop=True)
+
+    check = ImportCheck(text)
+
+    out = pd.DataFrame(
+        {
+            column: text[column]
+            for column in columns
+        }
+    )
+
+    for column in spec["required"]:
+
+        if column not in df.columns:
+
+            check.fail(
+                np.ones(len(text), dtype=bool),
+                column,
+                "colonne absente du fichier"
+            )
+
+        else:
+
+            check.fail(
+                text[column].eq(""),
+                column,
+                "valeur obligatoire"
+            )
+
+    # ---------- nombres ----------
+
+    for column in spec["numbers"] + spec["integers"]:
+
+        values = parse_numbers(text[column])
+
+        filled = text[column].ne("")
+
+        check.fail(
+            filled & values.isna(),
+            column,
+            "nombre invalide"
+        )
+
+        check.fail(
+            values.lt(0),
+            column,
+            "nombre négatif"
+        )
+
+        if column in spec["positive"]:
+
+            check.fail(
+                values.eq(0),
+                column,
+                "doit être supérieur à 0"
+            )
+
+        if column in spec["integers"]:
+
+            check.fail(
+                values.notna() & values.ne(values.round()),
+                column,
+                "nombre entier attendu"
+            )
+
+            out[column] = values.fillna(0).round().astype("int64").astype(object)
+
+        else:
+
+            out[column] = values.fillna(0.0).astype(float).astype(object)
+
+    for column in spec["booleans"]:
+
+        values, invalid = parse_booleans(text[column])
+
+        check.fail(
+            invalid,
+            column,
+            "Oui / Non attendu"
+        )
+
+        out[column] = values.astype(object)
+
+    # ---------- date ----------
+
+    dates, invalid = parse_dates(
+        text[spec["date"]],
+        today
+    )
+
+    check.fail(
+        invalid,
+        spec["date"],
+        "date invalide"
+    )
+
+    out[spec["date"]] = dates
+
+    # ---------- POS ----------
+
+    pos_ids = set(
+        df_pos["ID_POS"].map(clean_text)
+        if "ID_POS" in df_pos.columns
+        else []
+    )
+
+    check.fail(
+        text["ID_POS"].ne("") & ~text["ID_POS"].isin(pos_ids),
+        "ID_POS",
+        "POS inconnu"
+    )
+
+    # ---------- hiérarchie produits ----------
+
+    # Niveau par niveau : l'erreur porte sur le premier niveau
+    # qui ne correspond à aucun produit.
+    failed = np.zeros(len(text), dtype=bool)
+
+    for level in range(1, len(PRODUCT_LEVELS) + 1):
+
+        keys = PRODUCT_LEVELS[:level]
+
+        if not set(keys) <= set(df_products.columns):
+            break
+
+        unknown = ~pd.MultiIndex.from_frame(
+            text[keys]
+        ).isin(
+            known_keys(df_products, keys)
+        )
+
+        # Une capacité vide n'est vérifiée que si le produit
+        # n'en a aucune de renseignée.
+        mask = unknown & ~failed
+
+        if keys[-1] == "Capacité_Dimension":
+            mask &= text[keys[-1]].ne("")
+
+        check.fail(
+            mask,
+            keys[-1],
+            f"{keys[-1]} inconnu(e) pour "
+            + " / ".join(keys[:-1])
+            if level > 1
+            else "Marque inconnue"
+        )
+
+        failed |= mask
+
+    # ---------- identifiants ----------
+
+    ids = text[spec["id"]]
+
+    check.fail(
+        ids.ne("") & ids.duplicated(keep=False),
+        spec["id"],
+        "identifiant en double dans le fichier"
+    )
+
+    missing = ids.eq("")
+
+    if missing.any():
+
+        out.loc[missing, spec["id"]] = content_ids(
+            sheet_name,
+            out.loc[
+                missing,
+                [
+                    column
+                    for column in columns
+                    if column not in (spec["id"], "ID_User")
+                ]
+            ]
+        )
+
+    check.fail(
+        out[spec["id"]].isin(set(existing_ids)),
+        spec["id"],
+        ALREADY_IMPORTED
+    )
+
+    out.loc[text["ID_User"].eq(""), "ID_User"] = user_id
+
+    valid = ~check.invalid()
+
+    return (
+        out[valid].to_numpy(dtype=object).tolist(),
+        check.report()
+    )
+
+
+def validate_columns(sheet_name, df):
+
+    # Feuilles sans IMPORT_SPECS (POS, Produits…) : valeurs
+    # reprises telles quelles, mais seulement les colonnes de
+    # la feuille (SHEET_COLUMNS), avec un identifiant (première
+    # colonne) renseigné et unique. Une colonne inconnue ou
+    # absente rejette tout le fichier (erreur en ligne 1).
+    # Renvoie (enregistrements valides, erreurs).
+    columns = SHEET_COLUMNS[sheet_name]
+
+    key = columns[0]
+
+    header_errors = [
+        (column, "colonne inconnue de la feuille")
+        for column in df.columns
+        if column not in columns
+    ]
+
+    if key not in df.columns:
+        header_errors.append((key, "colonne absente du fichier"))
+
+    if header_errors:
+
+        return [], pd.DataFrame(
+            {
+                "Ligne": FIRST_LINE - 1,
+                "Colonne": [column for column, _ in header_errors],
+                "Valeur": "",
+                "Erreur": [message for _, message in header_errors]
+            }
+        )
+
+    text = df.astype(str).apply(
+        lambda column: column.str.strip()
+    ).reset_index(drop=True)
+
+    check = ImportCheck(text)
+
+    check.fail(
+        text[key].eq(""),
+        key,
+        "valeur obligatoire"
+    )
+
+    check.fail(
+        text[key].ne("") & text[key].duplicated(keep=False),
+        key,
+        "identifiant en double dans le fichier"
+    )
+
+    valid = ~check.invalid()
+
+    return (
+        text[valid].to_dict("records"),
+        check.report()
+    )
@@ -0,0 +1,339 @@
+import re
+
+import pandas as pd
+
+from data_info import core
+from data_info.schema import (
+    SHEET_COLUMNS,
+    SHEET_DISTRIBUTION,
+    SHEET_PRICES,
+    SHEET_PRODUCTS
+)
+from data_info.search import cached_index
+from data_info.transforms import (
+    PRODUCT_LEVELS,
+    clean_text,
+    text_column
+)
+
+
+# =========================================================
+# DICTIONNAIRE PRODUITS
+# =========================================================
+
+# Chaque produit du catalogue reçoit un ID_Produit stable
+# (PRD-0000001). Les feuilles de faits codées n'écrivent que
+# cet ID : les cinq colonnes Marque … Capacité_Dimension
+# restent vides, et sont reconstituées à la lecture depuis le
+# dictionnaire (un accès dict par ligne, colonne par colonne).
+#
+# Le codage ne démarre qu'une fois la feuille migrée
+# (colonne ID_Produit présente, python -m data_info.cli
+# product-ids) ; avant, les lignes partent en clair. Une
+# ligne dont le produit n'a pas d'ID garde ses libellés.
+
+PRODUCT_ID = "ID_Produit"
+
+ID_PREFIX = "PRD"
+
+ID_PATTERN = re.compile(rf"^{ID_PREFIX}-(\d+)$")
+
+ENCODED_SHEETS = [
+    SHEET_DISTRIBUTION,
+    SHEET_PRICES
+]
+
+
+class ProductDictionary:
+
+    def __init__(self, df_products):
+
+        ids = text_column(df_products, PRODUCT_ID).tolist()
+
+        levels = list(
+            zip(
+                *(
+                    text_column(df_products, column).tolist()
+                    for column in PRODUCT_LEVELS
+                )
+            )
+        )
+
+        # ID -> niveaux ; niveaux -> premier ID.
+        self.ids = {}
+        self.keys = {}
+
+        for product_id, key in zip(ids, levels):
+
+            if not product_id:
+                continue
+
+            self.ids.setdefault(product_id, key)
+            self.keys.setdefault(key, product_id)
+
+        # Une table par colonne, pour Series.map.
+        self.columns = {
+            column: {
+                product_id: key[position]
+                for product_id, key in self.ids.items()
+            }
+            for position, column in enumerate(PRODUCT_LEVELS)
+        }
+
+    def __len__(self):
+
+        return len(self.ids)
+
+
+def product_dictionary(df_products):
+
+    return cached_index(
+        "product_ids",
+        df_products,
+        [PRODUCT_ID] + PRODUCT_LEVELS,
+        ProductDictionary
+    )
+
+
+def current_dictionary():
+
+    return product_dictionary(
+        core.fetch_sheet_if_changed(SHEET_PRODUCTS)
+    )
+
+
+def rows_frame(rows):
+
+    # Lignes lues en majorDimension ROWS -> DataFrame texte.
+    width = len(rows[0])
+
+    return pd.DataFrame(
+        [
+            (list(row) + [""] * width)[:width]
+            for row in rows[1:]
+        ],
+        columns=[
+            str(header).strip()
+            for header in rows[0]
+        ]
+    )
+
+
+def encode_row(row, positions, id_position, dictionary):
+
+    # Renvoie la ligne codée, ou None si le produit n'a pas
+    # d'ID (ligne gardée telle quelle).
+    row = list(row) + [""] * (id_position + 1 - len(row))
+
+    product_id = clean_text(row[id_position]) or dictionary.keys.get(
+        tuple(
+            clean_text(row[position])
+            for position in positions
+        )
+    )
+
+    if product_id not in dictionary.ids:
+        return None
+
+    row[id_position] = product_id
+
+    for position in positions:
+        row[position] = ""
+
+    return row
+
+
+def decode_products(df, dictionary):
+
+    # Libellés vides d'une ligne codée remplis depuis l'ID.
+    ids = text_column(df, PRODUCT_ID)
+
+    coded = ids.ne("")
+
+    df = df.copy()
+
+    for column in PRODUCT_LEVELS:
+
+        values = text_column(df, column)
+
+        missing = coded & values.eq("")
+
+        df[column] = values.mask(
+            missing,
+            ids[missing].map(dictionary.columns[column])
+        ).fillna("")
+
+    return df
+
+
+class ProductCodec:
+
+    # core.CODECS : lignes des pages (ordre SHEET_COLUMNS).
+
+    def __init__(self, sheet_name):
+
+        columns = SHEET_COLUMNS[sheet_name]
+
+        self.sheet_name = sheet_name
+        self.positions = [
+            columns.index(column)
+            for column in PRODUCT_LEVELS
+        ]
+
+    def id_position_in(self, headers):
+
+        # Colonne ID_Produit de la feuille (product-ids l'ajoute
+        # en fin d'en-tête). Les libellés doivent être aux places
+        # qu'ils ont dans les lignes des pages : sinon l'ID et
+        # les cellules vidées tomberaient sur d'autres colonnes.
+        levels = [
+            headers.index(column) if column in headers else None
+            for column in PRODUCT_LEVELS
+        ]
+
+        if levels != self.positions:
+
+            raise ValueError(
+                f"{self.sheet_name} : colonnes "
+                f"{', '.join(PRODUCT_LEVELS)} déplacées, lignes "
+                f"envoyées sans codage"
+            )
+
+        return headers.index(PRODUCT_ID)
+
+    def encode(self, rows):
+
+        headers = core.read_headers(
+            self.sheet_name,
+            core.get_spreadsheet_version()
+        )
+
+        if PRODUCT_ID not in headers:
+            return rows
+
+        id_position = self.id_position_in(headers)
+
+        dictionary = current_dictionary()
+
+        encoded = []
+
+        for row in rows:
+
+            coded = encode_row(
+                row,
+                self.positions,
+                id_position,
+                dictionary
+            )
+
+            encoded.append(coded if coded is not None else row)
+
+        return encoded
+
+    def decode(self, df):
+
+        if (
+            PRODUCT_ID not in df.columns
+            or not text_column(df, PRODUCT_ID).ne("").any()
+        ):
+            return df
+
+        return decode_products(
+            df,
+            current_dictionary()
+        )
+
+
+def register():
+
+    for sheet_name in ENCODED_SHEETS:
+        core.CODECS[sheet_name] = ProductCodec(sheet_name)
+
+
+# =========================================================
+# MIGRATION
+# =========================================================
+
+def assign_product_ids(rows):
+
+    # Catalogue : un ID aux produits qui n'en ont pas, à la
+    # suite du plus grand existant. Les IDs déjà attribués ne
+    # changent jamais.
+    header = list(rows[0])
+
+    if PRODUCT_ID not in header:
+        header.append(PRODUCT_ID)
+
+    position = header.index(PRODUCT_ID)
+
+    levels = [
+        header.index(column)
+        for column in PRODUCT_LEVELS
+        if column in header
+    ]
+
+    body = [
+        list(row) + [""] * (len(header) - len(row))
+        for row in rows[1:]
+    ]
+
+    last = max(
+        [
+            int(match.group(1))
+            for match in (
+                ID_PATTERN.match(clean_text(row[position]))
+                for row in body
+            )
+            if match
+        ],
+        default=0
+    )
+
+    for row in body:
+
+        if clean_text(row[position]) or not any(
+            clean_text(row[level])
+            for level in levels
+        ):
+            continue
+
+        last += 1
+
+        row[position] = f"{ID_PREFIX}-{last:07d}"
+
+    return [header] + body
+
+
+def encode_sheet(rows, dictionary):
+
+    # Feuille de faits : colonne ID_Produit ajoutée si besoin,
+    # libellés remplacés par l'ID quand le produit est connu.
+    header = list(rows[0])
+
+    if PRODUCT_ID not in header:
+        header.append(PRODUCT_ID)
+
+    if any(column not in header for column in PRODUCT_LEVELS):
+        return rows
+
+    positions = [
+        header.index(column)
+        for column in PRODUCT_LEVELS
+    ]
+
+    id_position = header.index(PRODUCT_ID)
+
+    body = []
+
+    for row in rows[1:]:
+
+        coded = encode_row(
+            row,
+            positions,
+            id_position,
+            dictionary
+        )
+
+        body.append(coded if coded is not None else list(row))
+
+    return [header] + body
@@ -0,0 +1,714 @@
+import argparse
+import os
+import sys
+from datetime import datetime
+
+
+# =========================================================
+# LIGNE DE COMMANDE
+# =========================================================
+
+# Tâches sans Streamlit, sur les mêmes fonctions d'accès que
+# l'application (data_info.core) :
+#
+#   python -m data_info.cli sync
+#   python -m data_info.cli export --format xlsx
+#   python -m data_info.cli import Releve_Prix releves.csv
+#   python -m data_info.cli archive --keep 30
+#   python -m data_info.cli compact Profil_Client
+#   python -m data_info.cli product-ids --dry-run
+#   python -m data_info.cli benchmark --rows 1000
+#
+# Exemple cron (secrets hors du dépôt) :
+#
+#   0 2 * * * cd /srv/data_info && \
+#       DATA_INFO_SECRETS=/etc/data_info/secrets.toml \
+#       python -m data_info.cli archive >> cron.log 2>&1
+#
+# Seuls argparse et la bibliothèque standard sont importés au
+# démarrage ; pandas, gspread et le core ne le sont que par
+# la sous-commande qui en a besoin. Code retour 0 si tout
+# est passé, 1 sinon.
+
+EXPORT_FORMATS = [
+    "csv",
+    "xlsx",
+    "jsonl"
+]
+
+ARCHIVE_KEEP = 30
+
+
+def log(message):
+
+    print(
+        f"{datetime.now():%Y-%m-%d %H:%M:%S} {message}",
+        flush=True
+    )
+
+
+def fail(message):
+
+    print(
+        f"{datetime.now():%Y-%m-%d %H:%M:%S} ERREUR {message}",
+        file=sys.stderr,
+        flush=True
+    )
+
+
+def all_sheets():
+
+    from data_info.schema import SHEET_COLUMNS
+
+    return list(SHEET_COLUMNS)
+
+
+def load_sheets(sheets):
+
+    # Même chemin que load_sheet, sans le cache Streamlit.
+    from data_info import catalog
+    from data_info.core import fetch_sheet_if_changed
+
+    catalog.register()
+
+    tables = {}
+
+    for sheet in sheets:
+
+        try:
+
+            tables[sheet] = fetch_sheet_if_changed(sheet)
+
+        except Exception as e:
+
+            fail(f"{sheet} : {e}")
+
+    return tables
+
+
+# =========================================================
+# SYNC
+# =========================================================
+
+def run_sync(args):
+
+    from data_info.core import (
+        flush_spool,
+        get_breaker,
+        get_spreadsheet_version,
+        spool_size
+    )
+
+    pending = spool_size()
+
+    if not pending:
+
+        log("File locale vide.")
+
+        return 0
+
+    if get_spreadsheet_version(force=True) is None:
+
+        fail(
+            f"Google Sheets injoignable, {pending} "
+            f"enregistrement(s) restent en attente."
+        )
+
+        return 1
+
+    synced = flush_spool(
+        force=True
+    )
+
+    remaining = spool_size()
+
+    log(
+        f"{synced} enregistrement(s) synchronisé(s), "
+        f"{remaining} en attente."
+    )
+
+    if remaining or not get_breaker().is_closed():
+        return 1
+
+    return 0
+
+
+# =========================================================
+# EXPORT
+# =========================================================
+
+def write_tables(tables, out, fmt):
+
+    os.makedirs(out, exist_ok=True)
+
+    if fmt == "xlsx":
+
+        import pandas as pd
+
+        path = os.path.join(out, "data_info.xlsx")
+
+        with pd.ExcelWriter(path, engine="openpyxl") as writer:
+
+            for sheet, df in tables.items():
+
+                # Excel limite les noms d'onglet à 31 caractères.
+                df.to_excel(
+                    writer,
+                    sheet_name=sheet[:31],
+                    index=False
+                )
+
+        return [path]
+
+    paths = []
+
+    for sheet, df in tables.items():
+
+        path = os.path.join(out, f"{sheet}.{fmt}")
+
+        if fmt == "csv":
+
+            df.to_csv(
+                path,
+                index=False,
+                encoding="utf-8-sig"
+            )
+
+        else:
+
+            df.to_json(
+                path,
+                orient="records",
+                lines=True,
+                force_ascii=False
+            )
+
+        paths.append(path)
+
+    return paths
+
+
+def run_export(args):
+
+    from data_info.core import DATA_DIR
+
+    sheets = args.sheets or all_sheets()
+
+    out = args.out or os.path.join(
+        DATA_DIR,
+        "exports",
+        f"{datetime.now():%Y-%m-%d}"
+    )
+
+    tables = load_sheets(sheets)
+
+    for path in write_tables(tables, out, args.format):
+        log(f"Exporté : {path}")
+
+    return 0 if len(tables) == len(sheets) else 1
+
+
+# =========================================================
+# IMPORT
+# =========================================================
+
+IMPORT_ERRORS_SHOWN = 20
+
+
+def run_import(args):
+
+    from data_info import catalog
+    from data_info.bulk_import import (
+        ALREADY_IMPORTED,
+        FIRST_LINE,
+        IMPORT_SPECS,
+        read_table,
+        validate,
+        validate_columns
+    )
+    from data_info.core import (
+        SENT,
+        SPOOLED,
+        append_dict_rows,
+        append_rows,
+        fetch_sheet_if_changed,
+        read_key_values
+    )
+    from data_info.schema import SHEET_COLUMNS, SHEET_POS, SHEET_PRODUCTS
+
+    if args.sheet not in SHEET_COLUMNS:
+
+        fail(f"Feuille inconnue : {args.sheet}")
+
+        return 1
+
+    catalog.register()
+
+    df = read_table(args.file)
+
+    log(f"{len(df)} ligne(s) lue(s) dans {args.file}.")
+
+    if args.sheet in IMPORT_SPECS:
+
+        rows, errors = validate(
+            args.sheet,
+            df,
+            fetch_sheet_if_changed(SHEET_POS),
+            fetch_sheet_if_changed(SHEET_PRODUCTS),
+            user_id=args.user,
+            existing_ids=read_key_values(
+                args.sheet,
+                IMPORT_SPECS[args.sheet]["id"]
+            )
+        )
+
+    else:
+
+        # Autres feuilles : colonnes et identifiant vérifiés,
+        # valeurs reprises telles quelles.
+        rows, errors = validate_columns(
+            args.sheet,
+            df
+        )
+
+    for error in errors.head(IMPORT_ERRORS_SHOWN).itertuples():
+
+        fail(
+            f"ligne {error.Ligne}, {error.Colonne} "
+            f"« {error.Valeur} » : {error.Erreur}"
+        )
+
+    if args.errors and not errors.empty:
+
+        errors.to_csv(
+            args.errors,
+            index=False,
+            encoding="utf-8-sig"
+        )
+
+    log(
+        f"{len(rows)} ligne(s) valide(s), "
+        f"{errors['Ligne'].nunique()} en erreur."
+    )
+
+    # Sans --skip-invalid, un fichier avec des erreurs n'est
+    # pas importé du tout : le relancer corrigé ne crée pas de
+    # doublons. Une erreur d'en-tête bloque toujours ; les
+    # lignes déjà importées sont seulement écartées.
+    blocking = errors[errors["Erreur"].ne(ALREADY_IMPORTED)]
+
+    if args.dry_run or (
+        not blocking.empty
+        and (
+            not args.skip_invalid
+            or blocking["Ligne"].lt(FIRST_LINE).any()
+        )
+    ):
+        return 1 if not blocking.empty else 0
+
+    if args.sheet in IMPORT_SPECS:
+
+        result = append_rows(
+            args.sheet,
+            rows
+        )
+
+    else:
+
+        result = append_dict_rows(
+            args.sheet,
+            rows
+        )
+
+    log(
+        f"{result[SENT]} ligne(s) envoyée(s), "
+        f"{result[SPOOLED]} en file locale."
+    )
+
+    return 0
+
+
+# =========================================================
+# ARCHIVE
+# =========================================================
+
+def prune_archives(directory, keep):
+
+    archives = sorted(
+        name
+        for name in os.listdir(directory)
+        if name.startswith("data_info-")
+        and name.endswith(".zip")
+    )
+
+    for name in archives[:-keep] if keep else []:
+
+        os.remove(
+            os.path.join(directory, name)
+        )
+
+        log(f"Archive supprimée : {name}")
+
+
+def run_archive(args):
+
+    import json
+    import zipfile
+
+    from data_info.core import DATA_DIR, get_spreadsheet_version
+
+    directory = args.out or os.path.join(
+        DATA_DIR,
+        "archives"
+    )
+
+    sheets = all_sheets()
+
+    version = get_spreadsheet_version(force=True)
+
+    tables = load_sheets(sheets)
+
+    if not tables:
+        return 1
+
+    os.makedirs(directory, exist_ok=True)
+
+    path = os.path.join(
+        directory,
+        f"data_info-{datetime.now():%Y%m%d-%H%M%S}.zip"
+    )
+
+    tmp_path = path + ".tmp"
+
+    with zipfile.ZipFile(
+        tmp_path,
+        "w",
+        compression=zipfile.ZIP_DEFLATED
+    ) as archive:
+
+        for sheet, df in tables.items():
+
+            archive.writestr(
+                f"{sheet}.csv",
+                df.to_csv(index=False)
+            )
+
+        archive.writestr(
+            "manifest.json",
+            json.dumps(
+                {
+                    "created_at": datetime.now().isoformat(
+                        timespec="seconds"
+                    ),
+                    "spreadsheet_version": version,
+                    "rows": {
+                        sheet: len(df)
+                        for sheet, df in tables.items()
+                    },
+                    "missing": [
+                        sheet
+                        for sheet in sheets
+                        if sheet not in tables
+                    ]
+                },
+                ensure_ascii=False,
+                indent=2
+            )
+        )
+
+    os.replace(tmp_path, path)
+
+    log(
+        f"Archive : {path} "
+        f"({sum(len(df) for df in tables.values())} lignes)"
+    )
+
+    prune_archives(directory, args.keep)
+
+    return 0 if len(tables) == len(sheets) else 1
+
+
+# =========================================================
+# COMPACTAGE
+# =========================================================
+
+def run_compact(args):
+
+    from data_info.core import DATA_DIR, compact_sheet
+    from data_info.projections import PROJECTIONS
+
+    key = args.key or PROJECTIONS.get(args.sheet)
+
+    if not key:
+
+        fail(
+            f"{args.sheet} : pas de clé connue, précisez --key."
+        )
+
+        return 1
+
+    backup = os.path.join(
+        DATA_DIR,
+        "archives",
+        f"{args.sheet}-historique-{datetime.now():%Y%m%d-%H%M%S}.csv"
+    )
+
+    before, after = compact_sheet(
+        args.sheet,
+        key,
+        backup_path=backup,
+        dry_run=args.dry_run
+    )
+
+    if args.dry_run or before == after:
+
+        log(
+            f"{args.sheet} : {before} ligne(s), {after} après "
+            f"compactage par {key}."
+            + (" Rien à faire." if before == after else "")
+        )
+
+        return 0
+
+    log(f"Historique complet : {backup}")
+
+    log(
+        f"{args.sheet} compactée par {key} : "
+        f"{before} -> {after} ligne(s)."
+    )
+
+    return 0
+
+
+# =========================================================
+# CODAGE PRODUITS
+# =========================================================
+
+def run_product_ids(args):
+
+    from data_info.catalog import (
+        ENCODED_SHEETS,
+        PRODUCT_ID,
+        ProductDictionary,
+        assign_product_ids,
+        encode_sheet,
+        rows_frame
+    )
+    from data_info.core import DATA_DIR, rewrite_sheet
+    from data_info.schema import SHEET_PRODUCTS
+    from data_info.transforms import PRODUCT_LEVELS, text_column
+
+    stamp = f"{datetime.now():%Y%m%d-%H%M%S}"
+
+    def backup(sheet):
+
+        return os.path.join(
+            DATA_DIR,
+            "archives",
+            f"{sheet}-avant-codage-{stamp}.csv"
+        )
+
+    def coded(rows):
+
+        return int(
+            text_column(rows_frame(rows), PRODUCT_ID).ne("").sum()
+        )
+
+    # 1. Catalogue : IDs manquants attribués.
+    rows, products = rewrite_sheet(
+        SHEET_PRODUCTS,
+        assign_product_ids,
+        backup_path=backup(SHEET_PRODUCTS),
+        dry_run=args.dry_run
+    )
+
+    dictionary = ProductDictionary(
+        rows_frame(products)
+    )
+
+    log(
+        f"{SHEET_PRODUCTS} : {len(dictionary)} produit(s) avec "
+        f"{PRODUCT_ID}, dont {coded(products) - coded(rows)} "
+        f"nouveau(x)."
+    )
+
+    # 2. Feuilles de faits : libellés remplacés par l'ID.
+    for sheet in args.sheets or ENCODED_SHEETS:
+
+        rows, encoded = rewrite_sheet(
+            sheet,
+            lambda rows: encode_sheet(rows, dictionary),
+            backup_path=backup(sheet),
+            dry_run=args.dry_run
+        )
+
+        count = coded(encoded) - coded(rows)
+
+        log(
+            f"{sheet} : {count} ligne(s) codée(s) sur "
+            f"{len(rows) - 1}, {count * len(PRODUCT_LEVELS)} "
+            f"cellule(s) vidée(s)."
+        )
+
+    if args.dry_run:
+        log("Simulation : rien n'a été écrit.")
+
+    return 0
+
+
+# =========================================================
+# BENCHMARK
+# =========================================================
+
+def run_benchmark(args):
+
+    from data_info import benchmark
+
+    return benchmark.main(args.args)
+
+
+# =========================================================
+# ENTREE
+# =========================================================
+
+def build_parser():
+
+    parser = argparse.ArgumentParser(
+        prog="python -m data_info.cli",
+        description="Tâches Data_Info sans interface."
+    )
+
+    parser.add_argument(
+        "--emulator-url",
+        default=None,
+        help="Émulateur Sheets local (python -m data_info.emulator)."
+    )
+    parser.add_argument(
+        "--secrets",
+        default=None,
+        help="Fichier secrets.toml (compte de service google)."
+    )
+
+    commands = parser.add_subparsers(
+        dest="command",
+        required=True
+    )
+
+    sync = commands.add_parser(
+        "sync",
+        help="Rejoue la file locale vers Google Sheets."
+    )
+    sync.set_defaults(func=run_sync)
+
+    export = commands.add_parser(
+        "export",
+        help="Exporte des feuilles en CSV, XLSX ou JSON lines."
+    )
+    export.add_argument("--sheets", nargs="+", default=None)
+    export.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+    export.add_argument("--out", default=None)
+    export.set_defaults(func=run_export)
+
+    imports = commands.add_parser(
+        "import",
+        help="Importe un fichier CSV ou XLSX (validé, par paquets)."
+    )
+    imports.add_argument("sheet")
+    imports.add_argument("file")
+    imports.add_argument("--dry-run", action="store_true")
+    imports.add_argument("--skip-invalid", action="store_true")
+    imports.add_argument("--user", default="", help="ID_User des lignes sans utilisateur.")
+    imports.add_argument("--errors", default=None, help="Fichier CSV des erreurs.")
+    imports.set_defaults(func=run_import)
+
+    archive = commands.add_parser(
+        "archive",
+        help="Instantané zip de tout le classeur."
+    )
+    archive.add_argument("--out", default=None)
+    archive.add_argument("--keep", type=int, default=ARCHIVE_KEEP)
+    archive.set_defaults(func=run_archive)
+
+    compact = commands.add_parser(
+        "compact",
+        help=(
+            "Garde la dernière ligne par clé d'une feuille historisée. "
+            "Destructif : la feuille est réécrite d'un bloc (copie "
+            "CSV dans .data_info/archives, mise en forme non déplacée)."
+        )
+    )
+    compact.add_argument("sheet")
+    compact.add_argument("--key", default=None, help="Colonne clé (défaut : ID_POS pour Profil_Client).")
+    compact.add_argument("--dry-run", action="store_true")
+    compact.set_defaults(func=run_compact)
+
+    product_ids = commands.add_parser(
+        "product-ids",
+        help=(
+            "Attribue les ID_Produit et code les feuilles de faits. "
+            "Destructif : les feuilles sont réécrites d'un bloc et les "
+            "libellés produits vidés (copie CSV dans "
+            ".data_info/archives)."
+        )
+    )
+    product_ids.add_argument("--sheets", nargs="+", default=None)
+    product_ids.add_argument("--dry-run", action="store_true")
+    product_ids.set_defaults(func=run_product_ids)
+
+    bench = commands.add_parser(
+        "benchmark",
+        help="Benchmarks sur données synthétiques (data_info.benchmark).",
+        add_help=False
+    )
+    bench.set_defaults(func=run_benchmark)
+
+    return parser
+
+
+def main(argv=None):
+
+    parser = build_parser()
+
+    # Les options de benchmark sont transmises telles quelles
+    # à data_info.benchmark.
+    args, extra = parser.parse_known_args(argv)
+
+    if args.command == "benchmark":
+        args.args = extra
+
+    elif extra:
+        parser.error(f"arguments inconnus : {' '.join(extra)}")
+
+    # Avant tout import du core : les réglages sont lus à la
+    # création des ressources.
+    if args.emulator_url:
+        os.environ["DATA_INFO_EMULATOR_URL"] = args.emulator_url
+
+    if args.secrets:
+        os.environ["DATA_INFO_SECRETS"] = args.secrets
+
+    if args.command != "benchmark":
+
+        from data_info.core import get_metrics
+
+        get_metrics().set_page(f"cli {args.command}")
+
+    try:
+
+        return args.func(args)
+
+    except KeyboardInterrupt:
+
+        fail("interrompu.")
+
+        return 130
+
+    except Exception as e:
+
+        fail(f"{type(e).__name__} : {e}")
+
+        return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,2584 @@
+import csv
+import json
+import os
+import queue
+import random
+import re
+import threading
+import time
+import tomllib
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+from functools import wraps
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+import gspread
+import requests
+from google.auth.credentials import AnonymousCredentials
+from google.auth.exceptions import TransportError
+from google.auth.transport.requests import Request as GoogleAuthRequest
+from google.oauth2.service_account import Credentials
+from gspread.urls import DRIVE_FILES_API_V3_URL
+from gspread.utils import rowcol_to_a1
+
+from data_info import profiling
+from data_info.metrics import MetricsRegistry
+from data_info.schema import SCOPES, SHEET_COLUMNS, SPREADSHEET_ID
+from data_info.transforms import (
+    SHEET_VERSION,
+    clean_text,
+    columns_to_frame
+)
+
+
+# =========================================================
+# ACCES GOOGLE SHEETS (SANS STREAMLIT)
+# =========================================================
+
+# Tout ce qui lit ou écrit le classeur : retry, circuit
+# breaker, pool de clients, fraîcheur, écriture et file
+# locale. Aucun effet de bord à l'import : les ressources
+# partagées sont créées au premier appel, une fois par
+# processus. Utilisé par l'application (data_info.ui) comme
+# par les tâches en ligne de commande.
+
+ROOT_DIR = os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))
+)
+
+
+def resource(func):
+
+    # Équivalent de st.cache_resource : un seul objet par
+    # processus, créé sous verrou au premier appel.
+
+    lock = threading.Lock()
+
+    instance = []
+
+    @wraps(func)
+    def wrapper():
+
+        if not instance:
+
+            with lock:
+
+                if not instance:
+                    instance.append(func())
+
+        return instance[0]
+
+    wrapper.clear = instance.clear
+
+    return wrapper
+
+
+# =========================================================
+# REGLAGES
+# =========================================================
+
+# Mêmes emplacements que st.secrets : ~/.streamlit puis
+# .streamlit du projet (prioritaire). L'application remplace
+# cette source par st.secrets via set_secrets_provider.
+
+SECRETS_PATHS = [
+    os.path.join(
+        os.path.expanduser("~"),
+        ".streamlit",
+        "secrets.toml"
+    ),
+    os.path.join(
+        ROOT_DIR,
+        ".streamlit",
+        "secrets.toml"
+    )
+]
+
+
+def read_secrets_files():
+
+    secrets = {}
+
+    # Tâches planifiées : fichier explicite DATA_INFO_SECRETS.
+    extra = os.environ.get("DATA_INFO_SECRETS")
+
+    for path in SECRETS_PATHS + ([extra] if extra else []):
+
+        if not os.path.exists(path):
+            continue
+
+        with open(path, "rb") as f:
+            secrets.update(tomllib.load(f))
+
+    return secrets
+
+
+_secrets_provider = read_secrets_files
+
+
+def set_secrets_provider(provider):
+
+    global _secrets_provider
+
+    _secrets_provider = provider
+
+
+def secrets():
+
+    return _secrets_provider()
+
+
+def setting(name, default=None):
+
+    # Variable d'environnement DATA_INFO_<NOM> d'abord (tests,
+    # émulateur, cron), puis les secrets ; sinon, défaut.
+
+    value = os.environ.get(
+        f"DATA_INFO_{name.upper()}"
+    )
+
+    if value is not None:
+        return value
+
+    return secrets().get(name, default)
+
+
+# =========================================================
+# RETRY GOOGLE SHEETS
+# =========================================================
+
+class RetryPolicy:
+
+    # Backoff exponentiel avec "full jitter" : chaque attente
+    # est tirée entre 0 et le plafond courant, pour que les
+    # sessions ne réessayent pas toutes au même instant.
+
+    def __init__(
+        self,
+        retry_statuses,
+        network_errors,
+        max_attempts=5,
+        base_delay=0.5,
+        max_delay=16.0,
+        deadline=30.0
+    ):
+
+        self.retry_statuses = set(retry_statuses)
+        self.network_errors = tuple(network_errors)
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+
+    def is_retryable(self, error):
+
+        if isinstance(
+            error,
+            self.network_errors
+        ):
+            return True
+
+        status = error_status(error)
+
+        return status in self.retry_statuses
+
+    def next_delay(self, attempt, error):
+
+        delay = random.uniform(
+            0,
+            min(
+                self.max_delay,
+                self.base_delay * (2 ** attempt)
+            )
+        )
+
+        retry_after = error_retry_after(error)
+
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+
+        return delay
+
+    def call(self, func, *args, **kwargs):
+
+        started = time.monotonic()
+
+        for attempt in range(self.max_attempts):
+
+            try:
+
+                return func(*args, **kwargs)
+
+            except Exception as e:
+
+                if (
+                    attempt == self.max_attempts - 1
+                    or not self.is_retryable(e)
+                ):
+                    raise
+
+                delay = self.next_delay(attempt, e)
+
+                if (
+                    time.monotonic() - started + delay
+                    > self.deadline
+                ):
+                    raise
+
+                time.sleep(delay)
+
+
+def error_status(error):
+
+    if isinstance(
+        error,
+        gspread.exceptions.APIError
+    ):
+
+        response = getattr(error, "response", None)
+
+        if response is not None:
+            return response.status_code
+
+        return error.code
+
+    response = getattr(error, "response", None)
+
+    return getattr(response, "status_code", None)
+
+
+def error_retry_after(error):
+
+    response = getattr(error, "response", None)
+
+    if response is None:
+        return None
+
+    value = response.headers.get("Retry-After")
+
+    if not value:
+        return None
+
+    try:
+
+        return max(0.0, float(value))
+
+    except ValueError:
+
+        pass
+
+    try:
+
+        when = parsedate_to_datetime(value)
+
+        return max(
+            0.0,
+            when.timestamp() - time.time()
+        )
+
+    except (TypeError, ValueError):
+
+        return None
+
+
+# Les lectures sont idempotentes : on réessaye aussi les 5xx.
+# Une écriture (append) en 500 a pu être appliquée côté Google,
+# on ne la rejoue donc que sur les refus explicites.
+
+SHEETS_READ_RETRY = RetryPolicy(
+    retry_statuses=[408, 429, 500, 502, 503, 504],
+    network_errors=[
+        requests.exceptions.ConnectionError,
+        requests.exceptions.Timeout,
+        TransportError
+    ],
+    deadline=20.0
+)
+
+SHEETS_WRITE_RETRY = RetryPolicy(
+    retry_statuses=[429, 503],
+    network_errors=[
+        requests.exceptions.ConnectTimeout
+    ],
+    deadline=30.0
+)
+
+
+# =========================================================
+# METRIQUES
+# =========================================================
+
+# Chaque tentative HTTP est comptée (quota), chaque appel
+# logique et chaque opération de haut niveau (load_sheet,
+# append_row...) est mesuré : voir la page Performance.
+
+SLOW_CALL_SECONDS = 2.0
+
+# Quota Google par défaut : 60 lectures et 60 écritures par
+# minute et par utilisateur (ici, le compte de service).
+SHEETS_QUOTA_PER_MINUTE = 60
+
+API_OPERATIONS = {
+    "open_by_key": "spreadsheets.get",
+    "values_get": "values.get",
+    "values_append": "values.append",
+    "values_batch_update": "values.batchUpdate",
+    "request": "files.get"
+}
+
+
+@resource
+def get_metrics():
+
+    quota = int(
+        setting(
+            "sheets_quota_per_minute",
+            SHEETS_QUOTA_PER_MINUTE
+        )
+    )
+
+    return MetricsRegistry(
+        slow_threshold=float(
+            setting(
+                "slow_call_seconds",
+                SLOW_CALL_SECONDS
+            )
+        ),
+        quotas={
+            "read": quota,
+            "write": quota
+        },
+        on_slow_call=log_slow_call
+    )
+
+
+def log_slow_call(entry):
+
+    append_jsonl(
+        SLOW_CALLS_PATH,
+        [entry]
+    )
+
+
+def measured(operation):
+
+    def decorator(func):
+
+        @wraps(func)
+        def wrapper(sheet_name, *args, **kwargs):
+
+            with get_metrics().measure(
+                operation,
+                sheet_name
+            ):
+
+                return func(
+                    sheet_name,
+                    *args,
+                    **kwargs
+                )
+
+        return wrapper
+
+    return decorator
+
+
+def call_sheet(args, kwargs):
+
+    ranges = [
+        arg
+        for arg in args[:1]
+        if isinstance(arg, str)
+        and arg.startswith("'")
+    ]
+
+    ranges += [
+        item["range"]
+        for item in (kwargs.get("body") or {}).get("data", [])
+    ]
+
+    if not ranges:
+        return ""
+
+    return (
+        ranges[0][1:]
+        .split("'!")[0]
+        .rstrip("'")
+        .replace("''", "'")
+    )
+
+
+def payload_cells(result, kwargs):
+
+    body = kwargs.get("body") or {}
+
+    rows = list(body.get("values", []))
+
+    for item in body.get("data", []):
+        rows += item.get("values", [])
+
+    if isinstance(result, dict):
+        rows += result.get("values", [])
+
+    return sum(
+        len(row)
+        for row in rows
+    )
+
+
+# =========================================================
+# CIRCUIT BREAKER
+# =========================================================
+
+# Après BREAKER_FAILURE_THRESHOLD échecs consécutifs (quota,
+# 5xx, réseau), on arrête d'appeler Google pendant
+# BREAKER_RESET_TIMEOUT secondes : les pages servent les
+# dernières données connues et les écritures partent dans
+# la file locale. Un seul appel "half-open" teste ensuite
+# le retour du service.
+
+BREAKER_FAILURE_THRESHOLD = 5
+
+BREAKER_RESET_TIMEOUT = 60
+
+
+class SheetsUnavailable(Exception):
+    pass
+
+
+class SpoolError(Exception):
+    pass
+
+
+class SpoolBusy(Exception):
+    pass
+
+
+class CircuitBreaker:
+
+    def __init__(
+        self,
+        failure_threshold,
+        reset_timeout
+    ):
+
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.lock = threading.Lock()
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+
+    def is_closed(self):
+
+        return self.state == "closed"
+
+    def allow_request(self):
+
+        with self.lock:
+
+            if self.state == "closed":
+                return True
+
+            if self.probing:
+                return False
+
+            if (
+                time.time() - self.opened_at
+                >= self.reset_timeout
+            ):
+
+                self.state = "half_open"
+                self.probing = True
+
+                return True
+
+            return False
+
+    def record_success(self):
+
+        with self.lock:
+
+            recovered = self.state != "closed"
+
+            self.state = "closed"
+            self.failures = 0
+            self.probing = False
+
+        return recovered
+
+    def record_failure(self):
+
+        with self.lock:
+
+            self.failures += 1
+            self.probing = False
+
+            if (
+                self.state == "half_open"
+                or self.failures >= self.failure_threshold
+            ):
+
+                self.state = "open"
+                self.opened_at = time.time()
+
+    def call(self, func, *args, **kwargs):
+
+        if not self.allow_request():
+
+            raise SheetsUnavailable(
+                "Google Sheets indisponible "
+                "(circuit ouvert)."
+            )
+
+        try:
+
+            result = func(*args, **kwargs)
+
+        except Exception as e:
+
+            if is_outage(e):
+
+                self.record_failure()
+
+            else:
+
+                # Erreur fonctionnelle (403, 404...) :
+                # le service répond, il n'est pas en panne.
+                self.record_success()
+
+            raise
+
+        if self.record_success():
+            on_backend_recovered()
+
+        return result
+
+
+@resource
+def get_breaker():
+
+    return CircuitBreaker(
+        failure_threshold=BREAKER_FAILURE_THRESHOLD,
+        reset_timeout=BREAKER_RESET_TIMEOUT
+    )
+
+
+def sheets_call(policy, func, *args, **kwargs):
+
+    metrics = get_metrics()
+
+    operation = API_OPERATIONS.get(
+        func.__name__,
+        func.__name__
+    )
+
+    if operation == "files.get":
+        kind = "drive"
+
+    elif policy is SHEETS_WRITE_RETRY:
+        kind = "write"
+
+    else:
+        kind = "read"
+
+    def attempt(*attempt_args, **attempt_kwargs):
+
+        metrics.api_call(kind)
+
+        return func(
+            *attempt_args,
+            **attempt_kwargs
+        )
+
+    with profiling.section(
+        f"API {operation}"
+    ), metrics.measure(
+        operation,
+        call_sheet(args, kwargs)
+    ) as call:
+
+        result = get_breaker().call(
+            policy.call,
+            attempt,
+            *args,
+            **kwargs
+        )
+
+        call["cells"] = payload_cells(
+            result,
+            kwargs
+        )
+
+    return result
+
+
+# =========================================================
+# CONNEXION GOOGLE
+# =========================================================
+
+# Chaque session Streamlit emprunte un client gspread au pool
+# pour la durée d'un appel, puis le rend : deux sessions ne
+# partagent jamais la même session HTTP. Le jeton OAuth est
+# commun et rafraîchi sous verrou, une seule fois pour tous.
+
+SHEETS_POOL_SIZE = 4
+
+SHEETS_POOL_TIMEOUT = 30
+
+
+class PooledClient:
+
+    def __init__(self, client):
+
+        self.client = client
+        self.spreadsheet = None
+
+    def get_spreadsheet(self):
+
+        if self.spreadsheet is None:
+
+            self.spreadsheet = sheets_call(
+                SHEETS_READ_RETRY,
+                self.client.open_by_key,
+                SPREADSHEET_ID
+            )
+
+        return self.spreadsheet
+
+
+class ClientPool:
+
+    def __init__(self, credentials, size, session_factory=None):
+
+        self.credentials = credentials
+        self.size = size
+        self.session_factory = session_factory
+        self.idle = queue.LifoQueue()
+        self.created = 0
+        self.lock = threading.Lock()
+        self.token_lock = threading.Lock()
+        self.local = threading.local()
+
+    def refresh_token(self):
+
+        # Rafraîchi ici avant expiration, le jeton n'est jamais
+        # renouvelé en parallèle par les sessions HTTP.
+
+        with self.token_lock:
+
+            if not self.credentials.valid:
+
+                # Serveur d'authentification en panne : compté
+                # par le circuit comme une panne de Sheets.
+                get_breaker().call(
+                    SHEETS_READ_RETRY.call,
+                    self.credentials.refresh,
+                    GoogleAuthRequest()
+                )
+
+    def acquire(self):
+
+        try:
+
+            return self.idle.get_nowait()
+
+        except queue.Empty:
+
+            pass
+
+        with self.lock:
+
+            if self.created < self.size:
+
+                self.created += 1
+
+                if self.session_factory is None:
+
+                    return PooledClient(
+                        gspread.authorize(
+                            self.credentials
+                        )
+                    )
+
+                return PooledClient(
+                    gspread.Client(
+                        self.credentials,
+                        session=self.session_factory()
+                    )
+                )
+
+        try:
+
+            return self.idle.get(
+                timeout=SHEETS_POOL_TIMEOUT
+            )
+
+        except queue.Empty as e:
+
+            # Tous les clients bloqués depuis SHEETS_POOL_TIMEOUT :
+            # Google ne répond plus, compté comme un échec du
+            # circuit (dernières données / file locale).
+            get_breaker().record_failure()
+
+            raise SheetsUnavailable(
+                "Google Sheets indisponible "
+                "(aucun client libre)."
+            ) from e
+
+    @contextmanager
+    def checkout(self):
+
+        held = getattr(self.local, "held", None)
+
+        # Appels imbriqués dans le même thread : même client,
+        # sans reprendre de place dans le pool.
+        if held is not None:
+
+            yield held
+
+            return
+
+        pooled = self.acquire()
+
+        self.local.held = pooled
+
+        try:
+
+            self.refresh_token()
+
+            yield pooled
+
+        finally:
+
+            self.local.held = None
+
+            self.idle.put(pooled)
+
+
+@resource
+def get_client_pool():
+
+    size = int(
+        setting(
+            "sheets_pool_size",
+            SHEETS_POOL_SIZE
+        )
+    )
+
+    emulator_url = setting("emulator_url")
+
+    # Émulateur local (python -m data_info.emulator) : pas de
+    # compte de service, les URL Google sont réécrites.
+    if emulator_url:
+
+        from data_info.emulator import EmulatorSession
+
+        return ClientPool(
+            AnonymousCredentials(),
+            size=size,
+            session_factory=lambda: EmulatorSession(
+                emulator_url
+            )
+        )
+
+    creds = Credentials.from_service_account_info(
+        secrets()["google"],
+        scopes=SCOPES
+    )
+
+    return ClientPool(
+        creds,
+        size=size
+    )
+
+
+def sheets_client():
+
+    return get_client_pool().checkout()
+
+
+# Lectures : UNFORMATTED_VALUE en colonnes (une liste par
+# colonne, pas de dict par ligne), dates rendues en texte.
+#
+# Écritures : USER_ENTERED comme avant, pour que les dates
+# ISO deviennent des cellules date, au même format que les
+# lignes existantes. Tout autre texte est préfixé d'une
+# apostrophe (entered_cell) : il est gardé tel quel, sans
+# formule ni conversion en nombre ; les nombres et booléens
+# sont déjà typés.
+
+SHEETS_READ_PARAMS = {
+    "valueRenderOption": "UNFORMATTED_VALUE",
+    "dateTimeRenderOption": "FORMATTED_STRING",
+    "majorDimension": "COLUMNS",
+    "fields": "values"
+}
+
+SHEETS_WRITE_PARAMS = {
+    "valueInputOption": "USER_ENTERED",
+    "fields": "updates.updatedRange"
+}
+
+ISO_DATE_PATTERN = re.compile(
+    r"^\d{4}-\d{2}-\d{2}([ T]\d{2}:\d{2}(:\d{2}(\.\d+)?)?)?$"
+)
+
+
+def entered_cell(value):
+
+    if (
+        not isinstance(value, str)
+        or not value
+        or ISO_DATE_PATTERN.match(value)
+    ):
+        return value
+
+    return "'" + value
+
+
+def sheet_range(sheet_name, cells=""):
+
+    quoted = sheet_name.replace("'", "''")
+
+    if cells:
+        return f"'{quoted}'!{cells}"
+
+    return f"'{quoted}'"
+
+
+def is_missing_sheet(error):
+
+    return (
+        error_status(error) == 400
+        and "Unable to parse range" in str(error)
+    )
+
+
+def read_values(sheet_name, cells="", params=None):
+
+    with sheets_client() as pooled:
+
+        response = sheets_call(
+            SHEETS_READ_RETRY,
+            pooled.get_spreadsheet().values_get,
+            sheet_range(sheet_name, cells),
+            params=params or SHEETS_READ_PARAMS
+        )
+
+    return response.get("values", [])
+
+
+# =========================================================
+# FRAICHEUR DES DONNEES
+# =========================================================
+
+# Une sonde Drive (modifiedTime) est faite avant tout
+# téléchargement : si le classeur n'a pas changé depuis le
+# dernier chargement d'une feuille, on réutilise la copie
+# en mémoire au lieu de retélécharger la table.
+
+FRESHNESS_PROBE_TTL = 15
+
+SHEET_MAX_AGE = 3600
+
+
+@resource
+def get_sheet_store():
+
+    return {
+        "lock": threading.Lock(),
+        "probe": {
+            "version": None,
+            "checked_at": 0.0
+        },
+        "sheets": {},
+        "headers": {}
+    }
+
+
+def get_spreadsheet_version(force=False):
+
+    store = get_sheet_store()
+
+    probe = store["probe"]
+
+    if (
+        not force
+        and probe["version"]
+        and time.time() - probe["checked_at"]
+        < FRESHNESS_PROBE_TTL
+    ):
+        return probe["version"]
+
+    try:
+
+        with sheets_client() as pooled:
+
+            response = sheets_call(
+                SHEETS_READ_RETRY,
+                pooled.client.http_client.request,
+                "get",
+                f"{DRIVE_FILES_API_V3_URL}/{SPREADSHEET_ID}",
+                params={
+                    "fields": "modifiedTime",
+                    "supportsAllDrives": True
+                }
+            )
+
+        version = response.json().get(
+            "modifiedTime"
+        )
+
+    except Exception:
+
+        # Sans sonde, on retombe sur un chargement complet.
+        version = None
+
+    with store["lock"]:
+
+        probe["version"] = version
+        probe["checked_at"] = time.time()
+
+    return version
+
+
+def fetch_sheet(sheet_name):
+
+    return columns_to_frame(
+        read_values(sheet_name)
+    )
+
+
+def fetch_sheet_if_changed(sheet_name):
+
+    store = get_sheet_store()
+
+    version = get_spreadsheet_version()
+
+    entry = store["sheets"].get(sheet_name)
+
+    metrics = get_metrics()
+
+    if entry is not None:
+
+        if not get_breaker().is_closed():
+
+            metrics.increment(
+                "sheet_store_lookups",
+                sheet=sheet_name,
+                result="stale"
+            )
+
+            return entry["df"]
+
+        if (
+            version
+            and entry["version"] == version
+            and time.time() - entry["fetched_at"]
+            < SHEET_MAX_AGE
+        ):
+
+            metrics.increment(
+                "sheet_store_lookups",
+                sheet=sheet_name,
+                result="hit"
+            )
+
+            return entry["df"]
+
+    metrics.increment(
+        "sheet_store_lookups",
+        sheet=sheet_name,
+        result="miss"
+    )
+
+    try:
+
+        df = decode_sheet(
+            sheet_name,
+            fetch_sheet(sheet_name)
+        )
+
+    except Exception as e:
+
+        # Dernière copie connue plutôt qu'une page vide.
+        if entry is not None and (
+            isinstance(e, SheetsUnavailable)
+            or SHEETS_READ_RETRY.is_retryable(e)
+        ):
+
+            metrics.increment(
+                "sheet_store_lookups",
+                sheet=sheet_name,
+                result="stale"
+            )
+
+            return entry["df"]
+
+        raise
+
+    fetched_at = time.time()
+
+    df.attrs[SHEET_VERSION] = (
+        sheet_name,
+        version,
+        fetched_at
+    )
+
+    with store["lock"]:
+
+        store["sheets"][sheet_name] = {
+            "version": version,
+            "fetched_at": fetched_at,
+            "df": df
+        }
+
+    return df
+
+
+def before_write():
+
+    return get_spreadsheet_version(
+        force=True
+    )
+
+
+def after_write(sheet_name):
+
+    # La feuille écrite est rechargée. Les autres ne sont pas
+    # re-datées : une autre session a pu les modifier entre
+    # temps, elles se revalident à la prochaine sonde (plus de
+    # sonde Drive forcée après chaque écriture).
+
+    store = get_sheet_store()
+
+    clear_sheet_cache(sheet_name)
+
+    with store["lock"]:
+        store["probe"]["checked_at"] = 0.0
+
+
+# Caches des couches supérieures (st.cache_data de
+# l'application) : appelés à chaque invalidation d'une
+# feuille, et au retour du service. WRITE_HOOKS reçoit les
+# enregistrements (dict) envoyés ou mis en file locale.
+
+INVALIDATION_HOOKS = []
+
+RECOVERY_HOOKS = []
+
+WRITE_HOOKS = []
+
+# Feuilles stockées codées (data_info.catalog) : {feuille:
+# codec}. codec.encode(rows) avant écriture (lignes dans
+# l'ordre SHEET_COLUMNS), codec.decode(df) après lecture.
+#
+# Si le codec échoue pour une raison attendue (Google
+# injoignable, en-tête ou dictionnaire incohérent), les
+# lignes partent en clair et la feuille est lue telle
+# quelle ; l'échec est compté et journalisé
+# (report_failure). Toute autre erreur remonte.
+
+CODECS = {}
+
+CODEC_ERRORS = (
+    SheetsUnavailable,
+    gspread.exceptions.APIError,
+    requests.RequestException,
+    KeyError,
+    ValueError
+)
+
+
+def report_failure(kind, sheet_name, error):
+
+    # Compteur "failures" (page Performance) et une ligne
+    # dans .data_info/failures.jsonl.
+    get_metrics().increment(
+        "failures",
+        kind=kind,
+        sheet=sheet_name or "*",
+        error=type(error).__name__
+    )
+
+    try:
+
+        append_jsonl(
+            FAILURES_PATH,
+            [
+                {
+                    "at": str(datetime.now()),
+                    "kind": kind,
+                    "sheet": sheet_name,
+                    "error": f"{type(error).__name__}: {error}"
+                }
+            ]
+        )
+
+    except OSError:
+        pass
+
+
+def encode_rows(sheet_name, rows):
+
+    codec = CODECS.get(sheet_name)
+
+    if codec is None or not rows:
+        return rows
+
+    try:
+        return codec.encode(rows)
+
+    except CODEC_ERRORS as e:
+
+        report_failure(
+            "encode",
+            sheet_name,
+            e
+        )
+
+        return rows
+
+
+def decode_sheet(sheet_name, df):
+
+    codec = CODECS.get(sheet_name)
+
+    if codec is None or df.empty:
+        return df
+
+    try:
+        return codec.decode(df)
+
+    except CODEC_ERRORS as e:
+
+        report_failure(
+            "decode",
+            sheet_name,
+            e
+        )
+
+        return df
+
+
+def run_hooks(hooks, *args):
+
+    # Un cache ou un index en échec ne bloque pas l'écriture
+    # ni la lecture, mais l'échec est signalé.
+    for hook in list(hooks):
+
+        try:
+            hook(*args)
+
+        except Exception as e:
+
+            report_failure(
+                f"hook {getattr(hook, '__name__', hook)}",
+                args[0] if args and isinstance(args[0], str) else None,
+                e
+            )
+
+
+def clear_sheet_cache(sheet_name=None):
+
+    # Les copies sont seulement marquées périmées : elles
+    # restent disponibles comme dernières données connues.
+
+    store = get_sheet_store()
+
+    get_metrics().increment(
+        "sheet_cache_invalidations",
+        sheet=sheet_name or "*"
+    )
+
+    with store["lock"]:
+
+        for name, entry in store["sheets"].items():
+
+            if not sheet_name or name == sheet_name:
+                entry["version"] = None
+
+    run_hooks(
+        INVALIDATION_HOOKS,
+        sheet_name
+    )
+
+
+def on_backend_recovered():
+
+    # Les résultats servis en mode dégradé ne doivent pas
+    # rester dans les caches des couches supérieures.
+
+    run_hooks(
+        RECOVERY_HOOKS
+    )
+
+
+# =========================================================
+# ECRITURE GOOGLE SHEETS
+# =========================================================
+
+# Panne, distincte de « à réessayer » : en écriture, une
+# coupure réseau ou un 5xx n'est pas rejoué tout de suite (la
+# ligne a pu être écrite), mais la ligne part dans la file
+# locale, dont le rejeu saute les ID_* déjà présents.
+OUTAGE_ERRORS = (
+    SheetsUnavailable,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    TransportError
+)
+
+OUTAGE_STATUSES = {408, 429}
+
+
+def is_outage(error):
+
+    if isinstance(error, OUTAGE_ERRORS):
+        return True
+
+    status = error_status(error)
+
+    return status is not None and (
+        status in OUTAGE_STATUSES
+        or status >= 500
+    )
+
+
+# Imports en masse : un values.append par paquet de lignes,
+# une seule sonde de version avant et après le lot.
+
+APPEND_CHUNK_ROWS = 1000
+
+
+def send_rows(sheet_name, rows):
+
+    with sheets_client() as pooled:
+
+        sheets_call(
+            SHEETS_WRITE_RETRY,
+            pooled.get_spreadsheet().values_append,
+            sheet_range(sheet_name, "A1"),
+            params=SHEETS_WRITE_PARAMS,
+            body={
+                "values": [
+                    [
+                        entered_cell(value)
+                        for value in row
+                    ]
+                    for row in rows
+                ]
+            }
+        )
+
+
+def write_rows(sheet_name, rows):
+
+    send_rows(
+        sheet_name,
+        rows
+    )
+
+    after_write(
+        sheet_name
+    )
+
+
+def write_row(sheet_name, row):
+
+    write_rows(
+        sheet_name,
+        [row]
+    )
+
+
+def read_headers(sheet_name, version=None):
+
+    # L'en-tête ne change qu'avec le classeur : il est réutilisé
+    # tant que modifiedTime est celui de la dernière lecture.
+
+    store = get_sheet_store()
+
+    cached = store["headers"].get(sheet_name)
+
+    if (
+        cached is not None
+        and version
+        and cached["version"] == version
+    ):
+        return cached["headers"]
+
+    rows = read_values(
+        sheet_name,
+        "1:1",
+        params={
+            "valueRenderOption": "UNFORMATTED_VALUE",
+            "fields": "values"
+        }
+    )
+
+    headers = [
+        str(x).strip()
+        for x in (rows[0] if rows else [])
+    ]
+
+    with store["lock"]:
+
+        store["headers"][sheet_name] = {
+            "version": version,
+            "headers": headers
+        }
+
+    return headers
+
+
+def write_dict_row(sheet_name, values):
+
+    previous_version = before_write()
+
+    headers = read_headers(
+        sheet_name,
+        previous_version
+    )
+
+    write_row(
+        sheet_name,
+        [
+            values.get(header, "")
+            for header in headers
+        ]
+    )
+
+
+def write_dict_rows(sheet_name, records):
+
+    previous_version = before_write()
+
+    headers = read_headers(
+        sheet_name,
+        previous_version
+    )
+
+    write_rows(
+        sheet_name,
+        [
+            [
+                values.get(header, "")
+                for header in headers
+            ]
+            for values in records
+        ]
+    )
+
+
+def read_key_values(sheet_name, key_column, headers=None):
+
+    # Seule la colonne clé est lue (lignes 2 et suivantes).
+    if headers is None:
+
+        headers = read_headers(
+            sheet_name,
+            get_spreadsheet_version()
+        )
+
+    if key_column not in headers:
+        return []
+
+    key_letter = rowcol_to_a1(
+        1,
+        headers.index(key_column) + 1
+    )[:-1]
+
+    columns = read_values(
+        sheet_name,
+        f"{key_letter}2:{key_letter}"
+    )
+
+    return [
+        clean_text(value)
+        for value in (columns[0] if columns else [])
+    ]
+
+
+@measured("update_row_by_key")
+def update_row_by_key(sheet_name, key_column, key_value, values):
+
+    # Seule la colonne clé est lue, et seules les cellules
+    # modifiées sont réécrites.
+
+    previous_version = before_write()
+
+    headers = read_headers(
+        sheet_name,
+        previous_version
+    )
+
+    if key_column not in headers:
+        return False
+
+    keys = read_key_values(
+        sheet_name,
+        key_column,
+        headers
+    )
+
+    for offset, current in enumerate(keys):
+
+        if clean_text(current) != key_value:
+            continue
+
+        row_number = offset + 2
+
+        data = [
+            {
+                "range": sheet_range(
+                    sheet_name,
+                    rowcol_to_a1(
+                        row_number,
+                        headers.index(header) + 1
+                    )
+                ),
+                "values": [
+                    [
+                        entered_cell(value)
+                    ]
+                ]
+            }
+            for header, value in values.items()
+            if header in headers
+        ]
+
+        with sheets_client() as pooled:
+
+            sheets_call(
+                SHEETS_WRITE_RETRY,
+                pooled.get_spreadsheet().values_batch_update,
+                body={
+                    "valueInputOption": "USER_ENTERED",
+                    "data": data
+                }
+            )
+
+        after_write(
+            sheet_name
+        )
+
+        return True
+
+    return False
+
+
+# Résultat d'un enregistrement : envoyé à Google, ou mis en
+# file locale pendant une panne. Les autres erreurs sont
+# levées à l'appelant.
+
+SENT = "sent"
+
+SPOOLED = "spooled"
+
+
+def notify_written(sheet_name, rows=None, records=None):
+
+    # Les lignes (listes) des pages suivent SHEET_COLUMNS.
+    if records is None:
+
+        columns = SHEET_COLUMNS.get(sheet_name)
+
+        if not columns or not WRITE_HOOKS:
+            return
+
+        records = [
+            dict(zip(columns, row))
+            for row in rows
+        ]
+
+    run_hooks(
+        WRITE_HOOKS,
+        sheet_name,
+        records
+    )
+
+
+def append_row(sheet_name, row):
+
+    # Les hooks reçoivent la ligne complète, la feuille la
+    # ligne codée.
+    result = send_row(
+        sheet_name,
+        encode_rows(sheet_name, [row])[0]
+    )
+
+    notify_written(
+        sheet_name,
+        rows=[row]
+    )
+
+    return result
+
+
+@measured("append_row")
+def send_row(sheet_name, row):
+
+    if not get_breaker().is_closed():
+
+        return spool_write(
+            sheet_name,
+            row=row
+        )
+
+    try:
+
+        write_row(
+            sheet_name,
+            row
+        )
+
+        return SENT
+
+    except Exception as e:
+
+        if is_outage(e):
+
+            return spool_write(
+                sheet_name,
+                row=row
+            )
+
+        raise
+
+
+@measured("append_dict_row")
+def append_dict_row(sheet_name, values):
+
+    result = send_dict_row(
+        sheet_name,
+        values
+    )
+
+    notify_written(
+        sheet_name,
+        records=[values]
+    )
+
+    return result
+
+
+def send_dict_row(sheet_name, values):
+
+    if not get_breaker().is_closed():
+
+        return spool_write(
+            sheet_name,
+            values=values
+        )
+
+    # La ligne suit l'en-tête réel de la feuille : en cas de
+    # panne, c'est le dict qui part dans la file (sa clé ID_*
+    # est lue par nom, pas par position).
+    try:
+
+        write_dict_row(
+            sheet_name,
+            values
+        )
+
+        return SENT
+
+    except Exception as e:
+
+        if is_outage(e):
+
+            return spool_write(
+                sheet_name,
+                values=values
+            )
+
+        raise
+
+
+class BatchWriteError(Exception):
+
+    # Erreur fonctionnelle au milieu d'un lot : les `sent`
+    # premières lignes sont déjà dans la feuille.
+
+    def __init__(self, sent, error):
+
+        super().__init__(str(error))
+
+        self.sent = sent
+        self.error = error
+
+
+def append_rows(sheet_name, rows, chunk_size=APPEND_CHUNK_ROWS):
+
+    rows = list(rows)
+
+    result = send_row_batch(
+        sheet_name,
+        encode_rows(sheet_name, rows),
+        chunk_size
+    )
+
+    notify_written(
+        sheet_name,
+        rows=rows
+    )
+
+    return result
+
+
+@measured("append_rows")
+def send_row_batch(
+    sheet_name,
+    rows,
+    chunk_size=APPEND_CHUNK_ROWS,
+    records=None
+):
+
+    # records : dicts d'origine des lignes (append_dict_rows),
+    # mis en file à la place des lignes en cas de panne.
+
+    sent = 0
+
+    try:
+
+        if rows and get_breaker().is_closed():
+
+            while sent < len(rows):
+
+                chunk = rows[sent:sent + chunk_size]
+
+                send_rows(
+                    sheet_name,
+                    chunk
+                )
+
+                sent += len(chunk)
+
+    except Exception as e:
+
+        if not is_outage(e):
+
+            if sent:
+                raise BatchWriteError(sent, e) from e
+
+            raise
+
+    finally:
+
+        if sent:
+
+            after_write(
+                sheet_name
+            )
+
+    # Panne (circuit ouvert, quota, réseau) : le reste du lot
+    # part dans la file locale, par paquets.
+    if sent < len(rows):
+
+        if records is None:
+
+            spool_write(
+                sheet_name,
+                rows=rows[sent:]
+            )
+
+        else:
+
+            spool_write(
+                sheet_name,
+                records=records[sent:]
+            )
+
+    return {
+        SENT: sent,
+        SPOOLED: len(rows) - sent
+    }
+
+
+@measured("append_dict_rows")
+def append_dict_rows(sheet_name, records, chunk_size=APPEND_CHUNK_ROWS):
+
+    records = list(records)
+
+    headers = None
+
+    try:
+
+        if get_breaker().is_closed():
+
+            headers = read_headers(
+                sheet_name,
+                get_spreadsheet_version()
+            )
+
+    except Exception as e:
+
+        if not is_outage(e):
+            raise
+
+    # En-tête illisible (panne) : tout le lot part dans la
+    # file, en dicts.
+    if headers is None:
+
+        spool_write(
+            sheet_name,
+            records=records
+        )
+
+        result = {
+            SENT: 0,
+            SPOOLED: len(records)
+        }
+
+    else:
+
+        result = send_row_batch(
+            sheet_name,
+            [
+                [
+                    values.get(header, "")
+                    for header in headers
+                ]
+                for values in records
+            ],
+            chunk_size,
+            records=records
+        )
+
+    notify_written(
+        sheet_name,
+        records=records
+    )
+
+    return result
+
+
+# =========================================================
+# REECRITURE ET COMPACTAGE
+# =========================================================
+
+# Feuille réécrite d'un bloc (rewrite_sheet) : une seule
+# écriture values.update couvre l'ancienne hauteur, les lignes
+# en trop sont vidées dans la même requête. Opération
+# destructive (mise en forme des cellules non déplacée) : le
+# contenu complet est d'abord copié en CSV, et si le classeur
+# a changé depuis la lecture, rien n'est écrit.
+#
+# Les cellules sont lues telles que saisies (sheet_cells) et
+# réécrites en USER_ENTERED : formules gardées, dates en ISO
+# (redeviennent des cellules date), texte préfixé d'une
+# apostrophe.
+#
+# compact_sheet garde la seule dernière ligne de chaque clé
+# d'une feuille historisée (ordre d'origine conservé).
+
+class CompactionConflict(Exception):
+    pass
+
+
+def compaction_plan(rows, key_column):
+
+    # rows : en-tête puis lignes, telles que lues. Les lignes
+    # sans clé sont toutes gardées.
+    header, body = rows[0], rows[1:]
+
+    position = header.index(key_column)
+
+    last = {}
+
+    kept = []
+
+    for offset, row in enumerate(body):
+
+        key = clean_text(
+            row[position]
+            if position < len(row)
+            else ""
+        )
+
+        if key:
+            last[key] = offset
+        else:
+            kept.append(offset)
+
+    return sorted(kept + list(last.values()))
+
+
+SERIAL_EPOCH = datetime(1899, 12, 30)
+
+
+def serial_date(serial):
+
+    # Numéro de série Sheets -> date (ou date et heure) ISO.
+    moment = SERIAL_EPOCH + timedelta(
+        seconds=round(serial * 86400)
+    )
+
+    if moment.time() == datetime.min.time():
+        return f"{moment:%Y-%m-%d}"
+
+    return f"{moment:%Y-%m-%d %H:%M:%S}"
+
+
+def entered_value(formula, value):
+
+    # formula : rendu FORMULA (dates en texte) ; value : rendu
+    # UNFORMATTED_VALUE (dates en numéro de série).
+    if (
+        isinstance(formula, str)
+        and formula.startswith("=")
+        and formula != value
+    ):
+        return formula
+
+    if (
+        isinstance(formula, str)
+        and isinstance(value, (int, float))
+        and not isinstance(value, bool)
+    ):
+        return serial_date(value)
+
+    # Texte commençant par = ou ' : gardé littéral.
+    if isinstance(value, str) and value.startswith(("=", "'")):
+        return "'" + value
+
+    return value
+
+
+def rewrite_cell(value):
+
+    # Inverse d'entered_value pour l'écriture USER_ENTERED.
+    if isinstance(value, str) and value.startswith(("=", "'")):
+        return value
+
+    return entered_cell(value)
+
+
+def sheet_cells(sheet_name, cells=""):
+
+    # Lignes de la feuille telles que saisies : formules
+    # ("=…"), dates ISO, nombres, texte.
+    formulas, values = (
+        read_values(
+            sheet_name,
+            cells,
+            params={
+                "valueRenderOption": render,
+                "dateTimeRenderOption": dates,
+                "majorDimension": "ROWS",
+                "fields": "values"
+            }
+        )
+        for render, dates in (
+            ("FORMULA", "FORMATTED_STRING"),
+            ("UNFORMATTED_VALUE", "SERIAL_NUMBER")
+        )
+    )
+
+    rows = []
+
+    for formula_row, value_row in zip(formulas, values):
+
+        width = max(len(formula_row), len(value_row))
+
+        rows.append(
+            [
+                entered_value(formula, value)
+                for formula, value in zip(
+                    list(formula_row) + [""] * (width - len(formula_row)),
+                    list(value_row) + [""] * (width - len(value_row))
+                )
+            ]
+        )
+
+    return rows
+
+
+def write_backup(path, rows):
+
+    os.makedirs(
+        os.path.dirname(path),
+        exist_ok=True
+    )
+
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        csv.writer(f).writerows(rows)
+
+
+@measured("rewrite_sheet")
+def rewrite_sheet(sheet_name, rewrite, backup_path=None, dry_run=False):
+
+    # rewrite(rows) -> nouvelles lignes, en-tête compris.
+    # Renvoie (lignes lues, lignes réécrites) ; rien n'est
+    # écrit si elles sont identiques.
+    previous_version = before_write()
+
+    rows = sheet_cells(
+        sheet_name
+    )
+
+    if not rows:
+
+        raise ValueError(
+            f"{sheet_name} est vide"
+        )
+
+    new_rows = rewrite(rows)
+
+    if dry_run or new_rows == rows:
+        return rows, new_rows
+
+    if backup_path:
+
+        write_backup(
+            backup_path,
+            rows
+        )
+
+    width = max(
+        len(row)
+        for row in rows + new_rows
+    )
+
+    values = [
+        [
+            rewrite_cell(value)
+            for value in row
+        ] + [""] * (width - len(row))
+        for row in new_rows
+    ] + [
+        [""] * width
+        for _ in range(len(rows) - len(new_rows))
+    ]
+
+    # Dernière vérification juste avant l'écriture.
+    if get_spreadsheet_version(force=True) != previous_version:
+
+        raise CompactionConflict(
+            f"{sheet_name} a été modifiée pendant la réécriture, "
+            f"relancez-la."
+        )
+
+    with sheets_client() as pooled:
+
+        sheets_call(
+            SHEETS_WRITE_RETRY,
+            pooled.get_spreadsheet().values_update,
+            sheet_range(sheet_name, "A1"),
+            params={
+                "valueInputOption": "USER_ENTERED"
+            },
+            body={
+                "values": values
+            }
+        )
+
+    move_late_rows(
+        sheet_name,
+        len(rows),
+        len(new_rows)
+    )
+
+    after_write(
+        sheet_name
+    )
+
+    return rows, new_rows
+
+
+def move_late_rows(sheet_name, old_height, new_height):
+
+    # Ligne ajoutée entre la dernière vérification et
+    # l'écriture : restée sous l'ancienne hauteur, elle est
+    # remontée à la suite des lignes réécrites.
+    if old_height == new_height:
+        return
+
+    try:
+
+        late = sheet_cells(
+            sheet_name,
+            f"{old_height + 1}:{old_height + APPEND_CHUNK_ROWS}"
+        )
+
+    except Exception as e:
+
+        # Plage hors de la grille : rien n'a été ajouté.
+        if error_status(e) == 400:
+            return
+
+        raise
+
+    if not late:
+        return
+
+    width = max(len(row) for row in late)
+
+    moved = [
+        [
+            rewrite_cell(value)
+            for value in row
+        ] + [""] * (width - len(row))
+        for row in late
+    ]
+
+    # Remontées à partir de new_height + 1 ; les
+    # old_height - new_height lignes suivantes sont vidées.
+    cleared = old_height - new_height
+
+    with sheets_client() as pooled:
+
+        sheets_call(
+            SHEETS_WRITE_RETRY,
+            pooled.get_spreadsheet().values_update,
+            sheet_range(
+                sheet_name,
+                rowcol_to_a1(new_height + 1, 1)
+            ),
+            params={
+                "valueInputOption": "USER_ENTERED"
+            },
+            body={
+                "values": moved + [
+                    [""] * width
+                    for _ in range(cleared)
+                ]
+            }
+        )
+
+
+@measured("compact_sheet")
+def compact_sheet(sheet_name, key_column, backup_path=None, dry_run=False):
+
+    def compact(rows):
+
+        if key_column not in rows[0]:
+
+            raise ValueError(
+                f"colonne {key_column} absente de {sheet_name}"
+            )
+
+        return [rows[0]] + [
+            rows[1 + offset]
+            for offset in compaction_plan(rows, key_column)
+        ]
+
+    rows, kept = rewrite_sheet(
+        sheet_name,
+        compact,
+        backup_path=backup_path,
+        dry_run=dry_run
+    )
+
+    return len(rows) - 1, len(kept) - 1
+
+
+# =========================================================
+# FILE D'ATTENTE LOCALE
+# =========================================================
+
+# Quand Google Sheets est indisponible, les enregistrements
+# sont ajoutés (fsync) à un fichier JSON lines, puis rejoués
+# dans l'ordre dès que le circuit est refermé.
+#
+# Le rejeu se fait au plus une fois toutes les
+# SPOOL_FLUSH_INTERVAL secondes, par un seul processus à la
+# fois (verrou .flush.lock non bloquant). Le verrou de la
+# file n'est tenu que pour la lire et la réécrire, pas
+# pendant les envois. Chaque élément garde les ID_* de ses
+# lignes : une ligne déjà présente dans la feuille (rejeu
+# interrompu après l'envoi) n'est pas renvoyée.
+
+DATA_DIR = os.path.join(
+    ROOT_DIR,
+    ".data_info"
+)
+
+SPOOL_PATH = os.path.join(
+    DATA_DIR,
+    "spool.jsonl"
+)
+
+SPOOL_REJECTED_PATH = os.path.join(
+    DATA_DIR,
+    "spool_rejected.jsonl"
+)
+
+SLOW_CALLS_PATH = os.path.join(
+    DATA_DIR,
+    "slow_calls.jsonl"
+)
+
+FAILURES_PATH = os.path.join(
+    DATA_DIR,
+    "failures.jsonl"
+)
+
+SPOOL_FLUSH_INTERVAL = 30
+
+
+class SpoolLock:
+
+    # Verrou de la file : entre threads du processus, et entre
+    # processus (flock), l'application et une tâche cron
+    # pouvant écrire ou rejouer la file en même temps. Non
+    # bloquant : SpoolBusy si le verrou est déjà pris.
+
+    def __init__(self, path, blocking=True):
+
+        self.path = path
+        self.blocking = blocking
+        self.lock = threading.Lock()
+        self.handle = None
+
+    def __enter__(self):
+
+        if not self.lock.acquire(blocking=self.blocking):
+            raise SpoolBusy(self.path)
+
+        try:
+
+            os.makedirs(
+                os.path.dirname(self.path),
+                exist_ok=True
+            )
+
+            self.handle = open(self.path, "a")
+
+            if fcntl is not None:
+
+                fcntl.flock(
+                    self.handle,
+                    fcntl.LOCK_EX
+                    if self.blocking
+                    else fcntl.LOCK_EX | fcntl.LOCK_NB
+                )
+
+        except BlockingIOError as e:
+
+            self.release()
+
+            raise SpoolBusy(self.path) from e
+
+        except BaseException:
+
+            self.release()
+
+            raise
+
+        return self
+
+    def __exit__(self, *exc_info):
+
+        self.release()
+
+    def release(self):
+
+        try:
+
+            if self.handle is not None:
+                self.handle.close()
+
+        finally:
+
+            self.handle = None
+
+            self.lock.release()
+
+
+@resource
+def get_spool_lock():
+
+    return SpoolLock(
+        SPOOL_PATH + ".lock"
+    )
+
+
+@resource
+def get_spool_flush():
+
+    return {
+        "lock": SpoolLock(
+            SPOOL_PATH + ".flush.lock",
+            blocking=False
+        ),
+        "flushed_at": 0.0
+    }
+
+
+def append_jsonl(path, items):
+
+    os.makedirs(
+        os.path.dirname(path),
+        exist_ok=True
+    )
+
+    with open(path, "a", encoding="utf-8") as f:
+
+        for item in items:
+
+            f.write(
+                json.dumps(
+                    item,
+                    ensure_ascii=False,
+                    default=str
+                )
+                + "\n"
+            )
+
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def read_spool():
+
+    if not os.path.exists(SPOOL_PATH):
+        return []
+
+    with open(SPOOL_PATH, encoding="utf-8") as f:
+
+        return [
+            json.loads(line)
+            for line in f
+            if line.strip()
+        ]
+
+
+def rewrite_spool(items):
+
+    tmp_path = SPOOL_PATH + ".tmp"
+
+    with open(tmp_path, "w", encoding="utf-8") as f:
+
+        for item in items:
+
+            f.write(
+                json.dumps(
+                    item,
+                    ensure_ascii=False,
+                    default=str
+                )
+                + "\n"
+            )
+
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(
+        tmp_path,
+        SPOOL_PATH
+    )
+
+
+def item_rows(item):
+
+    for batch in ["rows", "records"]:
+
+        if batch in item:
+            return len(item[batch])
+
+    return 1
+
+
+def record_key_column(sheet_name):
+
+    # Première colonne ID_* de la feuille (un uuid par ligne).
+    columns = SHEET_COLUMNS.get(sheet_name) or [""]
+
+    return columns[0] if columns[0].startswith("ID_") else None
+
+
+def record_keys(
+    sheet_name,
+    row=None,
+    values=None,
+    rows=None,
+    records=None
+):
+
+    # Dicts : clé lue par nom. Lignes (pages, dans l'ordre
+    # SHEET_COLUMNS) : la clé est la première cellule.
+    key_column = record_key_column(sheet_name)
+
+    if key_column is None:
+        return []
+
+    if values is not None:
+        records = [values]
+
+    if records is not None:
+
+        return [
+            clean_text(values.get(key_column, ""))
+            for values in records
+        ]
+
+    return [
+        clean_text(row[0] if row else "")
+        for row in (rows if rows is not None else [row])
+    ]
+
+
+def spool_size():
+
+    # En lignes : un lot d'import compte pour ses lignes.
+    with get_spool_lock():
+
+        return sum(
+            item_rows(item)
+            for item in read_spool()
+        )
+
+
+def spool_write(
+    sheet_name,
+    row=None,
+    values=None,
+    rows=None,
+    records=None
+):
+
+    item = {
+        "sheet": sheet_name,
+        "queued_at": str(datetime.now())
+    }
+
+    if rows is not None:
+
+        items = [
+            {
+                **item,
+                "rows": rows[start:start + APPEND_CHUNK_ROWS],
+                "keys": record_keys(
+                    sheet_name,
+                    rows=rows[start:start + APPEND_CHUNK_ROWS]
+                )
+            }
+            for start in range(0, len(rows), APPEND_CHUNK_ROWS)
+        ]
+
+    elif records is not None:
+
+        items = [
+            {
+                **item,
+                "records": records[start:start + APPEND_CHUNK_ROWS],
+                "keys": record_keys(
+                    sheet_name,
+                    records=records[start:start + APPEND_CHUNK_ROWS]
+                )
+            }
+            for start in range(0, len(records), APPEND_CHUNK_ROWS)
+        ]
+
+    elif values is not None:
+
+        items = [
+            {
+                **item,
+                "values": values,
+                "keys": record_keys(sheet_name, values=values)
+            }
+        ]
+
+    else:
+
+        items = [
+            {
+                **item,
+                "row": row,
+                "keys": record_keys(sheet_name, row=row)
+            }
+        ]
+
+    for entry in items:
+        entry["id"] = str(uuid.uuid4())
+
+    try:
+
+        with get_spool_lock():
+
+            append_jsonl(
+                SPOOL_PATH,
+                items
+            )
+
+    except OSError as e:
+
+        raise SpoolError(e) from e
+
+    get_metrics().increment(
+        "spooled_writes",
+        sheet=sheet_name
+    )
+
+    return SPOOLED
+
+
+def flush_spool(force=False):
+
+    # Appelé à chaque réexécution des pages : sans effet avant
+    # SPOOL_FLUSH_INTERVAL, ou si un rejeu est déjà en cours.
+    state = get_spool_flush()
+
+    if (
+        not force
+        and time.time() - state["flushed_at"] < SPOOL_FLUSH_INTERVAL
+    ):
+        return 0
+
+    state["flushed_at"] = time.time()
+
+    try:
+
+        with state["lock"]:
+            return replay_spool()
+
+    except SpoolBusy:
+
+        return 0
+
+
+def item_identity(item):
+
+    # Éléments mis en file avant l'ajout de "id" : leur
+    # contenu sert d'identifiant.
+    return item.get("id") or json.dumps(
+        item,
+        sort_keys=True,
+        default=str
+    )
+
+
+def replay_spool():
+
+    with get_spool_lock():
+        items = read_spool()
+
+    done = set()
+
+    synced = 0
+
+    rejected = []
+
+    # {feuille: ID_* déjà présents}, lus une fois par rejeu.
+    present = {}
+
+    for item in items:
+
+        if not get_breaker().is_closed():
+            break
+
+        identity = item_identity(item)
+
+        sheet_name = item["sheet"]
+
+        keys = item.get("keys") or []
+
+        try:
+
+            if any(keys) and sheet_name not in present:
+
+                present[sheet_name] = {
+                    key
+                    for key in read_key_values(
+                        sheet_name,
+                        record_key_column(sheet_name)
+                    )
+                    if key
+                }
+
+            existing = present.get(sheet_name, set())
+
+            if "values" in item:
+
+                if not keys or keys[0] not in existing:
+
+                    write_dict_row(
+                        sheet_name,
+                        item["values"]
+                    )
+
+            elif "rows" in item or "records" in item:
+
+                batch = item["rows"] if "rows" in item else item["records"]
+
+                batch = [
+                    entry
+                    for entry, key in zip(
+                        batch,
+                        keys or [""] * len(batch)
+                    )
+                    if not key or key not in existing
+                ]
+
+                if batch and "records" in item:
+
+                    write_dict_rows(
+                        sheet_name,
+                        batch
+                    )
+
+                elif batch:
+
+                    write_rows(
+                        sheet_name,
+                        batch
+                    )
+
+            elif not keys or keys[0] not in existing:
+
+                write_row(
+                    sheet_name,
+                    item["row"]
+                )
+
+        except Exception as e:
+
+            if is_outage(e):
+                break
+
+            # Rejet définitif (feuille supprimée, 400...) :
+            # mis de côté pour ne pas bloquer la file.
+            item["error"] = str(e)
+
+            rejected.append(item)
+
+        else:
+
+            synced += item_rows(item)
+
+            existing.update(key for key in keys if key)
+
+        done.add(identity)
+
+    if done:
+
+        # Les éléments ajoutés pendant le rejeu restent en file.
+        with get_spool_lock():
+
+            if rejected:
+
+                append_jsonl(
+                    SPOOL_REJECTED_PATH,
+                    rejected
+                )
+
+            rewrite_spool(
+                [
+                    item
+                    for item in read_spool()
+                    if item_identity(item) not in done
+                ]
+            )
+
+    return synced
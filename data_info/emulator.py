@@ -0,0 +1,1017 @@
+import argparse
+import collections
+import json
+import os
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import requests
+
+from data_info.core import DATA_DIR
+from data_info.schema import SPREADSHEET_ID
+
+
+# =========================================================
+# EMULATEUR GOOGLE SHEETS
+# =========================================================
+
+# Serveur HTTP local qui implémente le sous-ensemble des API
+# Sheets v4 et Drive v3 utilisé via gspread : métadonnées
+# (open_by_key, worksheet), values.get / batchGet / update /
+# append / batchUpdate, et files.get (modifiedTime).
+#
+# Quotas par minute (429), latence injectée, erreurs 503
+# aléatoires et état persisté dans un fichier JSON : de quoi
+# tester cache, retry et circuit breaker sans le classeur de
+# production.
+#
+#   python -m data_info.emulator --rows 10000 --latency 0.2
+#   DATA_INFO_EMULATOR_URL=http://127.0.0.1:8085 streamlit run TSS.py
+
+DEFAULT_PORT = 8085
+
+DEFAULT_STATE_PATH = os.path.join(
+    DATA_DIR,
+    "emulator.json"
+)
+
+SHEETS_URL = "https://sheets.googleapis.com/"
+
+GOOGLE_APIS_URL = "https://www.googleapis.com/"
+
+
+class EmulatorError(Exception):
+
+    def __init__(self, code, status, message):
+
+        super().__init__(message)
+
+        self.code = code
+        self.status = status
+        self.message = message
+
+
+# =========================================================
+# NOTATION A1
+# =========================================================
+
+CELL_RE = re.compile(r"^([A-Za-z]*)(\d*)$")
+
+
+def column_index(letters):
+
+    index = 0
+
+    for letter in letters.upper():
+        index = index * 26 + ord(letter) - 64
+
+    return index - 1
+
+
+def column_letters(index):
+
+    letters = ""
+
+    index += 1
+
+    while index:
+
+        index, remainder = divmod(index - 1, 26)
+
+        letters = chr(65 + remainder) + letters
+
+    return letters
+
+
+def parse_cell(cell):
+
+    match = CELL_RE.match(cell)
+
+    if not match or not cell:
+        raise ValueError(cell)
+
+    letters, digits = match.groups()
+
+    return (
+        int(digits) - 1 if digits else None,
+        column_index(letters) if letters else None
+    )
+
+
+def split_range(range_name):
+
+    # 'Feuille'!A1:B2, Feuille!A:A, 'Feuille' ou A1:B2.
+
+    if range_name.startswith("'"):
+
+        end = 1
+
+        while True:
+
+            end = range_name.index("'", end)
+
+            if range_name[end + 1:end + 2] == "'":
+                end += 2
+                continue
+
+            break
+
+        title = range_name[1:end].replace("''", "'")
+
+        rest = range_name[end + 1:]
+
+        return title, rest[1:] if rest.startswith("!") else ""
+
+    if "!" in range_name:
+
+        title, cells = range_name.rsplit("!", 1)
+
+        return title, cells
+
+    return range_name, ""
+
+
+def parse_cells(cells):
+
+    # Bornes 0-based incluses ; None = ouvert.
+
+    if not cells:
+        return None, None, None, None
+
+    start, _, end = cells.partition(":")
+
+    r1, c1 = parse_cell(start)
+
+    if end:
+        r2, c2 = parse_cell(end)
+    else:
+        r2, c2 = r1, c1
+
+    return r1, c1, r2, c2
+
+
+def a1_range(title, r1, c1, r2, c2):
+
+    quoted = title.replace("'", "''")
+
+    return (
+        f"'{quoted}'!"
+        f"{column_letters(c1)}{r1 + 1}:"
+        f"{column_letters(c2)}{r2 + 1}"
+    )
+
+
+# =========================================================
+# VALEURS
+# =========================================================
+
+NUMBER_RE = re.compile(r"^-?\d+(\.\d+)?$")
+
+
+def entered_value(value, input_option):
+
+    if input_option != "USER_ENTERED" or not isinstance(value, str):
+        return value
+
+    text = value.strip()
+
+    if text.startswith("'"):
+        return text[1:]
+
+    if NUMBER_RE.match(text):
+
+        number = float(text)
+
+        return int(number) if number.is_integer() and "." not in text else number
+
+    if text.upper() in ("TRUE", "FALSE"):
+        return text.upper() == "TRUE"
+
+    return value
+
+
+def formatted_value(value):
+
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+
+    return str(value)
+
+
+def trim_row(row):
+
+    end = len(row)
+
+    while end and row[end - 1] in ("", None):
+        end -= 1
+
+    return row[:end]
+
+
+def trim_rows(rows):
+
+    rows = [trim_row(row) for row in rows]
+
+    while rows and not rows[-1]:
+        rows.pop()
+
+    return rows
+
+
+def transpose(rows):
+
+    width = max((len(row) for row in rows), default=0)
+
+    return trim_rows(
+        [
+            [
+                row[position] if position < len(row) else ""
+                for row in rows
+            ]
+            for position in range(width)
+        ]
+    )
+
+
+def frame_rows(df):
+
+    df = df.astype(object).where(df.notna(), "")
+
+    return [list(df.columns)] + df.to_numpy().tolist()
+
+
+def now_rfc3339():
+
+    return (
+        datetime.now(timezone.utc)
+        .isoformat(timespec="milliseconds")
+        .replace("+00:00", "Z")
+    )
+
+
+# =========================================================
+# QUOTAS
+# =========================================================
+
+class QuotaWindow:
+
+    # Fenêtre glissante de 60 s, comme les quotas "par minute"
+    # de Google (lectures et écritures comptées séparément).
+
+    def __init__(self, limit):
+
+        self.limit = limit
+        self.calls = collections.deque()
+        self.lock = threading.Lock()
+
+    def consume(self):
+
+        if not self.limit:
+            return True
+
+        now = time.monotonic()
+
+        with self.lock:
+
+            while self.calls and now - self.calls[0] >= 60:
+                self.calls.popleft()
+
+            if len(self.calls) >= self.limit:
+                return False
+
+            self.calls.append(now)
+
+        return True
+
+
+# =========================================================
+# ETAT
+# =========================================================
+
+class Emulator:
+
+    def __init__(
+        self,
+        state_path=DEFAULT_STATE_PATH,
+        read_quota=300,
+        write_quota=300,
+        latency=0.0,
+        jitter=0.0,
+        error_rate=0.0,
+        save_interval=1.0
+    ):
+
+        self.state_path = state_path
+        self.quotas = {
+            "read": QuotaWindow(read_quota),
+            "write": QuotaWindow(write_quota)
+        }
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.save_interval = save_interval
+
+        self.lock = threading.RLock()
+        self.spreadsheets = {}
+        self.dirty = False
+        self.stats = collections.Counter()
+
+        self.load()
+
+    # ---------- persistance ----------
+
+    def load(self):
+
+        if not self.state_path or not os.path.exists(self.state_path):
+            return
+
+        with open(self.state_path, encoding="utf-8") as f:
+            self.spreadsheets = json.load(f)["spreadsheets"]
+
+    def save(self):
+
+        if not self.state_path:
+            return
+
+        with self.lock:
+
+            if not self.dirty:
+                return
+
+            payload = json.dumps(
+                {"spreadsheets": self.spreadsheets},
+                ensure_ascii=False
+            )
+
+            self.dirty = False
+
+        directory = os.path.dirname(self.state_path)
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.state_path}.tmp"
+
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(payload)
+
+        os.replace(tmp_path, self.state_path)
+
+    def save_forever(self):
+
+        while True:
+
+            time.sleep(self.save_interval)
+
+            self.save()
+
+    def seed(self, tables, spreadsheet_id=SPREADSHEET_ID):
+
+        with self.lock:
+
+            self.spreadsheets[spreadsheet_id] = {
+                "title": "Data_Info (émulateur)",
+                "modifiedTime": now_rfc3339(),
+                "sheets": [
+                    {
+                        "sheetId": position,
+                        "title": name,
+                        "values": frame_rows(df)
+                    }
+                    for position, (name, df) in enumerate(tables.items())
+                ]
+            }
+
+            self.dirty = True
+
+    # ---------- accès ----------
+
+    def spreadsheet(self, spreadsheet_id):
+
+        try:
+
+            return self.spreadsheets[spreadsheet_id]
+
+        except KeyError:
+
+            raise EmulatorError(
+                404,
+                "NOT_FOUND",
+                "Requested entity was not found."
+            ) from None
+
+    def sheet(self, spreadsheet, range_name):
+
+        title, cells = split_range(range_name)
+
+        for sheet in spreadsheet["sheets"]:
+
+            if sheet["title"] == title:
+                break
+
+        else:
+
+            # Sans "!", Google lit la plage sur la 1re feuille.
+            if "!" not in range_name and spreadsheet["sheets"]:
+
+                sheet = spreadsheet["sheets"][0]
+
+                cells = range_name
+
+            else:
+
+                raise EmulatorError(
+                    400,
+                    "INVALID_ARGUMENT",
+                    f"Unable to parse range: {range_name}"
+                )
+
+        try:
+
+            bounds = parse_cells(cells)
+
+        except ValueError:
+
+            raise EmulatorError(
+                400,
+                "INVALID_ARGUMENT",
+                f"Unable to parse range: {range_name}"
+            ) from None
+
+        return sheet, bounds
+
+    def touch(self, spreadsheet):
+
+        spreadsheet["modifiedTime"] = now_rfc3339()
+
+        self.dirty = True
+
+    # ---------- Sheets v4 ----------
+
+    def metadata(self, spreadsheet_id):
+
+        spreadsheet = self.spreadsheet(spreadsheet_id)
+
+        with self.lock:
+
+            return {
+                "spreadsheetId": spreadsheet_id,
+                "properties": {
+                    "title": spreadsheet["title"],
+                    "locale": "fr_FR",
+                    "timeZone": "Africa/Algiers"
+                },
+                "sheets": [
+                    {
+                        "properties": {
+                            "sheetId": sheet["sheetId"],
+                            "title": sheet["title"],
+                            "index": position,
+                            "sheetType": "GRID",
+                            "gridProperties": {
+                                "rowCount": max(len(sheet["values"]), 1000),
+                                "columnCount": max(
+                                    (len(row) for row in sheet["values"]),
+                                    default=26
+                                )
+                            }
+                        }
+                    }
+                    for position, sheet in enumerate(spreadsheet["sheets"])
+                ]
+            }
+
+    def get_values(self, spreadsheet_id, range_name, params):
+
+        spreadsheet = self.spreadsheet(spreadsheet_id)
+
+        with self.lock:
+
+            sheet, (r1, c1, r2, c2) = self.sheet(spreadsheet, range_name)
+
+            rows = sheet["values"][
+                r1 or 0:
+                None if r2 is None else r2 + 1
+            ]
+
+            rows = [
+                list(
+                    row[
+                        c1 or 0:
+                        None if c2 is None else c2 + 1
+                    ]
+                )
+                for row in rows
+            ]
+
+        # Ni formules ni dates dans l'émulateur : FORMULA rend
+        # les mêmes valeurs que UNFORMATTED_VALUE.
+        if params.get("valueRenderOption") not in (
+            "UNFORMATTED_VALUE",
+            "FORMULA"
+        ):
+
+            rows = [
+                [formatted_value(value) for value in row]
+                for row in rows
+            ]
+
+        rows = trim_rows(rows)
+
+        major = params.get("majorDimension", "ROWS")
+
+        if major == "COLUMNS":
+            rows = transpose(rows)
+
+        self.stats["cells_read"] += sum(len(row) for row in rows)
+
+        result = {
+            "range": range_name,
+            "majorDimension": major
+        }
+
+        if rows:
+            result["values"] = rows
+
+        return result
+
+    def write_block(self, sheet, r1, c1, values, input_option):
+
+        rows = sheet["values"]
+
+        for offset, row_values in enumerate(values):
+
+            row_index = r1 + offset
+
+            while len(rows) <= row_index:
+                rows.append([])
+
+            row = rows[row_index]
+
+            end = c1 + len(row_values)
+
+            if len(row) < end:
+                row.extend([""] * (end - len(row)))
+
+            row[c1:end] = [
+                entered_value(value, input_option)
+                for value in row_values
+            ]
+
+        width = max((len(row) for row in values), default=0)
+
+        self.stats["cells_written"] += sum(len(row) for row in values)
+
+        return {
+            "updatedRange": a1_range(
+                sheet["title"],
+                r1,
+                c1,
+                r1 + max(len(values), 1) - 1,
+                c1 + max(width, 1) - 1
+            ),
+            "updatedRows": len(values),
+            "updatedColumns": width,
+            "updatedCells": sum(len(row) for row in values)
+        }
+
+    def update_values(self, spreadsheet_id, range_name, params, body):
+
+        spreadsheet = self.spreadsheet(spreadsheet_id)
+
+        with self.lock:
+
+            sheet, (r1, c1, _, _) = self.sheet(spreadsheet, range_name)
+
+            result = self.write_block(
+                sheet,
+                r1 or 0,
+                c1 or 0,
+                body.get("values", []),
+                params.get("valueInputOption", "RAW")
+            )
+
+            self.touch(spreadsheet)
+
+        result["spreadsheetId"] = spreadsheet_id
+
+        return result
+
+    def append_values(self, spreadsheet_id, range_name, params, body):
+
+        spreadsheet = self.spreadsheet(spreadsheet_id)
+
+        with self.lock:
+
+            sheet, (_, c1, _, _) = self.sheet(spreadsheet, range_name)
+
+            # Après la dernière ligne non vide de la table.
+            last = len(trim_rows(sheet["values"]))
+
+            result = self.write_block(
+                sheet,
+                last,
+                c1 or 0,
+                body.get("values", []),
+                params.get("valueInputOption", "RAW")
+            )
+
+            self.touch(spreadsheet)
+
+        result["spreadsheetId"] = spreadsheet_id
+
+        return {
+            "spreadsheetId": spreadsheet_id,
+            "tableRange": range_name,
+            "updates": result
+        }
+
+    def batch_get(self, spreadsheet_id, ranges, params):
+
+        return {
+            "spreadsheetId": spreadsheet_id,
+            "valueRanges": [
+                self.get_values(spreadsheet_id, range_name, params)
+                for range_name in ranges
+            ]
+        }
+
+    def batch_update(self, spreadsheet_id, body):
+
+        spreadsheet = self.spreadsheet(spreadsheet_id)
+
+        responses = []
+
+        with self.lock:
+
+            for item in body.get("data", []):
+
+                sheet, (r1, c1, _, _) = self.sheet(spreadsheet, item["range"])
+
+                responses.append(
+                    self.write_block(
+                        sheet,
+                        r1 or 0,
+                        c1 or 0,
+                        item.get("values", []),
+                        body.get("valueInputOption", "RAW")
+                    )
+                )
+
+            self.touch(spreadsheet)
+
+        return {
+            "spreadsheetId": spreadsheet_id,
+            "totalUpdatedCells": sum(
+                response["updatedCells"]
+                for response in responses
+            ),
+            "responses": responses
+        }
+
+    # ---------- Drive v3 ----------
+
+    def drive_file(self, file_id):
+
+        spreadsheet = self.spreadsheet(file_id)
+
+        return {
+            "id": file_id,
+            "name": spreadsheet["title"],
+            "mimeType": "application/vnd.google-apps.spreadsheet",
+            "modifiedTime": spreadsheet["modifiedTime"]
+        }
+
+    # ---------- routage ----------
+
+    def throttle(self, kind, endpoint):
+
+        self.stats[f"requests_{kind}"] += 1
+        self.stats[endpoint] += 1
+
+        if kind in self.quotas and not self.quotas[kind].consume():
+
+            self.stats["throttled"] += 1
+
+            raise EmulatorError(
+                429,
+                "RESOURCE_EXHAUSTED",
+                f"Quota exceeded for quota metric '{kind.title()} requests' "
+                "and limit 'per minute' of service "
+                "'sheets.googleapis.com'."
+            )
+
+        if self.latency or self.jitter:
+
+            time.sleep(
+                max(
+                    0.0,
+                    self.latency + random.uniform(-self.jitter, self.jitter)
+                )
+            )
+
+        if self.error_rate and random.random() < self.error_rate:
+
+            self.stats["injected_errors"] += 1
+
+            raise EmulatorError(
+                503,
+                "UNAVAILABLE",
+                "The service is currently unavailable."
+            )
+
+    def handle(self, method, path, query, body):
+
+        params = {
+            key: values[-1]
+            for key, values in query.items()
+        }
+
+        parts = path.strip("/").split("/")
+
+        if parts[:2] == ["drive", "v3"] and len(parts) == 4 and method == "GET":
+
+            self.throttle("drive", "files.get")
+
+            return self.drive_file(parts[3])
+
+        if parts[:2] != ["v4", "spreadsheets"] or len(parts) < 3:
+            raise EmulatorError(404, "NOT_FOUND", f"Unknown path {path}")
+
+        spreadsheet_id, _, action = unquote(parts[2]).partition(":")
+
+        if len(parts) == 3 and not action and method == "GET":
+
+            self.throttle("read", "spreadsheets.get")
+
+            return self.metadata(spreadsheet_id)
+
+        if len(parts) == 4 and parts[3] == "values:batchGet" and method == "GET":
+
+            self.throttle("read", "values.batchGet")
+
+            return self.batch_get(spreadsheet_id, query.get("ranges", []), params)
+
+        if len(parts) == 4 and parts[3] == "values:batchUpdate" and method == "POST":
+
+            self.throttle("write", "values.batchUpdate")
+
+            return self.batch_update(spreadsheet_id, body)
+
+        if len(parts) >= 5 and parts[3] == "values":
+
+            range_name = unquote("/".join(parts[4:]))
+
+            if method == "POST" and range_name.endswith(":append"):
+
+                self.throttle("write", "values.append")
+
+                return self.append_values(
+                    spreadsheet_id,
+                    range_name[:-len(":append")],
+                    params,
+                    body
+                )
+
+            if method == "GET":
+
+                self.throttle("read", "values.get")
+
+                return self.get_values(spreadsheet_id, range_name, params)
+
+            if method == "PUT":
+
+                self.throttle("write", "values.update")
+
+                return self.update_values(spreadsheet_id, range_name, params, body)
+
+        raise EmulatorError(
+            501,
+            "UNIMPLEMENTED",
+            f"{method} {path} n'est pas émulé."
+        )
+
+
+# =========================================================
+# SERVEUR HTTP
+# =========================================================
+
+class EmulatorHandler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def send_json(self, code, payload):
+
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def dispatch(self, method):
+
+        emulator = self.server.emulator
+
+        url = urlsplit(self.path)
+
+        length = int(self.headers.get("Content-Length") or 0)
+
+        body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+
+        # Points d'entrée de contrôle pour les tests de charge.
+        if url.path == "/_emulator/stats":
+
+            if method == "DELETE":
+                emulator.stats.clear()
+
+            self.send_json(200, dict(emulator.stats))
+
+            return
+
+        try:
+
+            payload = emulator.handle(
+                method,
+                url.path,
+                parse_qs(url.query),
+                body
+            )
+
+        except EmulatorError as e:
+
+            self.send_json(
+                e.code,
+                {
+                    "error": {
+                        "code": e.code,
+                        "message": e.message,
+                        "status": e.status
+                    }
+                }
+            )
+
+            return
+
+        self.send_json(200, payload)
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def do_PUT(self):
+        self.dispatch("PUT")
+
+    def do_DELETE(self):
+        self.dispatch("DELETE")
+
+
+def make_server(emulator, host="127.0.0.1", port=DEFAULT_PORT, verbose=False):
+
+    server = ThreadingHTTPServer((host, port), EmulatorHandler)
+
+    server.daemon_threads = True
+    server.emulator = emulator
+    server.verbose = verbose
+
+    return server
+
+
+def start_in_thread(emulator, host="127.0.0.1", port=0):
+
+    # Port 0 : port libre choisi par le système (tests, harnais).
+
+    server = make_server(emulator, host, port)
+
+    threading.Thread(
+        target=server.serve_forever,
+        daemon=True
+    ).start()
+
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+# =========================================================
+# CLIENT
+# =========================================================
+
+class EmulatorSession(requests.Session):
+
+    # Session passée à gspread.Client : les URL Google sont
+    # réécrites vers l'émulateur, sans authentification.
+
+    def __init__(self, base_url):
+
+        super().__init__()
+
+        self.base_url = base_url.rstrip("/") + "/"
+
+    def request(self, method, url, *args, **kwargs):
+
+        for prefix in (SHEETS_URL, GOOGLE_APIS_URL):
+
+            if url.startswith(prefix):
+
+                url = self.base_url + url[len(prefix):]
+
+                break
+
+        return super().request(method, url, *args, **kwargs)
+
+
+# =========================================================
+# LIGNE DE COMMANDE
+# =========================================================
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(
+        description="Émulateur local des API Google Sheets / Drive."
+    )
+
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--state", default=DEFAULT_STATE_PATH)
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=1000,
+        help="Taille du jeu synthétique si l'état est vide."
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--reset",
+        action="store_true",
+        help="Régénère les données même si l'état existe."
+    )
+    parser.add_argument("--read-quota", type=int, default=300)
+    parser.add_argument("--write-quota", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--verbose", action="store_true")
+
+    args = parser.parse_args(argv)
+
+    emulator = Emulator(
+        state_path=args.state,
+        read_quota=args.read_quota,
+        write_quota=args.write_quota,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate
+    )
+
+    if args.reset or not emulator.spreadsheets:
+
+        from data_info.synthetic import generate_tables
+
+        emulator.seed(generate_tables(args.rows, args.seed))
+
+        emulator.save()
+
+    threading.Thread(
+        target=emulator.save_forever,
+        daemon=True
+    ).start()
+
+    server = make_server(emulator, args.host, args.port, args.verbose)
+
+    print(
+        f"Émulateur Sheets sur http://{args.host}:{args.port} "
+        f"(état : {args.state})"
+    )
+
+    try:
+
+        server.serve_forever()
+
+    except KeyboardInterrupt:
+
+        pass
+
+    finally:
+
+        server.server_close()
+
+        emulator.save()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+from data_info.core import resource
+from data_info.projections import (
+    CONTROLS,
+    MATERIALS,
+    refresh_view
+)
+from data_info.schema import (
+    SHEET_MATERIAL_CONTROL,
+    SHEET_MATERIAL_POS
+)
+from data_info.transforms import (
+    FALSE_VALUES,
+    pos_wilayas,
+    text_column
+)
+
+
+# =========================================================
+# ETAT DU PARC MATERIEL
+# =========================================================
+
+# Un état courant par matériel installé : dernier contrôle
+# (index CONTROLS) ou, à défaut, l'état à l'installation
+# (index MATERIALS), jours depuis le dernier contrôle et
+# score d'urgence. Le tableau est recalculé seulement quand
+# un des deux index, les POS ou la date changent ; les index
+# eux-mêmes ne lisent que les lignes ajoutées.
+
+ETAT_WEIGHTS = {
+    "Neuf": 0,
+    "Bon état": 0,
+    "État moyen": 1,
+    "Mauvais état": 3,
+    "À remplacer": 4
+}
+
+ACTION_WEIGHTS = {
+    "Aucune": 0,
+    "Maintenance": 2,
+    "Réparation": 3,
+    "Remplacement": 4,
+    "Retrait": 2,
+    "Nouvelle installation": 1
+}
+
+NOT_FUNCTIONAL_WEIGHT = 5
+
+# Contrôle attendu tous les CONTROL_INTERVAL_DAYS jours ; un
+# point d'urgence par intervalle dépassé, plafonné.
+CONTROL_INTERVAL_DAYS = 90
+
+OVERDUE_MAX_WEIGHT = 3
+
+FLEET_COLUMNS = [
+    "Urgence",
+    "ID_Materiel",
+    "ID_POS",
+    "Wilaya",
+    "Type_Materiel",
+    "Marque_Materiel",
+    "Etat",
+    "Fonctionnel",
+    "Action_Necessaire",
+    "Dernier_Controle",
+    "Jours_Sans_Controle",
+    "Controles"
+]
+
+
+@resource
+def get_fleet_cache():
+
+    return {
+        "lock": threading.Lock(),
+        "version": None,
+        "fleet": None
+    }
+
+
+def build_fleet(materials, controls, wilayas, today):
+
+    # materials : {ID_POS: {clé: {"label", "row"}}} ;
+    # controls : {ID_Materiel: {"last", "controls"}}.
+    installed = pd.DataFrame.from_records(
+        [
+            {
+                **entry["row"],
+                "_key": key
+            }
+            for entries in materials.values()
+            for key, entry in entries.items()
+        ]
+    )
+
+    if installed.empty:
+        return pd.DataFrame(columns=FLEET_COLUMNS)
+
+    ids = text_column(installed, "ID_Materiel", "ID")
+
+    ids = ids.where(ids.ne(""), installed["_key"])
+
+    last = pd.DataFrame.from_dict(
+        {
+            key: {
+                "Etat": summary["last"].get("Etat", ""),
+                "Fonctionnel": summary["last"].get("Fonctionnel", ""),
+                "Action_Necessaire": summary["last"].get("Action_Necessaire", ""),
+                "Dernier_Controle": summary["last"].get("Date_Controle", ""),
+                "Controles": len(summary["controls"])
+            }
+            for key, summary in controls.items()
+        },
+        orient="index",
+        columns=[
+            "Etat",
+            "Fonctionnel",
+            "Action_Necessaire",
+            "Dernier_Controle",
+            "Controles"
+        ]
+    ).reindex(ids)
+
+    controlled = last["Controles"].notna().to_numpy()
+
+    fleet = pd.DataFrame(
+        {
+            "ID_Materiel": ids.to_numpy(),
+            "ID_POS": text_column(installed, "ID_POS").to_numpy(),
+            "Type_Materiel": text_column(installed, "Type_Materiel").to_numpy(),
+            "Marque_Materiel": text_column(installed, "Marque_Materiel").to_numpy()
+        }
+    )
+
+    fleet["Wilaya"] = fleet["ID_POS"].map(wilayas).fillna("")
+
+    # Jamais contrôlé : état et fonctionnement à l'installation.
+    for column, fallback in [
+        ("Etat", text_column(installed, "Etat")),
+        ("Fonctionnel", text_column(installed, "Fonctionnel")),
+        ("Action_Necessaire", pd.Series("", index=installed.index))
+    ]:
+
+        fleet[column] = (
+            last[column]
+            .fillna("")
+            .astype(str)
+            .str.strip()
+            .to_numpy()
+        )
+
+        fleet.loc[~controlled, column] = fallback.to_numpy()[~controlled]
+
+    fleet["Controles"] = last["Controles"].fillna(0).astype(int).to_numpy()
+
+    fleet["Dernier_Controle"] = last["Dernier_Controle"].fillna("").to_numpy()
+
+    reference = pd.to_datetime(
+        fleet["Dernier_Controle"].where(
+            controlled,
+            text_column(installed, "Date_Installation", "Date").to_numpy()
+        ),
+        errors="coerce",
+        format="mixed"
+    )
+
+    fleet["Jours_Sans_Controle"] = (
+        pd.Timestamp(today) - reference
+    ).dt.days
+
+    not_functional = (
+        fleet["Fonctionnel"].str.lower().isin(FALSE_VALUES)
+    )
+
+    overdue = (
+        fleet["Jours_Sans_Controle"]
+        .fillna(CONTROL_INTERVAL_DAYS * OVERDUE_MAX_WEIGHT)
+        // CONTROL_INTERVAL_DAYS
+    ).clip(0, OVERDUE_MAX_WEIGHT)
+
+    fleet["Urgence"] = (
+        fleet["Etat"].map(ETAT_WEIGHTS).fillna(0)
+        + fleet["Action_Necessaire"].map(ACTION_WEIGHTS).fillna(0)
+        + not_functional * NOT_FUNCTIONAL_WEIGHT
+        + overdue
+    ).astype(int)
+
+    return fleet[FLEET_COLUMNS]
+
+
+def fleet_state(df_material_pos, df_control, df_pos, today=None):
+
+    today = today or datetime.now().date()
+
+    material_view = refresh_view(
+        MATERIALS,
+        SHEET_MATERIAL_POS,
+        df_material_pos
+    )
+
+    control_view = refresh_view(
+        CONTROLS,
+        SHEET_MATERIAL_CONTROL,
+        df_control
+    )
+
+    if material_view is None:
+        return pd.DataFrame(columns=FLEET_COLUMNS)
+
+    wilayas = pos_wilayas(df_pos)
+
+    version = (
+        id(material_view),
+        material_view["changes"],
+        id(control_view),
+        control_view["changes"] if control_view else 0,
+        int(pd.util.hash_pandas_object(wilayas).sum()),
+        today
+    )
+
+    cache = get_fleet_cache()
+
+    with cache["lock"]:
+
+        if cache["version"] != version:
+
+            cache["fleet"] = build_fleet(
+                material_view["records"],
+                control_view["records"] if control_view else {},
+                wilayas,
+                today
+            )
+
+            cache["version"] = version
+
+        return cache["fleet"]
+
+
+def maintenance_backlog(fleet):
+
+    # Matériels à traiter, du plus urgent au moins urgent.
+    return fleet[
+        fleet["Urgence"] > 0
+    ].sort_values(
+        ["Urgence", "Jours_Sans_Controle"],
+        ascending=[False, False],
+        kind="stable"
+    ).reset_index(drop=True)
+
+
+def fleet_counts(fleet, by, column):
+
+    # Matériels par `by` (Marque_Materiel, Wilaya) et par
+    # valeur de `column` (Etat, Action_Necessaire).
+    if fleet.empty:
+        return pd.DataFrame()
+
+    return pd.crosstab(
+        fleet[by].replace("", "(vide)"),
+        fleet[column].replace("", "(vide)"),
+        margins=True,
+        margins_name="Total"
+    )
@@ -0,0 +1,575 @@
+import argparse
+import collections
+import json
+import os
+import resource
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+
+from data_info.emulator import Emulator, start_in_thread
+from data_info.pages import PAGES, menu_items
+from data_info.schema import PLACEHOLDER
+from data_info.synthetic import generate_tables
+
+
+# =========================================================
+# TEST DE CHARGE
+# =========================================================
+
+# N sessions Streamlit simulées (AppTest, sans navigateur) se
+# connectent, parcourent le menu et enregistrent des relevés
+# Distribution / Prix / Enquête contre l'émulateur Sheets.
+#
+#   python -m data_info.loadtest --sessions 20 --latency 0.1
+#
+# Rapporte p50/p95/p99 par action, appels API par action
+# (passe de calibration à une session, cache froid puis
+# chaud) et croissance mémoire par session.
+
+APP_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "TSS.py"
+)
+
+# Menu d'un agent (data_info.pages), sauf l'import qui attend
+# un fichier.
+MENU = [
+    label
+    for label in menu_items("agent")
+    if PAGES[label] != "bulk_import"
+]
+
+CASCADE = [
+    "marque",
+    "categorie",
+    "famille",
+    "produit",
+    "capacite"
+]
+
+
+def rss_mb():
+
+    try:
+
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+    except OSError:
+
+        # macOS : pic seulement (ru_maxrss en octets).
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**20
+
+
+def emulator_stats(url):
+
+    return requests.get(f"{url}/_emulator/stats", timeout=10).json()
+
+
+def reset_emulator_stats(url):
+
+    requests.delete(f"{url}/_emulator/stats", timeout=10)
+
+
+def api_calls(stats):
+
+    return sum(
+        value
+        for key, value in stats.items()
+        if key.startswith("requests_")
+    )
+
+
+# =========================================================
+# SESSION
+# =========================================================
+
+class Session:
+
+    def __init__(self, number, rng, timeout, on_action=None):
+
+        from streamlit.testing.v1 import AppTest
+
+        self.number = number
+        self.rng = rng
+        self.at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        self.on_action = on_action
+        self.timings = collections.defaultdict(list)
+        self.errors = []
+
+    def step(self, action, func):
+
+        started = time.perf_counter()
+
+        try:
+
+            func()
+
+            if self.at.exception:
+                raise RuntimeError(self.at.exception[0].message)
+
+        except Exception as e:
+
+            self.errors.append(f"{action}: {e}")
+
+        elapsed = time.perf_counter() - started
+
+        self.timings[action].append(elapsed)
+
+        if self.on_action:
+            self.on_action(action)
+
+    def choose(self, key):
+
+        widget = self.at.selectbox(key=key)
+
+        options = [
+            option
+            for option in widget.options
+            if option != PLACEHOLDER
+        ]
+
+        widget.set_value(self.rng.choice(options)).run()
+
+    def login(self):
+
+        self.step("login_page", self.at.run)
+
+        def submit():
+
+            names = [
+                option
+                for option in self.at.selectbox[0].options
+                if option.startswith("Agent")
+            ]
+
+            self.at.selectbox[0].set_value(self.rng.choice(names))
+            self.at.text_input[0].input("demo")
+            self.at.button[0].click().run()
+
+        self.step("login", submit)
+
+    def open_page(self, page):
+
+        self.step(
+            f"page {page}",
+            lambda: self.at.sidebar.radio[0].set_value(page).run()
+        )
+
+    def fill_product(self, prefix):
+
+        for level in CASCADE:
+
+            self.step(
+                "widget",
+                lambda level=level: self.choose(f"{prefix}_{level}")
+            )
+
+    def submit_distribution(self):
+
+        self.open_page("📦 Distribution Numérique")
+
+        self.step("widget", lambda: self.choose("distribution_pos"))
+
+        self.fill_product("distribution")
+
+        def save():
+
+            self.at.number_input(key="distribution_quantite").set_value(
+                int(self.rng.integers(1, 20))
+            )
+
+            self.at.button(key="save_distribution").click().run()
+
+        self.step("submit distribution", save)
+
+    def submit_price(self):
+
+        self.open_page("💰 Relevé Prix")
+
+        self.step("widget", lambda: self.choose("price_pos"))
+
+        self.fill_product("price")
+
+        def save():
+
+            self.at.number_input(key="price_value").set_value(
+                float(self.rng.integers(10, 500) * 100)
+            )
+
+            self.at.button(key="save_price").click().run()
+
+        self.step("submit prix", save)
+
+    def submit_survey(self):
+
+        self.open_page("📝 Enquête")
+
+        self.step("widget", lambda: self.choose("survey_subject"))
+
+        self.step("widget", lambda: self.choose("survey_pos"))
+
+        def exposed():
+
+            widget = self.at.multiselect(key="survey_exposed_brands")
+
+            widget.set_value(
+                list(
+                    self.rng.choice(
+                        widget.options,
+                        size=2,
+                        replace=False
+                    )
+                )
+            ).run()
+
+        self.step("widget", exposed)
+
+        self.fill_product("survey")
+
+        def save():
+
+            self.at.number_input(key="survey_price").set_value(
+                float(self.rng.integers(10, 500) * 100)
+            )
+
+            self.at.button(key="save_survey").click().run()
+
+        self.step("submit enquête", save)
+
+    def scenario(self, rounds):
+
+        self.login()
+
+        for _ in range(rounds):
+
+            for page in MENU:
+                self.open_page(page)
+
+            self.submit_distribution()
+            self.submit_price()
+            self.submit_survey()
+
+
+# =========================================================
+# CAMPAGNE
+# =========================================================
+
+def calibrate(emulator_url, timeout, seed):
+
+    # Une session seule : le delta des compteurs de l'émulateur
+    # autour de chaque action est exact.
+
+    calls = collections.defaultdict(list)
+
+    state = {"before": 0}
+
+    def on_action(action):
+
+        total = api_calls(emulator_stats(emulator_url))
+
+        calls[action].append(total - state["before"])
+
+        state["before"] = total
+
+    state["before"] = api_calls(emulator_stats(emulator_url))
+
+    session = Session(
+        0,
+        np.random.default_rng(seed),
+        timeout,
+        on_action=on_action
+    )
+
+    session.scenario(rounds=1)
+
+    return (
+        {
+            action: float(np.mean(values))
+            for action, values in calls.items()
+        },
+        session.errors
+    )
+
+
+def run_sessions(sessions, rounds, timeout, seed, ramp):
+
+    results = [None] * sessions
+
+    def worker(number):
+
+        time.sleep(ramp * number / max(sessions, 1))
+
+        session = Session(
+            number,
+            np.random.default_rng(seed + number),
+            timeout
+        )
+
+        session.scenario(rounds)
+
+        results[number] = session
+
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        list(pool.map(worker, range(sessions)))
+
+    return results
+
+
+def percentiles(values):
+
+    values = np.asarray(values) * 1000
+
+    return {
+        "count": int(values.size),
+        "p50_ms": round(float(np.percentile(values, 50)), 1),
+        "p95_ms": round(float(np.percentile(values, 95)), 1),
+        "p99_ms": round(float(np.percentile(values, 99)), 1),
+        "max_ms": round(float(values.max()), 1)
+    }
+
+
+def run(
+    sessions=10,
+    rounds=1,
+    rows=5000,
+    seed=42,
+    emulator_url=None,
+    latency=0.05,
+    jitter=0.02,
+    read_quota=0,
+    write_quota=0,
+    timeout=120,
+    ramp=5.0,
+    trace_memory=False
+):
+
+    server = None
+
+    if emulator_url is None:
+
+        emulator = Emulator(
+            state_path=None,
+            read_quota=read_quota,
+            write_quota=write_quota,
+            latency=latency,
+            jitter=jitter
+        )
+
+        emulator.seed(generate_tables(rows, seed))
+
+        server, emulator_url = start_in_thread(emulator)
+
+    os.environ["DATA_INFO_EMULATOR_URL"] = emulator_url
+
+    report = {
+        "sessions": sessions,
+        "rounds": rounds,
+        "rows": rows,
+        "emulator_url": emulator_url
+    }
+
+    try:
+
+        cold_calls, cold_errors = calibrate(emulator_url, timeout, seed)
+
+        if trace_memory:
+            tracemalloc.start()
+
+        rss_before = rss_mb()
+
+        traced_before = tracemalloc.get_traced_memory()[0] if trace_memory else 0
+
+        reset_emulator_stats(emulator_url)
+
+        started = time.perf_counter()
+
+        results = run_sessions(sessions, rounds, timeout, seed, ramp)
+
+        duration = time.perf_counter() - started
+
+        stats = emulator_stats(emulator_url)
+
+        # Sessions encore vivantes : leur session_state compte.
+        rss_after = rss_mb()
+
+        if trace_memory:
+
+            traced_after = tracemalloc.get_traced_memory()[0]
+
+            tracemalloc.stop()
+
+        warm_calls, warm_errors = calibrate(emulator_url, timeout, seed + 1)
+
+        timings = collections.defaultdict(list)
+
+        errors = []
+
+        for session in results:
+
+            for action, values in session.timings.items():
+                timings[action].extend(values)
+
+            errors.extend(session.errors)
+
+        actions = sum(len(values) for values in timings.values())
+
+        report.update(
+            {
+                "duration_s": round(duration, 1),
+                "actions": actions,
+                "actions_per_s": round(actions / duration, 2),
+                "latency": {
+                    action: percentiles(values)
+                    for action, values in sorted(timings.items())
+                },
+                "overall": percentiles(
+                    [value for values in timings.values() for value in values]
+                ),
+                "api_calls_total": api_calls(stats),
+                "api_calls_per_action": round(api_calls(stats) / max(actions, 1), 2),
+                "api_calls_cold": cold_calls,
+                "api_calls_warm": warm_calls,
+                "throttled": stats.get("throttled", 0),
+                "emulator": stats,
+                "rss_mb_before": round(rss_before, 1),
+                "rss_mb_after": round(rss_after, 1),
+                "rss_mb_per_session": round((rss_after - rss_before) / sessions, 2),
+                "errors": cold_errors + errors + warm_errors
+            }
+        )
+
+        if trace_memory:
+
+            report["traced_mb_per_session"] = round(
+                (traced_after - traced_before) / 2**20 / sessions,
+                2
+            )
+
+    finally:
+
+        if server is not None:
+            server.shutdown()
+
+    return report
+
+
+def print_report(report):
+
+    print(
+        f"\n{report['sessions']} sessions x {report['rounds']} tour(s), "
+        f"{report['rows']} lignes : {report['actions']} actions en "
+        f"{report['duration_s']} s ({report['actions_per_s']} actions/s)\n"
+    )
+
+    print(
+        f"{'action':<32} {'n':>6} {'p50 ms':>9} {'p95 ms':>9} "
+        f"{'p99 ms':>9} {'API froid':>10} {'API chaud':>10}"
+    )
+
+    for action, values in report["latency"].items():
+
+        print(
+            f"{action:<32} {values['count']:>6} {values['p50_ms']:>9} "
+            f"{values['p95_ms']:>9} {values['p99_ms']:>9} "
+            f"{report['api_calls_cold'].get(action, 0):>10.1f} "
+            f"{report['api_calls_warm'].get(action, 0):>10.1f}"
+        )
+
+    overall = report["overall"]
+
+    print(
+        f"{'TOTAL':<32} {overall['count']:>6} {overall['p50_ms']:>9} "
+        f"{overall['p95_ms']:>9} {overall['p99_ms']:>9}"
+    )
+
+    print(
+        f"\nAppels API : {report['api_calls_total']} "
+        f"({report['api_calls_per_action']} / action, "
+        f"{report['throttled']} refusés en 429)"
+    )
+
+    print(
+        f"Mémoire : {report['rss_mb_before']} -> {report['rss_mb_after']} Mo "
+        f"RSS ({report['rss_mb_per_session']} Mo / session)"
+    )
+
+    if "traced_mb_per_session" in report:
+
+        print(
+            f"Mémoire Python (tracemalloc) : "
+            f"{report['traced_mb_per_session']} Mo / session"
+        )
+
+    if report["errors"]:
+
+        print(f"\n{len(report['errors'])} erreur(s) :")
+
+        for error in collections.Counter(report["errors"]).most_common(10):
+            print(f"  {error[1]} x {error[0]}")
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(
+        description="Test de charge multi-sessions de l'application."
+    )
+
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--rounds", type=int, default=1)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--emulator-url",
+        default=None,
+        help="Émulateur déjà lancé ; sinon un émulateur est démarré ici."
+    )
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--read-quota", type=int, default=0)
+    parser.add_argument("--write-quota", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument(
+        "--ramp",
+        type=float,
+        default=5.0,
+        help="Secondes pour démarrer toutes les sessions."
+    )
+    parser.add_argument("--tracemalloc", action="store_true")
+    parser.add_argument("--json", default=None)
+
+    args = parser.parse_args(argv)
+
+    report = run(
+        sessions=args.sessions,
+        rounds=args.rounds,
+        rows=args.rows,
+        seed=args.seed,
+        emulator_url=args.emulator_url,
+        latency=args.latency,
+        jitter=args.jitter,
+        read_quota=args.read_quota,
+        write_quota=args.write_quota,
+        timeout=args.timeout,
+        ramp=args.ramp,
+        trace_memory=args.tracemalloc
+    )
+
+    print_report(report)
+
+    if args.json:
+
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
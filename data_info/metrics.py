@@ -0,0 +1,516 @@
+import collections
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+
+
+# =========================================================
+# METRIQUES ENTREES / SORTIES
+# =========================================================
+
+# Registre en mémoire (un par processus) : latence, volume
+# en cellules, cache hit/miss et classe d'erreur de chaque
+# opération Sheets, appels API par page et par minute, et
+# journal des appels lents. Exportable au format texte
+# Prometheus.
+
+LATENCY_BUCKETS = (
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0
+)
+
+RECENT_SAMPLES = 512
+
+SLOW_LOG_SIZE = 200
+
+
+class OperationStats:
+
+    def __init__(self):
+
+        self.count = 0
+        self.seconds = 0.0
+        self.cells = 0
+        self.cache = collections.Counter()
+        self.errors = collections.Counter()
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.recent = collections.deque(maxlen=RECENT_SAMPLES)
+
+    def add(self, seconds, cells, cache, error):
+
+        self.count += 1
+        self.seconds += seconds
+        self.cells += cells
+
+        if cache:
+            self.cache[cache] += 1
+
+        if error:
+            self.errors[error] += 1
+
+        for position, bound in enumerate(LATENCY_BUCKETS):
+
+            if seconds <= bound:
+
+                self.buckets[position] += 1
+
+                break
+
+        else:
+
+            self.buckets[-1] += 1
+
+        self.recent.append(seconds)
+
+
+class MetricsRegistry:
+
+    def __init__(
+        self,
+        slow_threshold=2.0,
+        quotas=None,
+        on_slow_call=None
+    ):
+
+        self.slow_threshold = slow_threshold
+        self.quotas = quotas or {}
+        self.on_slow_call = on_slow_call
+
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+        self.reset()
+
+    def reset(self):
+
+        with self.lock:
+
+            self.started_at = time.time()
+            self.operations = {}
+            self.counters = collections.Counter()
+            self.page_calls = collections.Counter()
+            self.api_window = {
+                kind: collections.deque()
+                for kind in ("read", "write", "drive")
+            }
+            self.slow_calls = collections.deque(maxlen=SLOW_LOG_SIZE)
+
+    # ---------- contexte ----------
+
+    def set_page(self, page):
+
+        # Un rerun Streamlit = un thread : la page courante sert
+        # à attribuer les appels API.
+        self.local.page = page
+
+    def current_page(self):
+
+        return getattr(self.local, "page", "")
+
+    def stack(self):
+
+        if not hasattr(self.local, "stack"):
+            self.local.stack = []
+
+        return self.local.stack
+
+    def annotate(self, operation, **fields):
+
+        # Complète la mesure en cours la plus proche (ex. un
+        # cache st.cache_data qui signale un miss).
+        for call in reversed(self.stack()):
+
+            if call["operation"] == operation:
+
+                call.update(fields)
+
+                return
+
+    # ---------- enregistrement ----------
+
+    @contextmanager
+    def measure(self, operation, sheet="", cache=None):
+
+        call = {
+            "operation": operation,
+            "sheet": sheet,
+            "cells": 0,
+            "cache": cache,
+            "error": None
+        }
+
+        stack = self.stack()
+
+        stack.append(call)
+
+        error = None
+
+        started = time.perf_counter()
+
+        try:
+
+            yield call
+
+        except Exception as e:
+
+            error = type(e).__name__
+
+            raise
+
+        finally:
+
+            stack.pop()
+
+            self.record(
+                operation,
+                call["sheet"],
+                time.perf_counter() - started,
+                cells=call["cells"],
+                cache=call["cache"],
+                error=error or call["error"]
+            )
+
+    def record(
+        self,
+        operation,
+        sheet,
+        seconds,
+        cells=0,
+        cache=None,
+        error=None
+    ):
+
+        page = self.current_page()
+
+        slow = None
+
+        with self.lock:
+
+            stats = self.operations.get((operation, sheet))
+
+            if stats is None:
+
+                stats = self.operations[(operation, sheet)] = OperationStats()
+
+            stats.add(seconds, cells, cache, error)
+
+            if seconds >= self.slow_threshold:
+
+                slow = {
+                    "at": datetime.now().isoformat(timespec="seconds"),
+                    "page": page,
+                    "operation": operation,
+                    "sheet": sheet,
+                    "seconds": round(seconds, 3),
+                    "cells": cells,
+                    "cache": cache or "",
+                    "error": error or ""
+                }
+
+                self.slow_calls.append(slow)
+
+        if slow and self.on_slow_call:
+
+            try:
+                self.on_slow_call(slow)
+            except Exception:
+                pass
+
+    def api_call(self, kind):
+
+        # Une tentative HTTP réelle (retries compris) : c'est
+        # ce que Google décompte dans ses quotas.
+
+        now = time.time()
+
+        with self.lock:
+
+            self.page_calls[(self.current_page(), kind)] += 1
+
+            self.api_window[kind].append(now)
+
+    def increment(self, name, **labels):
+
+        with self.lock:
+
+            self.counters[
+                (name, tuple(sorted(labels.items())))
+            ] += 1
+
+    # ---------- lecture ----------
+
+    def quota_usage(self):
+
+        cutoff = time.time() - 60
+
+        with self.lock:
+
+            usage = {}
+
+            for kind, window in self.api_window.items():
+
+                while window and window[0] < cutoff:
+                    window.popleft()
+
+                usage[kind] = {
+                    "last_minute": len(window),
+                    "limit": self.quotas.get(kind)
+                }
+
+        return usage
+
+    def summary(self):
+
+        rows = []
+
+        with self.lock:
+
+            items = [
+                (key, stats, list(stats.recent))
+                for key, stats in self.operations.items()
+            ]
+
+        for (operation, sheet), stats, recent in sorted(
+            items,
+            key=lambda item: -item[1].seconds
+        ):
+
+            lookups = stats.cache["hit"] + stats.cache["miss"]
+
+            rows.append(
+                {
+                    "Opération": operation,
+                    "Feuille": sheet,
+                    "Appels": stats.count,
+                    "Erreurs": sum(stats.errors.values()),
+                    "Total_s": round(stats.seconds, 2),
+                    "Moyenne_ms": round(stats.seconds / stats.count * 1000, 1),
+                    "p95_ms": round(float(np.percentile(recent, 95)) * 1000, 1),
+                    "Cellules": stats.cells,
+                    "Hit_%": (
+                        round(stats.cache["hit"] / lookups * 100, 1)
+                        if lookups
+                        else None
+                    ),
+                    "Classes_erreur": ", ".join(
+                        f"{name} x{count}"
+                        for name, count in stats.errors.most_common()
+                    )
+                }
+            )
+
+        return rows
+
+    def pages(self):
+
+        with self.lock:
+
+            return [
+                {
+                    "Page": page,
+                    "Type": kind,
+                    "Appels_API": count
+                }
+                for (page, kind), count in sorted(
+                    self.page_calls.items(),
+                    key=lambda item: -item[1]
+                )
+            ]
+
+    def counter_rows(self):
+
+        with self.lock:
+
+            return [
+                {
+                    "Compteur": name,
+                    **dict(labels),
+                    "Valeur": count
+                }
+                for (name, labels), count in sorted(self.counters.items())
+            ]
+
+    # ---------- export ----------
+
+    def prometheus_text(self, prefix="data_info"):
+
+        lines = []
+
+        def metric(name, kind, help_text):
+
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+
+        with self.lock:
+
+            operations = sorted(self.operations.items())
+            counters = sorted(self.counters.items())
+            page_calls = sorted(self.page_calls.items())
+
+        metric(
+            "sheets_operation_seconds",
+            "histogram",
+            "Durée des opérations Google Sheets."
+        )
+
+        for (operation, sheet), stats in operations:
+
+            base = labels(operation=operation, sheet=sheet)
+
+            cumulative = 0
+
+            for bound, count in zip(LATENCY_BUCKETS, stats.buckets):
+
+                cumulative += count
+
+                lines.append(
+                    f"{prefix}_sheets_operation_seconds_bucket"
+                    f"{labels(operation=operation, sheet=sheet, le=bound)} "
+                    f"{cumulative}"
+                )
+
+            lines.append(
+                f"{prefix}_sheets_operation_seconds_bucket"
+                f"{labels(operation=operation, sheet=sheet, le='+Inf')} "
+                f"{stats.count}"
+            )
+            lines.append(
+                f"{prefix}_sheets_operation_seconds_sum{base} {stats.seconds:.6f}"
+            )
+            lines.append(
+                f"{prefix}_sheets_operation_seconds_count{base} {stats.count}"
+            )
+
+        metric(
+            "sheets_operation_cells_total",
+            "counter",
+            "Cellules lues ou écrites."
+        )
+
+        for (operation, sheet), stats in operations:
+
+            lines.append(
+                f"{prefix}_sheets_operation_cells_total"
+                f"{labels(operation=operation, sheet=sheet)} {stats.cells}"
+            )
+
+        metric(
+            "sheets_operation_cache_total",
+            "counter",
+            "Résultats de cache (hit, miss)."
+        )
+
+        for (operation, sheet), stats in operations:
+
+            for result, count in sorted(stats.cache.items()):
+
+                lines.append(
+                    f"{prefix}_sheets_operation_cache_total"
+                    f"{labels(operation=operation, sheet=sheet, result=result)} "
+                    f"{count}"
+                )
+
+        metric(
+            "sheets_operation_errors_total",
+            "counter",
+            "Erreurs par classe d'exception."
+        )
+
+        for (operation, sheet), stats in operations:
+
+            for error, count in sorted(stats.errors.items()):
+
+                lines.append(
+                    f"{prefix}_sheets_operation_errors_total"
+                    f"{labels(operation=operation, sheet=sheet, error=error)} "
+                    f"{count}"
+                )
+
+        metric(
+            "sheets_api_calls_total",
+            "counter",
+            "Tentatives HTTP vers Google par page."
+        )
+
+        for (page, kind), count in page_calls:
+
+            lines.append(
+                f"{prefix}_sheets_api_calls_total"
+                f"{labels(page=page, kind=kind)} {count}"
+            )
+
+        metric(
+            "sheets_api_calls_last_minute",
+            "gauge",
+            "Appels API sur les 60 dernières secondes."
+        )
+
+        usage = self.quota_usage()
+
+        for kind, values in usage.items():
+
+            lines.append(
+                f"{prefix}_sheets_api_calls_last_minute"
+                f"{labels(kind=kind)} {values['last_minute']}"
+            )
+
+        metric(
+            "sheets_api_quota_per_minute",
+            "gauge",
+            "Quota Google configuré par minute."
+        )
+
+        for kind, values in usage.items():
+
+            if values["limit"]:
+
+                lines.append(
+                    f"{prefix}_sheets_api_quota_per_minute"
+                    f"{labels(kind=kind)} {values['limit']}"
+                )
+
+        names = sorted({name for (name, _), _ in counters})
+
+        for name in names:
+
+            metric(f"{name}_total", "counter", name.replace("_", " ") + ".")
+
+            for (counter_name, counter_labels), count in counters:
+
+                if counter_name == name:
+
+                    lines.append(
+                        f"{prefix}_{name}_total"
+                        f"{labels(**dict(counter_labels))} {count}"
+                    )
+
+        return "\n".join(lines) + "\n"
+
+
+def labels(**values):
+
+    if not values:
+        return ""
+
+    def escape(value):
+
+        return (
+            str(value)
+            .replace("\\", "\\\\")
+            .replace("\"", "\\\"")
+            .replace("\n", "\\n")
+        )
+
+    return "{" + ",".join(
+        f'{key}="{escape(value)}"'
+        for key, value in values.items()
+    ) + "}"
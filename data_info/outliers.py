@@ -0,0 +1,299 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from data_info.core import resource
+from data_info.projections import (
+    PRICE_HISTORY,
+    refresh_view
+)
+from data_info.schema import SHEET_PRICES
+from data_info.search import cached_index
+from data_info.transforms import (
+    PRODUCT_LEVELS,
+    clean_text,
+    frame_version,
+    pos_wilayas,
+    price_column,
+    text_column
+)
+
+
+# =========================================================
+# PRIX SUSPECTS
+# =========================================================
+
+# Modèle robuste par produit (Marque … Capacité_Dimension),
+# et en option par Wilaya : médiane et MAD (écart absolu
+# médian) des prix relevés, insensibles aux quelques saisies
+# aberrantes qu'on cherche justement à repérer.
+#
+# score = 0,6745 × (prix − médiane) / MAD (Iglewicz et
+# Hoaglin) ; au-delà de OUTLIER_SCORE en valeur absolue, le
+# prix est suspect (un zéro en trop donne un score de
+# plusieurs centaines). Un groupe de moins de MIN_READINGS
+# relevés n'est pas jugé. La MAD est bornée à MIN_SPREAD ×
+# médiane : si tous les prix sont identiques, un petit écart
+# n'est pas suspect.
+
+OUTLIER_SCORE = 3.5
+
+MAD_FACTOR = 0.6745
+
+MIN_READINGS = 5
+
+MIN_SPREAD = 0.02
+
+OUTLIER_COLUMNS = [
+    "Mediane",
+    "Nb_Releves",
+    "Score",
+    "Suspect"
+]
+
+
+WILAYA_COLUMNS = [
+    "ID_POS",
+    "Wilaya"
+]
+
+
+def wilaya_map(df_pos):
+
+    # pos_wilayas, recalculé seulement quand la feuille POS
+    # est relue (la saisie en grille vérifie chaque ligne).
+    if df_pos is None:
+        return pos_wilayas(df_pos)
+
+    return cached_index(
+        "pos_wilayas",
+        df_pos,
+        WILAYA_COLUMNS,
+        pos_wilayas
+    )
+
+
+def robust_scores(prices, medians, mads):
+
+    spread = np.maximum(
+        mads,
+        MIN_SPREAD * np.abs(medians)
+    )
+
+    return MAD_FACTOR * (prices - medians) / spread
+
+
+# ---------- saisie : un prix contre son produit ----------
+
+def check_price(df_prices, df_pos, pos, product, price):
+
+    # Prix saisi comparé aux relevés du même produit : ceux
+    # de la Wilaya du POS s'ils sont assez nombreux, sinon
+    # tous. None si le produit a trop peu de relevés.
+    view = refresh_view(
+        PRICE_HISTORY,
+        SHEET_PRICES,
+        df_prices
+    )
+
+    group = (
+        view["records"].get(
+            tuple(clean_text(value) for value in product)
+        )
+        if view is not None
+        else None
+    )
+
+    if group is None or not price:
+        return None
+
+    pos_ids, prices = group
+
+    scope = "tous POS"
+
+    wilayas = wilaya_map(df_pos)
+
+    wilaya = wilayas.get(clean_text(pos), "")
+
+    if wilaya:
+
+        local = (
+            pd.Series(pos_ids).map(wilayas).eq(wilaya).to_numpy()
+        )
+
+        if local.sum() >= MIN_READINGS:
+
+            prices = prices[local]
+
+            scope = wilaya
+
+    if len(prices) < MIN_READINGS:
+        return None
+
+    median = float(np.median(prices))
+
+    mad = float(np.median(np.abs(prices - median)))
+
+    score = float(
+        robust_scores(price, median, mad)
+    )
+
+    return {
+        "median": median,
+        "readings": len(prices),
+        "score": score,
+        "suspect": abs(score) > OUTLIER_SCORE,
+        "scope": scope
+    }
+
+
+# ---------- historique : tous les prix d'un coup ----------
+
+def score_prices(df_prices, df_pos=None, by_wilaya=False):
+
+    # Lignes de prix > 0 avec Mediane, Nb_Releves, Score et
+    # Suspect (et Wilaya si by_wilaya), en une passe groupby.
+    if df_prices is None or df_prices.empty:
+        return pd.DataFrame(columns=OUTLIER_COLUMNS)
+
+    column = price_column(df_prices)
+
+    if column is None:
+        return pd.DataFrame(columns=OUTLIER_COLUMNS)
+
+    prices = pd.to_numeric(
+        df_prices[column],
+        errors="coerce"
+    )
+
+    valid = (prices > 0).to_numpy()
+
+    keys = pd.DataFrame(
+        {
+            level: text_column(df_prices, level).to_numpy(dtype=object)[valid]
+            for level in PRODUCT_LEVELS
+        }
+    )
+
+    scored = df_prices[valid].copy()
+
+    if by_wilaya:
+
+        scored["Wilaya"] = (
+            text_column(scored, "ID_POS")
+            .map(wilaya_map(df_pos))
+            .fillna("")
+            .to_numpy()
+        )
+
+        keys["Wilaya"] = scored["Wilaya"].to_numpy()
+
+    # Un entier par groupe : les agrégats suivants groupent
+    # sur une seule colonne numérique.
+    groups = keys.groupby(
+        list(keys.columns),
+        sort=False
+    ).ngroup().to_numpy()
+
+    values = pd.Series(
+        prices.to_numpy(dtype=float)[valid]
+    )
+
+    by_group = values.groupby(groups)
+
+    medians = by_group.transform("median")
+
+    mads = (values - medians).abs().groupby(groups).transform("median")
+
+    counts = by_group.transform("count")
+
+    scores = robust_scores(
+        values.to_numpy(),
+        medians.to_numpy(),
+        mads.to_numpy()
+    )
+
+    scored["Mediane"] = medians.to_numpy()
+    scored["Nb_Releves"] = counts.to_numpy()
+    scored["Score"] = np.round(scores, 1)
+    scored["Suspect"] = (
+        (counts.to_numpy() >= MIN_READINGS)
+        & (np.abs(scores) > OUTLIER_SCORE)
+    )
+
+    return scored
+
+
+@resource
+def get_scores_cache():
+
+    return {
+        "lock": threading.Lock(),
+        "scores": {}
+    }
+
+
+def cached_scores(df_prices, df_pos=None, by_wilaya=False):
+
+    # score_prices recalculé seulement quand l'index
+    # PRICE_HISTORY (lignes ajoutées ou envoyées) ou, par
+    # Wilaya, la feuille POS changent ; une copie par valeur
+    # de by_wilaya.
+    view = refresh_view(
+        PRICE_HISTORY,
+        SHEET_PRICES,
+        df_prices
+    )
+
+    if view is None:
+        return score_prices(
+            df_prices,
+            df_pos,
+            by_wilaya=by_wilaya
+        )
+
+    version = (
+        id(view),
+        view["changes"],
+        frame_version(df_pos, WILAYA_COLUMNS)
+        if by_wilaya and df_pos is not None
+        else None
+    )
+
+    cache = get_scores_cache()
+
+    with cache["lock"]:
+
+        cached = cache["scores"].get(by_wilaya)
+
+        if cached is None or cached[0] != version:
+
+            cached = (
+                version,
+                score_prices(
+                    df_prices,
+                    df_pos,
+                    by_wilaya=by_wilaya
+                )
+            )
+
+            cache["scores"][by_wilaya] = cached
+
+        return cached[1]
+
+
+def suspect_prices(scored):
+
+    # Prix suspects, les plus éloignés de leur médiane d'abord.
+    if scored.empty:
+        return scored
+
+    suspects = scored[scored["Suspect"]]
+
+    return suspects.iloc[
+        np.argsort(
+            -suspects["Score"].abs().to_numpy(),
+            kind="stable"
+        )
+    ].reset_index(drop=True)
@@ -0,0 +1,69 @@
+import importlib
+import sys
+
+from data_info import profiling
+
+
+# =========================================================
+# PAGES
+# =========================================================
+
+# Une entrée de menu = un module data_info.pages.<module>
+# avec un point d'entrée render(). Le routeur (TSS.py)
+# n'importe un module qu'à la première ouverture de sa page :
+# les autres pages ne coûtent rien au démarrage ni aux
+# reruns suivants.
+#
+# Les formulaires de saisie sont des fragments : changer une
+# liste de la cascade ne réexécute que le formulaire, pas la
+# connexion, la barre latérale ni les load_sheet de la page.
+# Un enregistrement réussi relance toute la page (st.rerun)
+# pour rafraîchir les tableaux.
+
+LOGIN_PAGE = "🔐 Connexion"
+
+PAGES = {
+    LOGIN_PAGE: "login",
+    "🏠 Dashboard": "dashboard",
+    "📦 Distribution Numérique": "distribution",
+    "👤 Profil Client": "profile",
+    "💰 Relevé Prix": "prices",
+    "📝 Enquête": "survey",
+    "🧰 Matériel POS": "material",
+    "🚗 Visites POS": "visits",
+    "🎯 Objectifs POS": "objectives",
+    "📈 Statistiques": "statistics",
+    "📥 Import": "bulk_import",
+    "⚙️ Performance": "performance"
+}
+
+ADMIN_PAGES = [
+    "⚙️ Performance"
+]
+
+
+def menu_items(role):
+
+    return [
+        label
+        for label in PAGES
+        if label != LOGIN_PAGE
+        and (label not in ADMIN_PAGES or role == "admin")
+    ]
+
+
+def load_page(label):
+
+    name = f"{__name__}.{PAGES[label]}"
+
+    module = sys.modules.get(name)
+
+    if module is None:
+
+        with profiling.section(
+            f"import {name}"
+        ):
+
+            module = importlib.import_module(name)
+
+    return module
@@ -0,0 +1,211 @@
+import pandas as pd
+import streamlit as st
+
+from data_info import profiling
+from data_info.bulk_import import (
+    IMPORT_SPECS,
+    read_table,
+    template,
+    validate
+)
+from data_info.core import SENT, SPOOLED
+from data_info.schema import (
+    SHEET_COLUMNS,
+    SHEET_POS,
+    SHEET_PRODUCTS
+)
+from data_info.transforms import text_column
+from data_info.ui import (
+    append_rows,
+    load_sheet
+)
+
+
+# =========================================================
+# IMPORT CSV / EXCEL
+# =========================================================
+
+PREVIEW_ROWS = 50
+
+
+def render():
+
+    st.header(
+        "📥 Import de relevés"
+    )
+
+    profiling.mark(
+        "chargement"
+    )
+
+    # Résultat du dernier import, affiché après le rerun qui
+    # vide le sélecteur de fichier.
+    result = st.session_state.pop(
+        "import_result",
+        None
+    )
+
+    if result:
+
+        st.success(
+            f"✅ {result[SENT]} ligne(s) importée(s)."
+            + (
+                f" {result[SPOOLED]} en attente de synchronisation."
+                if result[SPOOLED]
+                else ""
+            )
+        )
+
+    st.info(
+        "Fichier CSV ou Excel, une ligne par relevé, avec les "
+        "colonnes du modèle. Identifiant et utilisateur sont "
+        "ajoutés automatiquement ; une date vide vaut "
+        "aujourd'hui."
+    )
+
+    sheet = st.selectbox(
+        "Type de relevé",
+        list(IMPORT_SPECS),
+        format_func=lambda name: IMPORT_SPECS[name]["label"],
+        key="import_sheet"
+    )
+
+    st.download_button(
+        "📄 Télécharger le modèle CSV",
+        template(sheet).to_csv(index=False).encode("utf-8-sig"),
+        file_name=f"modele_{sheet}.csv",
+        mime="text/csv"
+    )
+
+    uploaded = st.file_uploader(
+        "Fichier à importer",
+        type=["csv", "xlsx"],
+        key=f"import_file_{st.session_state.get('import_runs', 0)}"
+    )
+
+    if uploaded is None:
+        return
+
+    profiling.mark(
+        "validation"
+    )
+
+    try:
+
+        df = read_table(
+            uploaded,
+            uploaded.name
+        )
+
+    except Exception as e:
+
+        st.error(
+            f"❌ Fichier illisible : {e}"
+        )
+
+        return
+
+    df_pos = load_sheet(
+        SHEET_POS
+    )
+
+    df_products = load_sheet(
+        SHEET_PRODUCTS
+    )
+
+    # Lignes d'un fichier déjà importé : écartées.
+    existing_ids = text_column(
+        load_sheet(sheet),
+        IMPORT_SPECS[sheet]["id"]
+    )
+
+    rows, errors = validate(
+        sheet,
+        df,
+        df_pos,
+        df_products,
+        user_id=st.session_state.user_id,
+        existing_ids=existing_ids
+    )
+
+    c1, c2, c3 = st.columns(3)
+
+    c1.metric(
+        "Lignes lues",
+        len(df)
+    )
+
+    c2.metric(
+        "Valides",
+        len(rows)
+    )
+
+    c3.metric(
+        "En erreur",
+        errors["Ligne"].nunique()
+    )
+
+    if not errors.empty:
+
+        st.subheader(
+            "⚠️ Erreurs"
+        )
+
+        st.dataframe(
+            errors,
+            use_container_width=True,
+            hide_index=True
+        )
+
+        st.download_button(
+            "📥 Télécharger les erreurs",
+            errors.to_csv(index=False).encode("utf-8-sig"),
+            file_name=f"erreurs_{sheet}.csv",
+            mime="text/csv"
+        )
+
+    if not rows:
+        return
+
+    st.subheader(
+        "👀 Aperçu des lignes valides"
+    )
+
+    st.dataframe(
+        pd.DataFrame(
+            rows[:PREVIEW_ROWS],
+            columns=SHEET_COLUMNS[sheet]
+        ),
+        use_container_width=True,
+        hide_index=True
+    )
+
+    if st.button(
+        f"📤 Importer {len(rows)} ligne(s) valide(s)",
+        type="primary",
+        use_container_width=True,
+        key="import_submit"
+    ):
+
+        profiling.mark(
+            "écriture"
+        )
+
+        with st.spinner(
+            "Import en cours..."
+        ):
+
+            result = append_rows(
+                sheet,
+                rows
+            )
+
+        if result:
+
+            st.session_state.import_result = result
+
+            st.session_state.import_runs = (
+                st.session_state.get("import_runs", 0) + 1
+            )
+
+            st.rerun()
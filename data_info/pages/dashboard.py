@@ -0,0 +1,118 @@
+import streamlit as st
+
+from data_info import profiling
+from data_info.schema import (
+    SHEET_POS,
+    SHEET_PRICES,
+    SHEET_PRODUCTS,
+    SHEET_SURVEYS
+)
+from data_info.ui import load_sheet
+
+
+# =========================================================
+# DASHBOARD
+# =========================================================
+
+def render():
+
+    st.header(
+        "🏠 Tableau de bord"
+    )
+
+    profiling.mark(
+        "chargement"
+    )
+
+    # Seulement les tables utiles
+    df_pos = load_sheet(
+        SHEET_POS
+    )
+
+    df_products = load_sheet(
+        SHEET_PRODUCTS
+    )
+
+    df_prices = load_sheet(
+        SHEET_PRICES
+    )
+
+    df_surveys = load_sheet(
+        SHEET_SURVEYS
+    )
+
+    profiling.mark(
+        "indicateurs"
+    )
+
+    c1, c2, c3, c4 = st.columns(4)
+
+    c1.metric(
+        "POS",
+        len(df_pos)
+    )
+
+    c2.metric(
+        "Produits",
+        len(df_products)
+    )
+
+    c3.metric(
+        "Relevés prix",
+        len(df_prices)
+    )
+
+    c4.metric(
+        "Enquêtes",
+        len(df_surveys)
+    )
+
+    st.markdown("---")
+
+    st.subheader(
+        "📌 Modules Data_Info"
+    )
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+
+        st.info(
+            "**Distribution Numérique**\n\n"
+            "Mesurer la présence des produits "
+            "et des marques dans les POS."
+        )
+
+    with col2:
+
+        st.info(
+            "**Profil Client**\n\n"
+            "Collecter les informations "
+            "principales de chaque point de vente."
+        )
+
+    with col3:
+
+        st.info(
+            "**Relevé Prix**\n\n"
+            "Collecter et comparer "
+            "les prix du marché."
+        )
+
+    col4, col5 = st.columns(2)
+
+    with col4:
+
+        st.info(
+            "**Enquête**\n\n"
+            "Créer des enquêtes "
+            "spécifiques sur le marché."
+        )
+
+    with col5:
+
+        st.info(
+            "**Statistiques**\n\n"
+            "Suivre les KPI et l'évolution "
+            "des données collectées."
+        )
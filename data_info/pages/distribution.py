@@ -0,0 +1,388 @@
+import time
+import uuid
+from datetime import datetime
+
+import streamlit as st
+
+from data_info import profiling
+from data_info.projections import last_reading
+from data_info.schema import (
+    PLACEHOLDER,
+    SHEET_DISTRIBUTION,
+    SHEET_POS,
+    SHEET_PRODUCTS
+)
+from data_info.ui import (
+    CAPTURE_MODES,
+    append_row,
+    append_rows,
+    capture_mode,
+    grid_saved,
+    grid_selection,
+    load_sheet,
+    pos_picker,
+    product_cascade,
+    product_grid,
+    show_last_reading
+)
+
+
+# =========================================================
+# DISTRIBUTION NUMERIQUE
+# =========================================================
+
+@st.fragment
+@profiling.profiled("formulaire distribution")
+def distribution_form(
+    df_pos,
+    df_products,
+    df_distribution
+):
+
+    selected_pos = pos_picker(
+        df_pos,
+        "distribution_pos",
+        label="📍 Point de vente"
+    )
+
+    st.subheader(
+        "📦 Produit"
+    )
+
+    (
+        marque,
+        categorie,
+        famille,
+        produit,
+        capacite
+    ) = product_cascade(
+        df_products,
+        prefix="distribution"
+    )
+
+    selected = PLACEHOLDER not in (
+        selected_pos,
+        marque,
+        categorie,
+        famille,
+        produit,
+        capacite
+    )
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+
+        quantite = st.number_input(
+            "Quantité présente",
+            min_value=0,
+            step=1,
+            value=0,
+            key="distribution_quantite"
+        )
+
+        if selected:
+
+            show_last_reading(
+                last_reading(
+                    SHEET_DISTRIBUTION,
+                    df_distribution,
+                    selected_pos,
+                    (marque, categorie, famille, produit, capacite)
+                ),
+                "Quantite",
+                quantite,
+                "quantité"
+            )
+
+    with col2:
+
+        date_visite = st.date_input(
+            "Date de visite",
+            value=datetime.now().date(),
+            key="distribution_date"
+        )
+
+    remarque = st.text_area(
+        "Remarque",
+        key="distribution_remarque"
+    )
+
+    if st.button(
+        "💾 Enregistrer",
+        use_container_width=True,
+        key="save_distribution"
+    ):
+
+        errors = []
+
+        if selected_pos == "--- Sélectionner ---":
+            errors.append(
+                "Sélectionnez un POS."
+            )
+
+        if marque == "--- Sélectionner ---":
+            errors.append(
+                "Sélectionnez une marque."
+            )
+
+        if categorie == "--- Sélectionner ---":
+            errors.append(
+                "Sélectionnez une catégorie."
+            )
+
+        if famille == "--- Sélectionner ---":
+            errors.append(
+                "Sélectionnez une famille."
+            )
+
+        if produit == "--- Sélectionner ---":
+            errors.append(
+                "Sélectionnez un produit."
+            )
+
+        if capacite == "--- Sélectionner ---":
+            errors.append(
+                "Sélectionnez une capacité/dimension."
+            )
+
+        if errors:
+
+            for error in errors:
+                st.error(error)
+
+        else:
+
+            success = append_row(
+                SHEET_DISTRIBUTION,
+                [
+                    str(uuid.uuid4()),
+                    str(date_visite),
+                    selected_pos,
+                    marque,
+                    categorie,
+                    famille,
+                    produit,
+                    capacite,
+                    int(quantite),
+                    st.session_state.user_id,
+                    remarque
+                ]
+            )
+
+            if success:
+
+                st.success(
+                    "✅ Distribution enregistrée."
+                )
+
+                time.sleep(1)
+
+                st.rerun()
+
+
+@st.fragment
+@profiling.profiled("grille distribution")
+def distribution_grid(
+    df_pos,
+    df_products
+):
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+
+        selected_pos = pos_picker(
+            df_pos,
+            "distribution_grid_pos",
+            label="📍 Point de vente"
+        )
+
+    with col2:
+
+        date_visite = st.date_input(
+            "Date de visite",
+            value=datetime.now().date(),
+            key="distribution_grid_date"
+        )
+
+    marque, categorie, famille = grid_selection(
+        df_products,
+        "distribution"
+    )
+
+    if PLACEHOLDER in (marque, categorie):
+
+        st.info(
+            "Choisissez une marque et une catégorie pour "
+            "lister tous leurs produits."
+        )
+
+        return
+
+    edited = product_grid(
+        df_products,
+        "distribution",
+        marque,
+        categorie,
+        famille,
+        {
+            "Quantite": (
+                None,
+                st.column_config.NumberColumn(
+                    "Quantité présente",
+                    min_value=0,
+                    step=1,
+                    format="%d"
+                )
+            ),
+            "Remarque": (
+                "",
+                st.column_config.TextColumn(
+                    "Remarque"
+                )
+            )
+        }
+    )
+
+    # Quantité vide = produit non relevé ; 0 = absent du POS.
+    filled = edited[
+        edited["Quantite"].notna()
+    ].fillna(
+        {
+            "Remarque": ""
+        }
+    )
+
+    if st.button(
+        f"💾 Enregistrer {len(filled)} relevé(s)",
+        use_container_width=True,
+        key="save_distribution_grid"
+    ):
+
+        if selected_pos == PLACEHOLDER:
+
+            st.error(
+                "Sélectionnez un POS."
+            )
+
+        elif filled.empty:
+
+            st.error(
+                "Renseignez au moins une quantité."
+            )
+
+        else:
+
+            rows = [
+                [
+                    str(uuid.uuid4()),
+                    str(date_visite),
+                    selected_pos,
+                    marque,
+                    categorie,
+                    item["Famille"],
+                    item["Produit"],
+                    item["Capacité_Dimension"],
+                    int(item["Quantite"]),
+                    st.session_state.user_id,
+                    item["Remarque"]
+                ]
+                for item in filled.to_dict("records")
+            ]
+
+            if append_rows(
+                SHEET_DISTRIBUTION,
+                rows
+            ):
+
+                grid_saved(
+                    "distribution",
+                    len(rows)
+                )
+
+
+def render():
+
+    st.header(
+        "📦 Distribution Numérique"
+    )
+
+    profiling.mark(
+        "chargement"
+    )
+
+    df_pos = load_sheet(
+        SHEET_POS
+    )
+
+    df_products = load_sheet(
+        SHEET_PRODUCTS
+    )
+
+    df_distribution = load_sheet(
+        SHEET_DISTRIBUTION
+    )
+
+    if df_pos.empty:
+
+        st.warning(
+            "La table POS est vide."
+        )
+
+        st.stop()
+
+    if df_products.empty:
+
+        st.warning(
+            "La table Produits est vide."
+        )
+
+        st.stop()
+
+    # -----------------------------------------------------
+    # POS
+    # -----------------------------------------------------
+
+    profiling.mark(
+        "formulaire"
+    )
+
+    if capture_mode("distribution") == CAPTURE_MODES[0]:
+
+        distribution_form(
+            df_pos,
+            df_products,
+            df_distribution
+        )
+
+    else:
+
+        distribution_grid(
+            df_pos,
+            df_products
+        )
+
+    st.markdown("---")
+
+    profiling.mark(
+        "derniers relevés"
+    )
+
+    st.subheader(
+        "📋 Derniers relevés"
+    )
+
+    if not df_distribution.empty:
+
+        st.dataframe(
+            df_distribution.tail(20),
+            use_container_width=True,
+            hide_index=True
+        )
+
+    else:
+
+        st.info(
+            "Aucun relevé enregistré."
+        )
@@ -0,0 +1,150 @@
+import streamlit as st
+
+from data_info.schema import SHEET_USERS
+from data_info.transforms import clean_text
+from data_info.ui import load_sheet
+
+
+# =========================================================
+# CONNEXION
+# =========================================================
+
+def render():
+
+    st.markdown(
+        "<div class='main-title'>📊 Data_Info</div>",
+        unsafe_allow_html=True
+    )
+
+    st.markdown(
+        "<div class='small-title'>"
+        "Market Data Collection & Analysis"
+        "</div>",
+        unsafe_allow_html=True
+    )
+
+    users = load_sheet(
+        SHEET_USERS
+    )
+
+    if users.empty:
+
+        st.error(
+            "Impossible de charger la table Utilisateurs."
+        )
+
+        st.stop()
+
+    if (
+        "Nom" not in users.columns
+        or "Password" not in users.columns
+    ):
+
+        st.error(
+            "La table Utilisateurs doit contenir : "
+            "ID_User, Nom, Email, Password, Role, Statut."
+        )
+
+        st.stop()
+
+    users["Nom"] = (
+        users["Nom"]
+        .astype(str)
+        .str.strip()
+    )
+
+    active_users = users.copy()
+
+    if "Statut" in active_users.columns:
+
+        active_users = active_users[
+            active_users["Statut"]
+            .astype(str)
+            .str.lower()
+            .str.strip()
+            != "inactif"
+        ]
+
+    names = sorted(
+        active_users["Nom"]
+        .dropna()
+        .unique()
+        .tolist()
+    )
+
+    with st.form("login_form"):
+
+        st.subheader("🔐 Connexion")
+
+        selected_name = st.selectbox(
+            "Utilisateur",
+            names if names else ["Aucun utilisateur"]
+        )
+
+        password = st.text_input(
+            "Mot de passe",
+            type="password"
+        )
+
+        login_button = st.form_submit_button(
+            "Se connecter",
+            use_container_width=True
+        )
+
+        if login_button:
+
+            user = active_users[
+                active_users["Nom"]
+                == selected_name
+            ]
+
+            if user.empty:
+
+                st.error(
+                    "Utilisateur introuvable."
+                )
+
+            else:
+
+                user = user.iloc[0]
+
+                if (
+                    clean_text(
+                        user["Password"]
+                    )
+                    != password.strip()
+                ):
+
+                    st.error(
+                        "Mot de passe incorrect."
+                    )
+
+                else:
+
+                    st.session_state.logged_in = True
+
+                    st.session_state.user_name = (
+                        clean_text(
+                            user["Nom"]
+                        )
+                    )
+
+                    st.session_state.role = (
+                        clean_text(
+                            user.get(
+                                "Role",
+                                "enqueteur"
+                            )
+                        ).lower()
+                    )
+
+                    st.session_state.user_id = (
+                        clean_text(
+                            user.get(
+                                "ID_User",
+                                ""
+                            )
+                        )
+                    )
+
+                    st.rerun()
@@ -0,0 +1,819 @@
+import time
+import uuid
+from datetime import datetime
+
+import streamlit as st
+
+from data_info import profiling
+from data_info.schema import (
+    ACTIONS_MATERIEL,
+    ETATS_MATERIEL,
+    SHEET_DISTRIBUTION,
+    SHEET_MATERIAL_CONTROL,
+    SHEET_MATERIAL_POS,
+    SHEET_MATERIAL_TYPES,
+    SHEET_POS,
+    SHEET_PRODUCTS
+)
+from data_info.fleet import (
+    CONTROL_INTERVAL_DAYS,
+    fleet_counts,
+    fleet_state,
+    maintenance_backlog
+)
+from data_info.projections import (
+    brands_at,
+    last_control,
+    materials_at
+)
+from data_info.transforms import (
+    FALSE_VALUES,
+    clean_text,
+    unique_sorted
+)
+from data_info.ui import (
+    append_dict_row,
+    load_sheet,
+    photo_gallery,
+    pos_picker,
+    store_uploaded_photo
+)
+
+
+# =========================================================
+# MATERIEL POS
+# =========================================================
+
+BACKLOG_ROWS = 200
+
+FLEET_ALL = "Toutes"
+
+
+@st.fragment
+@profiling.profiled("formulaire matériel")
+def material_add_form(
+    df_pos,
+    df_products,
+    df_material_types
+):
+
+    if df_pos.empty:
+
+        st.warning(
+            "La table POS est vide."
+        )
+
+    elif df_material_types.empty:
+
+        st.warning(
+            "La table Types_Materiel est vide."
+        )
+
+    else:
+
+        pos = pos_picker(
+            df_pos,
+            "mat_pos",
+            label="Point de vente"
+        )
+
+        type_mat = st.selectbox(
+            "Type de matériel",
+            ["--- Sélectionner ---"]
+            + unique_sorted(
+                df_material_types,
+                "Type_Materiel"
+            ),
+            key="mat_type"
+        )
+
+        type_row = None
+
+        if type_mat != "--- Sélectionner ---":
+
+            tmp = df_material_types[
+                df_material_types[
+                    "Type_Materiel"
+                ]
+                .astype(str)
+                .str.strip()
+                == type_mat
+            ]
+
+            if not tmp.empty:
+
+                type_row = tmp.iloc[-1]
+
+        categorie_mat = clean_text(
+            type_row.get(
+                "Categorie_Materiel",
+                type_row.get(
+                    "Catégorie_Materiel",
+                    ""
+                )
+            )
+            if type_row is not None
+            else ""
+        )
+
+        if categorie_mat:
+
+            st.caption(
+                f"Catégorie : **{categorie_mat}**"
+            )
+
+        c1, c2 = st.columns(2)
+
+        with c1:
+
+            marque_mat = st.selectbox(
+                "Marque du matériel",
+                ["--- Sélectionner ---"]
+                + unique_sorted(
+                    df_products,
+                    "Marque"
+                ),
+                key="mat_brand"
+            )
+
+            reference = st.text_input(
+                "Référence matériel"
+            )
+
+            quantite = st.number_input(
+                "Quantité",
+                min_value=1,
+                value=1,
+                step=1
+            )
+
+        with c2:
+
+            date_install = st.date_input(
+                "Date d'installation",
+                value=datetime.now().date()
+            )
+
+            etat = st.selectbox(
+                "État",
+                ETATS_MATERIEL
+            )
+
+            fonctionnel = st.selectbox(
+                "Fonctionnel ?",
+                [
+                    "Oui",
+                    "Non"
+                ]
+            )
+
+        emplacement = st.text_input(
+            "Emplacement"
+        )
+
+        photo = st.file_uploader(
+            "Photo du matériel",
+            type=[
+                "jpg",
+                "jpeg",
+                "png"
+            ]
+        )
+
+        observation = st.text_area(
+            "Observation"
+        )
+
+        if st.button(
+            "💾 Enregistrer le matériel",
+            use_container_width=True,
+            key="save_mat"
+        ):
+
+            errors = []
+
+            if pos == "--- Sélectionner ---":
+                errors.append(
+                    "Sélectionnez un POS."
+                )
+
+            if type_mat == "--- Sélectionner ---":
+                errors.append(
+                    "Sélectionnez le type de matériel."
+                )
+
+            if marque_mat == "--- Sélectionner ---":
+                errors.append(
+                    "Sélectionnez la marque du matériel."
+                )
+
+            if errors:
+
+                for e in errors:
+                    st.error(e)
+
+            else:
+
+                photo_hash = store_uploaded_photo(
+                    photo
+                )
+
+                if photo_hash is not None:
+
+                    success = append_dict_row(
+                        SHEET_MATERIAL_POS,
+                        {
+                            "ID_Materiel":
+                                str(uuid.uuid4()),
+                            "ID":
+                                str(uuid.uuid4()),
+                            "Date_Installation":
+                                str(date_install),
+                            "Date":
+                                str(date_install),
+                            "ID_POS":
+                                pos,
+                            "ID_Type_Materiel":
+                                clean_text(
+                                    type_row.get(
+                                        "ID_Type_Materiel",
+                                        ""
+                                    )
+                                    if type_row is not None
+                                    else ""
+                                ),
+                            "Type_Materiel":
+                                type_mat,
+                            "Categorie_Materiel":
+                                categorie_mat,
+                            "Catégorie_Materiel":
+                                categorie_mat,
+                            "Marque_Materiel":
+                                marque_mat,
+                            "Reference_Materiel":
+                                reference,
+                            "Référence_Materiel":
+                                reference,
+                            "Quantite":
+                                quantite,
+                            "Quantité":
+                                quantite,
+                            "Etat":
+                                etat,
+                            "Fonctionnel":
+                                fonctionnel == "Oui",
+                            "Emplacement":
+                                emplacement,
+                            "Photo":
+                                photo_hash,
+                            "Observation":
+                                observation,
+                            "ID_User":
+                                st.session_state.user_id
+                        }
+                    )
+
+                    if success:
+
+                        st.success(
+                            "✅ Matériel enregistré."
+                        )
+
+                        time.sleep(1)
+
+                        st.rerun()
+
+
+@st.fragment
+@profiling.profiled("formulaire contrôle matériel")
+def material_control_form(
+    df_pos,
+    df_material_pos,
+    df_material_control,
+    df_distribution
+):
+
+    if (
+        df_pos.empty
+        or df_material_pos.empty
+    ):
+
+        st.info(
+            "Enregistrez d'abord un matériel."
+        )
+
+    else:
+
+        pos_c = pos_picker(
+            df_pos,
+            "control_pos",
+            label="POS à contrôler"
+        )
+
+        if pos_c != "--- Sélectionner ---":
+
+            # Index par POS (data_info.projections) : clés
+            # uniques, libellés construits d'un bloc.
+            mats = materials_at(
+                df_material_pos,
+                pos_c
+            )
+
+            if not mats:
+
+                st.info(
+                    "Aucun matériel pour ce POS."
+                )
+
+            else:
+
+                key = st.selectbox(
+                    "Matériel",
+                    list(mats),
+                    format_func=lambda k: mats[k]["label"],
+                    key="control_mat"
+                )
+
+                row = mats[key]["row"]
+
+                last, controls = last_control(
+                    df_material_control,
+                    clean_text(
+                        row.get(
+                            "ID_Materiel",
+                            row.get(
+                                "ID",
+                                ""
+                            )
+                        )
+                    )
+                )
+
+                if last is None:
+
+                    st.caption(
+                        "Jamais contrôlé."
+                    )
+
+                else:
+
+                    st.caption(
+                        f"Dernier contrôle "
+                        f"({controls} au total) : "
+                        f"{clean_text(last.get('Date_Controle', ''))} — "
+                        f"{clean_text(last.get('Etat', ''))} — "
+                        f"fonctionnel : {clean_text(last.get('Fonctionnel', ''))} — "
+                        f"action : {clean_text(last.get('Action_Necessaire', ''))}"
+                    )
+
+                brand = clean_text(
+                    row.get(
+                        "Marque_Materiel",
+                        ""
+                    )
+                )
+
+                # Index POS -> marques (data_info.projections),
+                # tenu à jour par version de la feuille.
+                brands = brands_at(
+                    df_distribution,
+                    pos_c
+                )
+
+                conform = (
+                    "Oui"
+                    if brand.lower() in brands
+                    else "Non"
+                )
+
+                quantity = brands.get(
+                    brand.lower()
+                )
+
+                st.info(
+                    f"Produit de la marque "
+                    f"**{brand}** présent : "
+                    f"**{conform}**"
+                    + (
+                        f" (dernière quantité relevée : {quantity:g})"
+                        if quantity is not None
+                        else ""
+                    )
+                )
+
+                c1, c2 = st.columns(2)
+
+                with c1:
+
+                    dcontrol = st.date_input(
+                        "Date du contrôle",
+                        value=datetime.now().date(),
+                        key="dc"
+                    )
+
+                    econtrol = st.selectbox(
+                        "État constaté",
+                        ETATS_MATERIEL,
+                        key="ec"
+                    )
+
+                with c2:
+
+                    fcontrol = st.selectbox(
+                        "Fonctionnel ?",
+                        [
+                            "Oui",
+                            "Non"
+                        ],
+                        key="fc"
+                    )
+
+                    action = st.selectbox(
+                        "Action nécessaire",
+                        ACTIONS_MATERIEL,
+                        key="ac"
+                    )
+
+                photo_c = st.file_uploader(
+                    "Photo du contrôle",
+                    type=[
+                        "jpg",
+                        "jpeg",
+                        "png"
+                    ],
+                    key="pc"
+                )
+
+                obs_c = st.text_area(
+                    "Observation",
+                    key="oc"
+                )
+
+                if st.button(
+                    "💾 Enregistrer le contrôle",
+                    use_container_width=True,
+                    key="save_control"
+                ):
+
+                    photo_hash = store_uploaded_photo(
+                        photo_c
+                    )
+
+                    success = photo_hash is not None and append_dict_row(
+                        SHEET_MATERIAL_CONTROL,
+                        {
+                            "ID_Controle":
+                                str(uuid.uuid4()),
+                            "ID":
+                                str(uuid.uuid4()),
+                            "Date_Controle":
+                                str(dcontrol),
+                            "Date":
+                                str(dcontrol),
+                            "ID_POS":
+                                pos_c,
+                            "ID_Materiel":
+                                clean_text(
+                                    row.get(
+                                        "ID_Materiel",
+                                        row.get(
+                                            "ID",
+                                            ""
+                                        )
+                                    )
+                                ),
+                            "Etat":
+                                econtrol,
+                            "Fonctionnel":
+                                fcontrol == "Oui",
+                            "Conforme_Marque":
+                                conform == "Oui",
+                            "Produit_Marque_Presente":
+                                conform == "Oui",
+                            "Photo":
+                                photo_hash,
+                            "Observation":
+                                obs_c,
+                            "Action_Necessaire":
+                                action,
+                            "ID_User":
+                                st.session_state.user_id
+                        }
+                    )
+
+                    if success:
+
+                        st.success(
+                            "✅ Contrôle enregistré."
+                        )
+
+                        time.sleep(1)
+
+                        st.rerun()
+
+
+@st.fragment
+@profiling.profiled("état du parc")
+def fleet_health(
+    df_pos,
+    df_material_pos,
+    df_material_control
+):
+
+    fleet = fleet_state(
+        df_material_pos,
+        df_material_control,
+        df_pos
+    )
+
+    if fleet.empty:
+
+        st.info(
+            "Aucun matériel enregistré."
+        )
+
+        return
+
+    c1, c2 = st.columns(2)
+
+    with c1:
+
+        wilaya = st.selectbox(
+            "Wilaya",
+            [FLEET_ALL]
+            + unique_sorted(
+                fleet,
+                "Wilaya"
+            ),
+            key="fleet_wilaya"
+        )
+
+    with c2:
+
+        marque = st.selectbox(
+            "Marque du matériel",
+            [FLEET_ALL]
+            + unique_sorted(
+                fleet,
+                "Marque_Materiel"
+            ),
+            key="fleet_brand"
+        )
+
+    if wilaya != FLEET_ALL:
+        fleet = fleet[fleet["Wilaya"] == wilaya]
+
+    if marque != FLEET_ALL:
+        fleet = fleet[fleet["Marque_Materiel"] == marque]
+
+    backlog = maintenance_backlog(
+        fleet
+    )
+
+    m1, m2, m3, m4 = st.columns(4)
+
+    m1.metric(
+        "Matériels",
+        len(fleet)
+    )
+
+    m2.metric(
+        "À traiter",
+        len(backlog)
+    )
+
+    m3.metric(
+        "Non fonctionnels",
+        int(
+            fleet["Fonctionnel"]
+            .str.lower()
+            .isin(FALSE_VALUES)
+            .sum()
+        )
+    )
+
+    m4.metric(
+        f"Sans contrôle depuis {CONTROL_INTERVAL_DAYS} j",
+        int(
+            fleet["Jours_Sans_Controle"]
+            .fillna(CONTROL_INTERVAL_DAYS)
+            .ge(CONTROL_INTERVAL_DAYS)
+            .sum()
+        )
+    )
+
+    st.subheader(
+        "🛠️ Maintenance à prévoir"
+    )
+
+    st.caption(
+        "Urgence : état constaté, action demandée, matériel non "
+        f"fonctionnel et retard de contrôle (au-delà de "
+        f"{CONTROL_INTERVAL_DAYS} jours)."
+    )
+
+    st.dataframe(
+        backlog.head(BACKLOG_ROWS),
+        use_container_width=True,
+        hide_index=True
+    )
+
+    if len(backlog) > BACKLOG_ROWS:
+
+        st.download_button(
+            f"📥 Télécharger les {len(backlog)} matériels à traiter",
+            backlog.to_csv(index=False).encode("utf-8-sig"),
+            file_name="maintenance_materiel.csv",
+            mime="text/csv"
+        )
+
+    st.subheader(
+        "📊 Répartition"
+    )
+
+    c1, c2 = st.columns(2)
+
+    with c1:
+
+        by = st.radio(
+            "Par",
+            ["Marque_Materiel", "Wilaya"],
+            format_func=lambda x: "Marque" if x == "Marque_Materiel" else x,
+            horizontal=True,
+            key="fleet_by"
+        )
+
+    with c2:
+
+        column = st.radio(
+            "Selon",
+            ["Etat", "Action_Necessaire"],
+            format_func=lambda x: "État" if x == "Etat" else "Action",
+            horizontal=True,
+            key="fleet_column"
+        )
+
+    st.dataframe(
+        fleet_counts(
+            fleet,
+            by,
+            column
+        ),
+        use_container_width=True
+    )
+
+
+def render():
+
+    st.header(
+        "🧰 Gestion du matériel installé dans les POS"
+    )
+
+    profiling.mark(
+        "chargement"
+    )
+
+    df_pos = load_sheet(
+        SHEET_POS
+    )
+
+    df_products = load_sheet(
+        SHEET_PRODUCTS
+    )
+
+    df_material_types = load_sheet(
+        SHEET_MATERIAL_TYPES
+    )
+
+    df_material_pos = load_sheet(
+        SHEET_MATERIAL_POS
+    )
+
+    df_material_control = load_sheet(
+        SHEET_MATERIAL_CONTROL
+    )
+
+    df_distribution = load_sheet(
+        SHEET_DISTRIBUTION
+    )
+
+    st.info(
+        "Suivi des tinda, logos, présentoirs, racks, "
+        "vitrines, posters, affichage et autres matériels."
+    )
+
+    tab_add, tab_control, tab_fleet, tab_history = st.tabs(
+        [
+            "➕ Installer / enregistrer",
+            "🔎 Contrôler",
+            "🩺 État du parc",
+            "📋 Historique"
+        ]
+    )
+
+    # -----------------------------------------------------
+    # AJOUT
+    # -----------------------------------------------------
+
+    profiling.mark(
+        "ajout matériel"
+    )
+
+    with tab_add:
+
+        material_add_form(
+            df_pos,
+            df_products,
+            df_material_types
+        )
+
+    # -----------------------------------------------------
+    # CONTROLE
+    # -----------------------------------------------------
+
+    profiling.mark(
+        "contrôle matériel"
+    )
+
+    with tab_control:
+
+        material_control_form(
+            df_pos,
+            df_material_pos,
+            df_material_control,
+            df_distribution
+        )
+
+    # -----------------------------------------------------
+    # ETAT DU PARC
+    # -----------------------------------------------------
+
+    profiling.mark(
+        "état du parc"
+    )
+
+    with tab_fleet:
+
+        fleet_health(
+            df_pos,
+            df_material_pos,
+            df_material_control
+        )
+
+    # -----------------------------------------------------
+    # HISTORIQUE
+    # -----------------------------------------------------
+
+    profiling.mark(
+        "historique matériel"
+    )
+
+    with tab_history:
+
+        st.subheader(
+            "📋 Matériels installés"
+        )
+
+        if not df_material_pos.empty:
+
+            st.dataframe(
+                df_material_pos,
+                use_container_width=True,
+                hide_index=True
+            )
+
+            photo_gallery(
+                df_material_pos,
+                "material",
+                ["ID_POS", "Type_Materiel", "Date_Installation"]
+            )
+
+        else:
+
+            st.info(
+                "Aucun matériel enregistré."
+            )
+
+        st.subheader(
+            "🔎 Contrôles effectués"
+        )
+
+        if not df_material_control.empty:
+
+            st.dataframe(
+                df_material_control,
+                use_container_width=True,
+                hide_index=True
+            )
+
+            photo_gallery(
+                df_material_control,
+                "control",
+                ["ID_POS", "Etat", "Date_Controle"]
+            )
+
+        else:
+
+            st.info(
+                "Aucun contrôle enregistré."
+            )
@@ -0,0 +1,165 @@
+import time
+import uuid
+from datetime import datetime
+
+import streamlit as st
+
+from data_info import profiling
+from data_info.schema import (
+    SHEET_OBJECTIVES,
+    SHEET_POS,
+    TYPES_OBJECTIF
+)
+from data_info.ui import (
+    append_dict_row,
+    load_sheet,
+    pos_picker
+)
+
+
+# =========================================================
+# OBJECTIFS POS
+# =========================================================
+
+def render():
+
+    st.header(
+        "🎯 Objectifs POS"
+    )
+
+    profiling.mark(
+        "chargement"
+    )
+
+    df_pos = load_sheet(
+        SHEET_POS
+    )
+
+    df_objectives = load_sheet(
+        SHEET_OBJECTIVES
+    )
+
+    if df_pos.empty:
+
+        st.warning(
+            "La table POS est vide."
+        )
+
+        st.stop()
+
+    profiling.mark(
+        "formulaire"
+    )
+
+    st.subheader(
+        "🎯 Nouvel objectif"
+    )
+
+    pos = pos_picker(
+        df_pos,
+        "objective_pos",
+        label="Point de vente"
+    )
+
+    annee = st.number_input(
+        "Année",
+        min_value=2020,
+        max_value=2100,
+        value=datetime.now().year,
+        step=1
+    )
+
+    objectif_type = st.selectbox(
+        "Type d'objectif",
+        TYPES_OBJECTIF
+    )
+
+    objectif = st.number_input(
+        "Objectif",
+        min_value=0.0,
+        step=1.0
+    )
+
+    commentaire = st.text_area(
+        "Commentaire"
+    )
+
+    if st.button(
+        "💾 Enregistrer l'objectif",
+        use_container_width=True,
+        key="save_objective"
+    ):
+
+        if pos == "--- Sélectionner ---":
+
+            st.error(
+                "Sélectionnez un POS."
+            )
+
+        elif objectif <= 0:
+
+            st.error(
+                "L'objectif doit être supérieur à 0."
+            )
+
+        else:
+
+            success = append_dict_row(
+                SHEET_OBJECTIVES,
+                {
+                    "ID_Objectif":
+                        str(uuid.uuid4()),
+                    "ID":
+                        str(uuid.uuid4()),
+                    "Date":
+                        str(datetime.now().date()),
+                    "Annee":
+                        int(annee),
+                    "Année":
+                        int(annee),
+                    "ID_POS":
+                        pos,
+                    "Type_Objectif":
+                        objectif_type,
+                    "Objectif":
+                        objectif,
+                    "Commentaire":
+                        commentaire,
+                    "ID_User":
+                        st.session_state.user_id
+                }
+            )
+
+            if success:
+
+                st.success(
+                    "✅ Objectif enregistré."
+                )
+
+                time.sleep(1)
+
+                st.rerun()
+
+    st.markdown("---")
+
+    profiling.mark(
+        "historique"
+    )
+
+    st.subheader(
+        "📋 Objectifs enregistrés"
+    )
+
+    if not df_objectives.empty:
+
+        st.dataframe(
+            df_objectives,
+            use_container_width=True,
+            hide_index=True
+        )
+
+    else:
+
+        st.info(
+            "Aucun objectif enregistré."
+        )
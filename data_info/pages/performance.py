@@ -0,0 +1,188 @@
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from data_info.core import get_metrics
+
+
+# =========================================================
+# PERFORMANCE (ADMIN)
+# =========================================================
+
+def render():
+
+    if st.session_state.role != "admin":
+
+        st.error(
+            "Page réservée aux administrateurs."
+        )
+
+        st.stop()
+
+    st.header(
+        "⚙️ Performance Google Sheets"
+    )
+
+    metrics = get_metrics()
+
+    st.caption(
+        f"Depuis le "
+        f"{datetime.fromtimestamp(metrics.started_at):%d/%m/%Y %H:%M:%S}"
+        f" — appels lents : ≥ {metrics.slow_threshold:g} s"
+    )
+
+    # -----------------------------------------------------
+    # QUOTAS
+    # -----------------------------------------------------
+
+    st.subheader(
+        "📶 Quota (60 dernières secondes)"
+    )
+
+    usage = metrics.quota_usage()
+
+    col1, col2, col3 = st.columns(3)
+
+    for column, kind, label in [
+        (col1, "read", "Lectures"),
+        (col2, "write", "Écritures"),
+        (col3, "drive", "Drive")
+    ]:
+
+        with column:
+
+            limit = usage[kind]["limit"]
+
+            used = usage[kind]["last_minute"]
+
+            st.metric(
+                label,
+                f"{used} / {limit}" if limit else used
+            )
+
+            if limit:
+
+                st.progress(
+                    min(used / limit, 1.0)
+                )
+
+    # -----------------------------------------------------
+    # OPERATIONS
+    # -----------------------------------------------------
+
+    st.subheader(
+        "⏱️ Opérations"
+    )
+
+    summary = metrics.summary()
+
+    if summary:
+
+        st.dataframe(
+            pd.DataFrame(summary),
+            use_container_width=True,
+            hide_index=True
+        )
+
+    else:
+
+        st.info(
+            "Aucune opération mesurée."
+        )
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+
+        st.subheader(
+            "📄 Appels API par page"
+        )
+
+        pages = metrics.pages()
+
+        if pages:
+
+            st.dataframe(
+                pd.DataFrame(pages),
+                use_container_width=True,
+                hide_index=True
+            )
+
+        else:
+
+            st.info(
+                "Aucun appel API."
+            )
+
+    with col2:
+
+        st.subheader(
+            "🗃️ Cache"
+        )
+
+        counters = metrics.counter_rows()
+
+        if counters:
+
+            st.dataframe(
+                pd.DataFrame(counters),
+                use_container_width=True,
+                hide_index=True
+            )
+
+        else:
+
+            st.info(
+                "Aucun compteur."
+            )
+
+    # -----------------------------------------------------
+    # APPELS LENTS
+    # -----------------------------------------------------
+
+    st.subheader(
+        "🐢 Appels lents"
+    )
+
+    if metrics.slow_calls:
+
+        st.dataframe(
+            pd.DataFrame(
+                list(metrics.slow_calls)[::-1]
+            ),
+            use_container_width=True,
+            hide_index=True
+        )
+
+    else:
+
+        st.info(
+            "Aucun appel lent."
+        )
+
+    st.markdown("---")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+
+        st.download_button(
+            "📥 Export Prometheus",
+            metrics.prometheus_text(),
+            file_name="data_info_metrics.prom",
+            mime="text/plain",
+            use_container_width=True
+        )
+
+    with col2:
+
+        if st.button(
+            "♻️ Réinitialiser les compteurs",
+            use_container_width=True,
+            key="reset_metrics"
+        ):
+
+            metrics.reset()
+
+            st.rerun()
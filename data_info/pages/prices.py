@@ -0,0 +1,476 @@
+import time
+import uuid
+from datetime import datetime
+
+import streamlit as st
+
+from data_info import profiling
+from data_info.outliers import check_price
+from data_info.projections import last_reading
+from data_info.schema import (
+    PLACEHOLDER,
+    SHEET_POS,
+    SHEET_PRICES,
+    SHEET_PRODUCTS
+)
+from data_info.ui import (
+    CAPTURE_MODES,
+    append_row,
+    append_rows,
+    capture_mode,
+    grid_saved,
+    grid_selection,
+    load_sheet,
+    pos_picker,
+    product_cascade,
+    product_grid,
+    show_last_reading
+)
+
+
+# =========================================================
+# RELEVE PRIX
+# =========================================================
+
+@st.fragment
+@profiling.profiled("formulaire prix")
+def price_form(
+    df_pos,
+    df_products,
+    df_prices
+):
+
+    pos = pos_picker(
+        df_pos,
+        "price_pos",
+        label="POS"
+    )
+
+    (
+        marque,
+        categorie,
+        famille,
+        produit,
+        capacite
+    ) = product_cascade(
+        df_products,
+        prefix="price"
+    )
+
+    selected = PLACEHOLDER not in (
+        pos,
+        marque,
+        categorie,
+        famille,
+        produit,
+        capacite
+    )
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+
+        prix = st.number_input(
+            "Prix de vente",
+            min_value=0.0,
+            step=100.0,
+            key="price_value"
+        )
+
+        if selected:
+
+            show_last_reading(
+                last_reading(
+                    SHEET_PRICES,
+                    df_prices,
+                    pos,
+                    (marque, categorie, famille, produit, capacite)
+                ),
+                "Prix_Vente",
+                prix,
+                "prix"
+            )
+
+    with col2:
+
+        promo = st.selectbox(
+            "En promotion ?",
+            [
+                "Non",
+                "Oui"
+            ],
+            key="price_promo"
+        )
+
+    # Prix très éloigné de la médiane du produit (zéro en trop,
+    # mauvaise capacité) : enregistré seulement si confirmé.
+    check = (
+        check_price(
+            df_prices,
+            df_pos,
+            pos,
+            (marque, categorie, famille, produit, capacite),
+            prix
+        )
+        if selected and prix > 0
+        else None
+    )
+
+    suspect = check is not None and check["suspect"]
+
+    if suspect:
+
+        st.warning(
+            f"⚠️ Prix inhabituel : médiane {check['median']:,.0f} "
+            f"sur {check['readings']} relevés ({check['scope']})."
+            .replace(",", " ")
+        )
+
+    confirmed = suspect and st.checkbox(
+        "Confirmer ce prix inhabituel",
+        key="price_confirm"
+    )
+
+    prix_promo = st.number_input(
+        "Prix promotionnel",
+        min_value=0.0,
+        step=100.0,
+        key="price_promo_value"
+    )
+
+    date_releve = st.date_input(
+        "Date du relevé",
+        value=datetime.now().date(),
+        key="price_date"
+    )
+
+    remarque = st.text_area(
+        "Remarque",
+        key="price_remarque"
+    )
+
+    if st.button(
+        "💾 Enregistrer le prix",
+        use_container_width=True,
+        key="save_price"
+    ):
+
+        errors = []
+
+        if pos == "--- Sélectionner ---":
+            errors.append(
+                "Sélectionnez un POS."
+            )
+
+        if marque == "--- Sélectionner ---":
+            errors.append(
+                "Sélectionnez une marque."
+            )
+
+        if categorie == "--- Sélectionner ---":
+            errors.append(
+                "Sélectionnez une catégorie."
+            )
+
+        if famille == "--- Sélectionner ---":
+            errors.append(
+                "Sélectionnez une famille."
+            )
+
+        if produit == "--- Sélectionner ---":
+            errors.append(
+                "Sélectionnez un produit."
+            )
+
+        if capacite == "--- Sélectionner ---":
+            errors.append(
+                "Sélectionnez une capacité/dimension."
+            )
+
+        if prix <= 0:
+            errors.append(
+                "Le prix doit être supérieur à 0."
+            )
+
+        if suspect and not confirmed:
+            errors.append(
+                "Vérifiez le prix ou confirmez-le."
+            )
+
+        if errors:
+
+            for error in errors:
+                st.error(error)
+
+        else:
+
+            success = append_row(
+                SHEET_PRICES,
+                [
+                    str(uuid.uuid4()),
+                    str(date_releve),
+                    pos,
+                    marque,
+                    categorie,
+                    famille,
+                    produit,
+                    capacite,
+                    prix,
+                    (
+                        prix_promo
+                        if promo == "Oui"
+                        else 0
+                    ),
+                    promo == "Oui",
+                    remarque,
+                    st.session_state.user_id
+                ]
+            )
+
+            if success:
+
+                st.success(
+                    "✅ Relevé prix enregistré."
+                )
+
+                time.sleep(1)
+
+                st.rerun()
+
+
+@st.fragment
+@profiling.profiled("grille prix")
+def price_grid(
+    df_pos,
+    df_products,
+    df_prices
+):
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+
+        pos = pos_picker(
+            df_pos,
+            "price_grid_pos",
+            label="POS"
+        )
+
+    with col2:
+
+        date_releve = st.date_input(
+            "Date du relevé",
+            value=datetime.now().date(),
+            key="price_grid_date"
+        )
+
+    marque, categorie, famille = grid_selection(
+        df_products,
+        "price"
+    )
+
+    if PLACEHOLDER in (marque, categorie):
+
+        st.info(
+            "Choisissez une marque et une catégorie pour "
+            "lister tous leurs produits."
+        )
+
+        return
+
+    edited = product_grid(
+        df_products,
+        "price",
+        marque,
+        categorie,
+        famille,
+        {
+            "Prix_Vente": (
+                None,
+                st.column_config.NumberColumn(
+                    "Prix de vente",
+                    min_value=0.0,
+                    step=100.0
+                )
+            ),
+            "Promotion": (
+                False,
+                st.column_config.CheckboxColumn(
+                    "En promotion"
+                )
+            ),
+            "Prix_Promo": (
+                None,
+                st.column_config.NumberColumn(
+                    "Prix promotionnel",
+                    min_value=0.0,
+                    step=100.0
+                )
+            ),
+            "Remarque": (
+                "",
+                st.column_config.TextColumn(
+                    "Remarque"
+                )
+            )
+        }
+    )
+
+    filled = edited[
+        edited["Prix_Vente"].fillna(0) > 0
+    ].fillna(
+        {
+            "Prix_Promo": 0.0,
+            "Remarque": ""
+        }
+    )
+
+    suspects = []
+
+    for item in (
+        filled.to_dict("records")
+        if pos != PLACEHOLDER
+        else []
+    ):
+
+        check = check_price(
+            df_prices,
+            df_pos,
+            pos,
+            (
+                marque,
+                categorie,
+                item["Famille"],
+                item["Produit"],
+                item["Capacité_Dimension"]
+            ),
+            float(item["Prix_Vente"])
+        )
+
+        if check is not None and check["suspect"]:
+            suspects.append(item["Produit"])
+
+    if suspects:
+
+        st.warning(
+            "⚠️ Prix inhabituels : " + ", ".join(suspects) + "."
+        )
+
+    confirmed = bool(suspects) and st.checkbox(
+        "Confirmer ces prix inhabituels",
+        key="price_grid_confirm"
+    )
+
+    if st.button(
+        f"💾 Enregistrer {len(filled)} relevé(s)",
+        use_container_width=True,
+        key="save_price_grid"
+    ):
+
+        if pos == PLACEHOLDER:
+
+            st.error(
+                "Sélectionnez un POS."
+            )
+
+        elif filled.empty:
+
+            st.error(
+                "Renseignez au moins un prix de vente."
+            )
+
+        elif suspects and not confirmed:
+
+            st.error(
+                "Vérifiez les prix inhabituels ou confirmez-les."
+            )
+
+        else:
+
+            rows = [
+                [
+                    str(uuid.uuid4()),
+                    str(date_releve),
+                    pos,
+                    marque,
+                    categorie,
+                    item["Famille"],
+                    item["Produit"],
+                    item["Capacité_Dimension"],
+                    float(item["Prix_Vente"]),
+                    (
+                        float(item["Prix_Promo"])
+                        if item["Promotion"]
+                        else 0
+                    ),
+                    bool(item["Promotion"]),
+                    item["Remarque"],
+                    st.session_state.user_id
+                ]
+                for item in filled.to_dict("records")
+            ]
+
+            if append_rows(
+                SHEET_PRICES,
+                rows
+            ):
+
+                grid_saved(
+                    "price",
+                    len(rows)
+                )
+
+
+def render():
+
+    st.header(
+        "💰 Relevé Prix"
+    )
+
+    profiling.mark(
+        "chargement"
+    )
+
+    df_pos = load_sheet(
+        SHEET_POS
+    )
+
+    df_products = load_sheet(
+        SHEET_PRODUCTS
+    )
+
+    df_prices = load_sheet(
+        SHEET_PRICES
+    )
+
+    if (
+        df_pos.empty
+        or df_products.empty
+    ):
+
+        st.warning(
+            "Les tables POS et Produits "
+            "doivent être renseignées."
+        )
+
+        st.stop()
+
+    profiling.mark(
+        "formulaire"
+    )
+
+    if capture_mode("price") == CAPTURE_MODES[0]:
+
+        price_form(
+            df_pos,
+            df_products,
+            df_prices
+        )
+
+    else:
+
+        price_grid(
+            df_pos,
+            df_products,
+            df_prices
+        )
@@ -0,0 +1,813 @@
+import time
+import uuid
+from datetime import datetime
+
+import streamlit as st
+
+from data_info import profiling
+from data_info.core import update_row_by_key
+from data_info.projections import latest_row
+from data_info.schema import (
+    SHEET_POS,
+    SHEET_PROFILE
+)
+from data_info.search import pos_index
+from data_info.transforms import clean_text
+from data_info.ui import (
+    append_dict_row,
+    load_sheet,
+    pos_picker
+)
+
+
+# =========================================================
+# PROFIL CLIENT
+# =========================================================
+
+def render():
+
+    st.header(
+        "👤 Profil Client"
+    )
+
+    profiling.mark(
+        "chargement"
+    )
+
+    df_pos = load_sheet(
+        SHEET_POS
+    )
+
+    df_profile = load_sheet(
+        SHEET_PROFILE
+    )
+
+    st.info(
+        "Si le POS existe, sélectionnez-le pour "
+        "consulter/modifier son profil."
+    )
+
+    tab_existing, tab_new = st.tabs(
+        [
+            "🔎 POS existant",
+            "➕ Nouveau POS"
+        ]
+    )
+
+    # -----------------------------------------------------
+    # POS EXISTANT
+    # -----------------------------------------------------
+
+    profiling.mark(
+        "pos existant"
+    )
+
+    with tab_existing:
+
+        if df_pos.empty:
+
+            st.warning(
+                "La table POS est vide."
+            )
+
+        else:
+
+            selected_pos = pos_picker(
+                df_pos,
+                "profile_existing_pos",
+                label="Point de vente"
+            )
+
+            if selected_pos != "--- Sélectionner ---":
+
+                pos_row = df_pos[
+                    df_pos["ID_POS"]
+                    .astype(str)
+                    .str.strip()
+                    == selected_pos
+                ]
+
+                pos_row = (
+                    pos_row.iloc[-1]
+                    if not pos_row.empty
+                    else None
+                )
+
+                # Dernière version du profil : vue tenue à jour
+                # par data_info.projections, sans parcourir
+                # l'historique.
+                profile = latest_row(
+                    SHEET_PROFILE,
+                    df_profile,
+                    selected_pos
+                )
+
+                if profile is not None:
+
+                    st.success(
+                        "✅ Profil existant trouvé."
+                    )
+
+                else:
+
+                    st.info(
+                        "ℹ️ Profil détaillé non renseigné."
+                    )
+
+                with st.form(
+                    "profile_form"
+                ):
+
+                    st.subheader(
+                        "🏪 Informations du POS"
+                    )
+
+                    c1, c2 = st.columns(2)
+
+                    with c1:
+
+                        nom_pos = st.text_input(
+                            "Nom POS",
+                            value=clean_text(
+                                pos_row.get(
+                                    "Nom_POS",
+                                    pos_row.get(
+                                        "Nom",
+                                        ""
+                                    )
+                                )
+                                if pos_row is not None
+                                else ""
+                            )
+                        )
+
+                        wilaya = st.text_input(
+                            "Wilaya",
+                            value=clean_text(
+                                pos_row.get(
+                                    "Wilaya",
+                                    ""
+                                )
+                                if pos_row is not None
+                                else ""
+                            )
+                        )
+
+                        commune = st.text_input(
+                            "Commune",
+                            value=clean_text(
+                                pos_row.get(
+                                    "Commune",
+                                    ""
+                                )
+                                if pos_row is not None
+                                else ""
+                            )
+                        )
+
+                        adresse = st.text_area(
+                            "Adresse",
+                            value=clean_text(
+                                pos_row.get(
+                                    "Adresse",
+                                    ""
+                                )
+                                if pos_row is not None
+                                else ""
+                            )
+                        )
+
+                    with c2:
+
+                        telephone = st.text_input(
+                            "Téléphone",
+                            value=clean_text(
+                                pos_row.get(
+                                    "Telephone",
+                                    pos_row.get(
+                                        "Téléphone",
+                                        ""
+                                    )
+                                )
+                                if pos_row is not None
+                                else ""
+                            )
+                        )
+
+                        email = st.text_input(
+                            "Email",
+                            value=clean_text(
+                                pos_row.get(
+                                    "Email",
+                                    ""
+                                )
+                                if pos_row is not None
+                                else ""
+                            )
+                        )
+
+                        current_status = clean_text(
+                            pos_row.get(
+                                "Statut",
+                                "Actif"
+                            )
+                            if pos_row is not None
+                            else "Actif"
+                        )
+
+                        statut = st.selectbox(
+                            "Statut",
+                            [
+                                "Actif",
+                                "Inactif"
+                            ],
+                            index=(
+                                1
+                                if current_status.lower()
+                                == "inactif"
+                                else 0
+                            )
+                        )
+
+                    st.subheader(
+                        "👤 Informations client"
+                    )
+
+                    c1, c2 = st.columns(2)
+
+                    with c1:
+
+                        nom_proprietaire = st.text_input(
+                            "Nom du propriétaire",
+                            value=clean_text(
+                                profile.get(
+                                    "Nom_Proprietaire",
+                                    ""
+                                )
+                                if profile is not None
+                                else ""
+                            )
+                        )
+
+                        contact_proprietaire = st.text_input(
+                            "Contact propriétaire",
+                            value=clean_text(
+                                profile.get(
+                                    "Contact_Proprietaire",
+                                    ""
+                                )
+                                if profile is not None
+                                else ""
+                            )
+                        )
+
+                        nom_facade = st.text_input(
+                            "Nom façade",
+                            value=clean_text(
+                                profile.get(
+                                    "Nom_Facade",
+                                    ""
+                                )
+                                if profile is not None
+                                else ""
+                            )
+                        )
+
+                        nom_acheteur = st.text_input(
+                            "Nom acheteur",
+                            value=clean_text(
+                                profile.get(
+                                    "Nom_Acheteur",
+                                    ""
+                                )
+                                if profile is not None
+                                else ""
+                            )
+                        )
+
+                        contact_acheteur = st.text_input(
+                            "Contact acheteur",
+                            value=clean_text(
+                                profile.get(
+                                    "Contact_Acheteur",
+                                    ""
+                                )
+                                if profile is not None
+                                else ""
+                            )
+                        )
+
+                    with c2:
+
+                        surface = st.number_input(
+                            "Surface magasin (m²)",
+                            min_value=0.0,
+                            step=1.0,
+                            value=float(
+                                profile.get(
+                                    "Surface_Magasin",
+                                    0
+                                )
+                                or 0
+                            )
+                            if profile is not None
+                            else 0.0
+                        )
+
+                        surface_expo = st.number_input(
+                            "Surface exposition (m²)",
+                            min_value=0.0,
+                            step=1.0,
+                            value=float(
+                                profile.get(
+                                    "Surface_Exposition",
+                                    0
+                                )
+                                or 0
+                            )
+                            if profile is not None
+                            else 0.0
+                        )
+
+                        vitrines = st.number_input(
+                            "Nombre de vitrines",
+                            min_value=0,
+                            step=1,
+                            value=int(
+                                float(
+                                    profile.get(
+                                        "Nombre_Vitrines",
+                                        0
+                                    )
+                                    or 0
+                                )
+                            )
+                            if profile is not None
+                            else 0
+                        )
+
+                        travailleurs = st.number_input(
+                            "Nombre de travailleurs",
+                            min_value=0,
+                            step=1,
+                            value=int(
+                                float(
+                                    profile.get(
+                                        "Nombre_Travailleurs",
+                                        0
+                                    )
+                                    or 0
+                                )
+                            )
+                            if profile is not None
+                            else 0
+                        )
+
+                        digital_value = clean_text(
+                            profile.get(
+                                "Presence_Digitale",
+                                "Non"
+                            )
+                            if profile is not None
+                            else "Non"
+                        )
+
+                        digital = st.selectbox(
+                            "Présence digitale",
+                            [
+                                "Oui",
+                                "Non"
+                            ],
+                            index=(
+                                0
+                                if digital_value.lower()
+                                in [
+                                    "oui",
+                                    "true",
+                                    "1"
+                                ]
+                                else 1
+                            )
+                        )
+
+                        ca_2025 = st.number_input(
+                            "Chiffre d'affaires 2025",
+                            min_value=0.0,
+                            step=1000.0,
+                            value=float(
+                                profile.get(
+                                    "CA_2025",
+                                    0
+                                )
+                                or 0
+                            )
+                            if profile is not None
+                            else 0.0
+                        )
+
+                    observation = st.text_area(
+                        "Observation",
+                        value=clean_text(
+                            profile.get(
+                                "Observation",
+                                profile.get(
+                                    "Remarque",
+                                    ""
+                                )
+                            )
+                            if profile is not None
+                            else ""
+                        )
+                    )
+
+                    save_profile = st.form_submit_button(
+                        "💾 Enregistrer le profil",
+                        use_container_width=True
+                    )
+
+                if save_profile:
+
+                    # -------------------------------------------------
+                    # Mise à jour POS
+                    # -------------------------------------------------
+
+                    try:
+
+                        pos_values = {
+                            "Nom_POS": nom_pos,
+                            "Nom": nom_pos,
+                            "Wilaya": wilaya,
+                            "Commune": commune,
+                            "Adresse": adresse,
+                            "Telephone": telephone,
+                            "Téléphone": telephone,
+                            "Email": email,
+                            "Statut": statut
+                        }
+
+                        found = update_row_by_key(
+                            SHEET_POS,
+                            "ID_POS",
+                            selected_pos,
+                            pos_values
+                        )
+
+                        if not found:
+
+                            append_dict_row(
+                                SHEET_POS,
+                                {
+                                    "ID_POS": selected_pos,
+                                    **pos_values
+                                }
+                            )
+
+                        # -------------------------------------------------
+                        # Profil
+                        # -------------------------------------------------
+
+                        append_dict_row(
+                            SHEET_PROFILE,
+                            {
+                                "ID_Profil": str(
+                                    uuid.uuid4()
+                                ),
+                                "ID": str(
+                                    uuid.uuid4()
+                                ),
+                                "ID_POS": selected_pos,
+                                "Date": str(
+                                    datetime.now().date()
+                                ),
+                                "Date_Mise_A_Jour": str(
+                                    datetime.now()
+                                ),
+                                "Nom_Proprietaire":
+                                    nom_proprietaire,
+                                "Proprietaire":
+                                    nom_proprietaire,
+                                "Contact_Proprietaire":
+                                    contact_proprietaire,
+                                "Nom_Facade":
+                                    nom_facade,
+                                "Nom_Acheteur":
+                                    nom_acheteur,
+                                "Acheteur":
+                                    nom_acheteur,
+                                "Contact_Acheteur":
+                                    contact_acheteur,
+                                "Surface_Magasin":
+                                    surface,
+                                "Surface":
+                                    surface,
+                                "Surface_Exposition":
+                                    surface_expo,
+                                "Nombre_Vitrines":
+                                    vitrines,
+                                "Vitrines":
+                                    vitrines,
+                                "Nombre_Travailleurs":
+                                    travailleurs,
+                                "Travailleurs":
+                                    travailleurs,
+                                "Presence_Digitale":
+                                    digital == "Oui",
+                                "Présence_Digitale":
+                                    digital == "Oui",
+                                "CA_2025":
+                                    ca_2025,
+                                "Observation":
+                                    observation,
+                                "Remarque":
+                                    observation,
+                                "ID_User":
+                                    st.session_state.user_id
+                            }
+                        )
+
+                        st.success(
+                            "✅ Profil enregistré avec succès."
+                        )
+
+                        time.sleep(1)
+
+                        st.rerun()
+
+                    except Exception as e:
+
+                        st.error(
+                            f"❌ Erreur : {e}"
+                        )
+
+    # -----------------------------------------------------
+    # NOUVEAU POS
+    # -----------------------------------------------------
+
+    profiling.mark(
+        "nouveau pos"
+    )
+
+    with tab_new:
+
+        with st.form(
+            "new_pos_form"
+        ):
+
+            st.subheader(
+                "➕ Nouveau POS"
+            )
+
+            c1, c2 = st.columns(2)
+
+            with c1:
+
+                new_id = st.text_input(
+                    "ID_POS *",
+                    value=(
+                        "POS-"
+                        + str(uuid.uuid4())[:8]
+                        .upper()
+                    )
+                )
+
+                new_nom = st.text_input(
+                    "Nom POS *"
+                )
+
+                new_wilaya = st.text_input(
+                    "Wilaya *"
+                )
+
+                new_commune = st.text_input(
+                    "Commune *"
+                )
+
+            with c2:
+
+                new_adresse = st.text_area(
+                    "Adresse"
+                )
+
+                new_tel = st.text_input(
+                    "Téléphone"
+                )
+
+                new_email = st.text_input(
+                    "Email"
+                )
+
+                new_statut = st.selectbox(
+                    "Statut",
+                    [
+                        "Actif",
+                        "Inactif"
+                    ]
+                )
+
+            st.subheader(
+                "👤 Profil client"
+            )
+
+            c1, c2 = st.columns(2)
+
+            with c1:
+
+                p_nom = st.text_input(
+                    "Nom du propriétaire"
+                )
+
+                p_contact = st.text_input(
+                    "Contact propriétaire"
+                )
+
+                p_facade = st.text_input(
+                    "Nom façade"
+                )
+
+                p_acheteur = st.text_input(
+                    "Nom acheteur"
+                )
+
+                p_acheteur_contact = st.text_input(
+                    "Contact acheteur"
+                )
+
+            with c2:
+
+                p_surface = st.number_input(
+                    "Surface magasin (m²)",
+                    min_value=0.0,
+                    step=1.0
+                )
+
+                p_expo = st.number_input(
+                    "Surface exposition (m²)",
+                    min_value=0.0,
+                    step=1.0
+                )
+
+                p_vitrines = st.number_input(
+                    "Nombre de vitrines",
+                    min_value=0,
+                    step=1
+                )
+
+                p_workers = st.number_input(
+                    "Nombre de travailleurs",
+                    min_value=0,
+                    step=1
+                )
+
+                p_digital = st.selectbox(
+                    "Présence digitale",
+                    [
+                        "Oui",
+                        "Non"
+                    ]
+                )
+
+                p_ca = st.number_input(
+                    "Chiffre d'affaires 2025",
+                    min_value=0.0,
+                    step=1000.0
+                )
+
+            p_obs = st.text_area(
+                "Observation"
+            )
+
+            create = st.form_submit_button(
+                "💾 Enregistrer le nouveau POS et son profil",
+                use_container_width=True
+            )
+
+        if create:
+
+            errors = []
+
+            if not new_id.strip():
+                errors.append(
+                    "ID_POS obligatoire."
+                )
+
+            if not new_nom.strip():
+                errors.append(
+                    "Nom POS obligatoire."
+                )
+
+            if not new_wilaya.strip():
+                errors.append(
+                    "Wilaya obligatoire."
+                )
+
+            if not new_commune.strip():
+                errors.append(
+                    "Commune obligatoire."
+                )
+
+            if (
+                new_id.strip()
+                in pos_index(df_pos)
+            ):
+                errors.append(
+                    "Cet ID_POS existe déjà."
+                )
+
+            if errors:
+
+                for e in errors:
+                    st.error(e)
+
+            else:
+
+                success1 = append_dict_row(
+                    SHEET_POS,
+                    {
+                        "ID_POS": new_id.strip(),
+                        "Nom_POS": new_nom.strip(),
+                        "Nom": new_nom.strip(),
+                        "Wilaya": new_wilaya,
+                        "Commune": new_commune,
+                        "Adresse": new_adresse,
+                        "Telephone": new_tel,
+                        "Téléphone": new_tel,
+                        "Email": new_email,
+                        "Statut": new_statut,
+                        "Date_Creation":
+                            str(
+                                datetime.now().date()
+                            )
+                    }
+                )
+
+                if success1:
+
+                    append_dict_row(
+                        SHEET_PROFILE,
+                        {
+                            "ID_Profil": str(
+                                uuid.uuid4()
+                            ),
+                            "ID": str(
+                                uuid.uuid4()
+                            ),
+                            "ID_POS":
+                                new_id.strip(),
+                            "Date":
+                                str(
+                                    datetime.now().date()
+                                ),
+                            "Date_Mise_A_Jour":
+                                str(
+                                    datetime.now()
+                                ),
+                            "Nom_Proprietaire":
+                                p_nom,
+                            "Proprietaire":
+                                p_nom,
+                            "Contact_Proprietaire":
+                                p_contact,
+                            "Nom_Facade":
+                                p_facade,
+                            "Nom_Acheteur":
+                                p_acheteur,
+                            "Acheteur":
+                                p_acheteur,
+                            "Contact_Acheteur":
+                                p_acheteur_contact,
+                            "Surface_Magasin":
+                                p_surface,
+                            "Surface":
+                                p_surface,
+                            "Surface_Exposition":
+                                p_expo,
+                            "Nombre_Vitrines":
+                                p_vitrines,
+                            "Vitrines":
+                                p_vitrines,
+                            "Nombre_Travailleurs":
+                                p_workers,
+                            "Travailleurs":
+                                p_workers,
+                            "Presence_Digitale":
+                                p_digital == "Oui",
+                            "Présence_Digitale":
+                                p_digital == "Oui",
+                            "CA_2025":
+                                p_ca,
+                            "Observation":
+                                p_obs,
+                            "Remarque":
+                                p_obs,
+                            "ID_User":
+                                st.session_state.user_id
+                        }
+                    )
+
+                    st.success(
+                        "✅ Nouveau POS et profil enregistrés."
+                    )
+
+                    time.sleep(1)
+
+                    st.rerun()
@@ -0,0 +1,503 @@
+import streamlit as st
+
+from data_info import profiling
+from data_info.outliers import (
+    cached_scores,
+    suspect_prices
+)
+from data_info.projections import latest_frame
+from data_info.schema import (
+    SHEET_DISTRIBUTION,
+    SHEET_MATERIAL_CONTROL,
+    SHEET_MATERIAL_POS,
+    SHEET_POS,
+    SHEET_PRICES,
+    SHEET_PRODUCTS,
+    SHEET_PROFILE,
+    SHEET_SURVEYS
+)
+from data_info.transforms import (
+    frequency_column,
+    mean_by,
+    price_column,
+    price_summary,
+    quantity_column,
+    sum_by,
+    value_counts
+)
+from data_info.ui import load_sheet
+
+
+# =========================================================
+# STATISTIQUES
+# =========================================================
+
+OUTLIER_DISPLAY_COLUMNS = [
+    "Date_Releve",
+    "ID_POS",
+    "Wilaya",
+    "Marque",
+    "Produit",
+    "Capacité_Dimension",
+    "Prix_Vente",
+    "Mediane",
+    "Nb_Releves",
+    "Score"
+]
+
+
+def show_price_outliers(scored):
+
+    # scored : outliers.score_prices, tout l'historique.
+    suspects = suspect_prices(
+        scored
+    )
+
+    st.subheader(
+        "🚩 Prix suspects"
+    )
+
+    st.metric(
+        "Relevés suspects",
+        f"{len(suspects)} / {len(scored)}"
+    )
+
+    if suspects.empty:
+
+        st.info(
+            "Aucun prix suspect."
+        )
+
+        return
+
+    st.dataframe(
+        suspects[
+            [
+                column
+                for column in OUTLIER_DISPLAY_COLUMNS
+                if column in suspects.columns
+            ]
+        ],
+        use_container_width=True,
+        hide_index=True
+    )
+
+    st.download_button(
+        "📥 Prix suspects (CSV)",
+        suspects.to_csv(index=False).encode("utf-8-sig"),
+        file_name="prix_suspects.csv",
+        mime="text/csv",
+        use_container_width=True
+    )
+
+
+def render():
+
+    st.header(
+        "📈 Statistiques"
+    )
+
+    profiling.mark(
+        "chargement"
+    )
+
+    # -----------------------------------------------------
+    # Chargement uniquement des tables utiles
+    # -----------------------------------------------------
+
+    df_pos = load_sheet(
+        SHEET_POS
+    )
+
+    df_products = load_sheet(
+        SHEET_PRODUCTS
+    )
+
+    df_distribution = load_sheet(
+        SHEET_DISTRIBUTION
+    )
+
+    df_prices = load_sheet(
+        SHEET_PRICES
+    )
+
+    df_surveys = load_sheet(
+        SHEET_SURVEYS
+    )
+
+    df_profile = load_sheet(
+        SHEET_PROFILE
+    )
+
+    df_material_pos = load_sheet(
+        SHEET_MATERIAL_POS
+    )
+
+    df_material_control = load_sheet(
+        SHEET_MATERIAL_CONTROL
+    )
+
+    profiling.mark(
+        "indicateurs"
+    )
+
+    total_pos = len(
+        df_pos
+    )
+
+    total_distribution = len(
+        df_distribution
+    )
+
+    total_price = len(
+        df_prices
+    )
+
+    total_surveys = len(
+        df_surveys
+    )
+
+    total_material = len(
+        df_material_pos
+    )
+
+    total_brands = (
+        df_products["Marque"].nunique()
+        if (
+            not df_products.empty
+            and "Marque"
+            in df_products.columns
+        )
+        else 0
+    )
+
+    c1, c2, c3, c4, c5, c6 = st.columns(6)
+
+    c1.metric(
+        "POS",
+        total_pos
+    )
+
+    c2.metric(
+        "Relevés distribution",
+        total_distribution
+    )
+
+    c3.metric(
+        "Relevés prix",
+        total_price
+    )
+
+    c4.metric(
+        "Enquêtes",
+        total_surveys
+    )
+
+    c5.metric(
+        "Marques",
+        total_brands
+    )
+
+    c6.metric(
+        "Matériels",
+        total_material
+    )
+
+    st.markdown("---")
+
+    # -----------------------------------------------------
+    # DISTRIBUTION
+    # -----------------------------------------------------
+
+    profiling.mark(
+        "graphiques distribution"
+    )
+
+    if not df_distribution.empty:
+
+        quantity_col = quantity_column(
+            df_distribution
+        )
+
+        st.subheader(
+            "📦 Distribution par marque"
+        )
+
+        if (
+            "Marque"
+            in df_distribution.columns
+            and quantity_col
+        ):
+
+            st.bar_chart(
+                sum_by(
+                    df_distribution,
+                    "Marque",
+                    quantity_col
+                )
+            )
+
+        if (
+            "Catégorie"
+            in df_distribution.columns
+        ):
+
+            st.subheader(
+                "🏷️ Distribution par catégorie"
+            )
+
+            if quantity_col:
+
+                st.bar_chart(
+                    sum_by(
+                        df_distribution,
+                        "Catégorie",
+                        quantity_col
+                    )
+                )
+
+    # -----------------------------------------------------
+    # PRIX
+    # -----------------------------------------------------
+
+    profiling.mark(
+        "graphiques prix"
+    )
+
+    if not df_prices.empty:
+
+        st.subheader(
+            "💰 Analyse des prix"
+        )
+
+        price_col = price_column(
+            df_prices
+        )
+
+        col1, col2 = st.columns(2)
+
+        exclude = col1.toggle(
+            "Exclure les prix suspects",
+            key="stats_exclude_outliers"
+        )
+
+        by_wilaya = col2.toggle(
+            "Médiane par Wilaya",
+            key="stats_outliers_by_wilaya"
+        )
+
+        # Médiane / MAD par produit (et Wilaya) : une passe
+        # vectorisée sur tout l'historique, refaite seulement
+        # quand la feuille change.
+        scored = cached_scores(
+            df_prices,
+            df_pos,
+            by_wilaya=by_wilaya
+        )
+
+        df_mean_prices = (
+            scored[~scored["Suspect"]]
+            if exclude and not scored.empty
+            else df_prices
+        )
+
+        if (
+            price_col
+            and "Marque" in df_prices.columns
+        ):
+
+            st.bar_chart(
+                mean_by(
+                    df_mean_prices,
+                    "Marque",
+                    price_col
+                )
+            )
+
+            st.dataframe(
+                price_summary(
+                    df_mean_prices,
+                    price_col
+                ),
+                use_container_width=True,
+                hide_index=True
+            )
+
+        show_price_outliers(
+            scored
+        )
+
+    # -----------------------------------------------------
+    # ENQUETES
+    # -----------------------------------------------------
+
+    profiling.mark(
+        "graphiques enquêtes"
+    )
+
+    if not df_surveys.empty:
+
+        st.subheader(
+            "📝 Résultats des enquêtes"
+        )
+
+        if (
+            "Marque"
+            in df_surveys.columns
+        ):
+
+            st.bar_chart(
+                value_counts(
+                    df_surveys,
+                    "Marque"
+                )
+            )
+
+        freq_col = frequency_column(
+            df_surveys
+        )
+
+        if (
+            freq_col
+            and "Marque" in df_surveys.columns
+        ):
+
+            st.subheader(
+                "📊 Fréquence moyenne "
+                "de vente / jour"
+            )
+
+            st.bar_chart(
+                mean_by(
+                    df_surveys,
+                    "Marque",
+                    freq_col
+                )
+            )
+
+    # -----------------------------------------------------
+    # TABLES
+    # -----------------------------------------------------
+
+    profiling.mark(
+        "tables"
+    )
+
+    st.markdown("---")
+
+    st.subheader(
+        "📋 Données disponibles"
+    )
+
+    tabs = st.tabs(
+        [
+            "Distribution",
+            "Prix",
+            "Enquêtes",
+            "Profils",
+            "Matériels",
+            "Contrôles"
+        ]
+    )
+
+    with tabs[0]:
+
+        if not df_distribution.empty:
+
+            st.dataframe(
+                df_distribution,
+                use_container_width=True,
+                hide_index=True
+            )
+
+        else:
+
+            st.info(
+                "Aucune donnée."
+            )
+
+    with tabs[1]:
+
+        if not df_prices.empty:
+
+            st.dataframe(
+                df_prices,
+                use_container_width=True,
+                hide_index=True
+            )
+
+        else:
+
+            st.info(
+                "Aucune donnée."
+            )
+
+    with tabs[2]:
+
+        if not df_surveys.empty:
+
+            st.dataframe(
+                df_surveys,
+                use_container_width=True,
+                hide_index=True
+            )
+
+        else:
+
+            st.info(
+                "Aucune donnée."
+            )
+
+    with tabs[3]:
+
+        # Profil courant de chaque POS, pas chaque révision.
+        df_profile = latest_frame(
+            SHEET_PROFILE,
+            df_profile
+        )
+
+        if not df_profile.empty:
+
+            st.dataframe(
+                df_profile,
+                use_container_width=True,
+                hide_index=True
+            )
+
+        else:
+
+            st.info(
+                "Aucune donnée."
+            )
+
+    with tabs[4]:
+
+        if not df_material_pos.empty:
+
+            st.dataframe(
+                df_material_pos,
+                use_container_width=True,
+                hide_index=True
+            )
+
+        else:
+
+            st.info(
+                "Aucune donnée."
+            )
+
+    with tabs[5]:
+
+        if not df_material_control.empty:
+
+            st.dataframe(
+                df_material_control,
+                use_container_width=True,
+                hide_index=True
+            )
+
+        else:
+
+            st.info(
+                "Aucune donnée."
+            )
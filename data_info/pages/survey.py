@@ -0,0 +1,454 @@
+import time
+import uuid
+from datetime import datetime
+
+import streamlit as st
+
+from data_info import profiling
+from data_info.schema import (
+    PLACEHOLDER,
+    SHEET_POS,
+    SHEET_PRODUCTS,
+    SHEET_SURVEYS,
+    SHEET_SURVEY_SUBJECTS
+)
+from data_info.transforms import unique_sorted
+from data_info.ui import (
+    CAPTURE_MODES,
+    append_row,
+    append_rows,
+    capture_mode,
+    grid_saved,
+    grid_selection,
+    load_sheet,
+    pos_picker,
+    product_cascade,
+    product_grid
+)
+
+
+# =========================================================
+# ENQUETE
+# =========================================================
+
+@st.fragment
+@profiling.profiled("formulaire enquête")
+def survey_form(
+    df_pos,
+    df_products,
+    df_subjects
+):
+
+    sujet = st.selectbox(
+        "Sujet de l'enquête",
+        ["--- Sélectionner ---"]
+        + unique_sorted(
+            df_subjects,
+            "Nom_Enquete"
+        ),
+        key="survey_subject"
+    )
+
+    pos = pos_picker(
+        df_pos,
+        "survey_pos",
+        label="Point de vente"
+    )
+
+    st.subheader(
+        "Produit observé"
+    )
+
+    marques_exposees = st.multiselect(
+        "Marques exposées",
+        unique_sorted(
+            df_products,
+            "Marque"
+        ),
+        key="survey_exposed_brands"
+    )
+
+    (
+        marque,
+        categorie,
+        famille,
+        produit,
+        capacite
+    ) = product_cascade(
+        df_products,
+        prefix="survey"
+    )
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+
+        prix = st.number_input(
+            "Prix",
+            min_value=0.0,
+            step=100.0,
+            key="survey_price"
+        )
+
+        stock = st.selectbox(
+            "Stock disponible ?",
+            [
+                "Oui",
+                "Non"
+            ],
+            key="survey_stock"
+        )
+
+    with col2:
+
+        promo = st.selectbox(
+            "En promotion ?",
+            [
+                "Oui",
+                "Non"
+            ],
+            key="survey_promo"
+        )
+
+        frequence = st.number_input(
+            "Fréquence de vente / jour",
+            min_value=0.0,
+            step=1.0,
+            key="survey_frequency"
+        )
+
+    remarque = st.text_area(
+        "Remarque",
+        key="survey_remark"
+    )
+
+    if st.button(
+        "💾 Enregistrer l'enquête",
+        use_container_width=True,
+        key="save_survey"
+    ):
+
+        errors = []
+
+        if sujet == "--- Sélectionner ---":
+            errors.append(
+                "Sélectionnez le sujet de l'enquête."
+            )
+
+        if pos == "--- Sélectionner ---":
+            errors.append(
+                "Sélectionnez le POS."
+            )
+
+        if not marques_exposees:
+            errors.append(
+                "Sélectionnez au moins une marque exposée."
+            )
+
+        if marque == "--- Sélectionner ---":
+            errors.append(
+                "Sélectionnez une marque."
+            )
+
+        if categorie == "--- Sélectionner ---":
+            errors.append(
+                "Sélectionnez une catégorie."
+            )
+
+        if famille == "--- Sélectionner ---":
+            errors.append(
+                "Sélectionnez une famille."
+            )
+
+        if produit == "--- Sélectionner ---":
+            errors.append(
+                "Sélectionnez un produit."
+            )
+
+        if capacite == "--- Sélectionner ---":
+            errors.append(
+                "Sélectionnez une capacité/dimension."
+            )
+
+        if errors:
+
+            for error in errors:
+                st.error(error)
+
+        else:
+
+            success = append_row(
+                SHEET_SURVEYS,
+                [
+                    str(uuid.uuid4()),
+                    str(datetime.now().date()),
+                    sujet,
+                    pos,
+                    ", ".join(
+                        marques_exposees
+                    ),
+                    marque,
+                    categorie,
+                    famille,
+                    produit,
+                    capacite,
+                    prix,
+                    stock == "Oui",
+                    promo == "Oui",
+                    frequence,
+                    remarque,
+                    st.session_state.user_id
+                ]
+            )
+
+            if success:
+
+                st.success(
+                    "✅ Enquête enregistrée."
+                )
+
+                time.sleep(1)
+
+                st.rerun()
+
+
+@st.fragment
+@profiling.profiled("grille enquête")
+def survey_grid(
+    df_pos,
+    df_products,
+    df_subjects
+):
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+
+        sujet = st.selectbox(
+            "Sujet de l'enquête",
+            [PLACEHOLDER]
+            + unique_sorted(
+                df_subjects,
+                "Nom_Enquete"
+            ),
+            key="survey_grid_subject"
+        )
+
+    with col2:
+
+        pos = pos_picker(
+            df_pos,
+            "survey_grid_pos",
+            label="Point de vente"
+        )
+
+    marques_exposees = st.multiselect(
+        "Marques exposées",
+        unique_sorted(
+            df_products,
+            "Marque"
+        ),
+        key="survey_grid_exposed_brands"
+    )
+
+    marque, categorie, famille = grid_selection(
+        df_products,
+        "survey"
+    )
+
+    if PLACEHOLDER in (marque, categorie):
+
+        st.info(
+            "Choisissez une marque et une catégorie pour "
+            "lister tous leurs produits."
+        )
+
+        return
+
+    edited = product_grid(
+        df_products,
+        "survey",
+        marque,
+        categorie,
+        famille,
+        {
+            "Prix": (
+                None,
+                st.column_config.NumberColumn(
+                    "Prix",
+                    min_value=0.0,
+                    step=100.0
+                )
+            ),
+            "Stock_Disponible": (
+                False,
+                st.column_config.CheckboxColumn(
+                    "Stock disponible"
+                )
+            ),
+            "Promotion": (
+                False,
+                st.column_config.CheckboxColumn(
+                    "En promotion"
+                )
+            ),
+            "Frequence_Vente_Jour": (
+                None,
+                st.column_config.NumberColumn(
+                    "Fréquence de vente / jour",
+                    min_value=0.0,
+                    step=1.0
+                )
+            ),
+            "Remarque": (
+                "",
+                st.column_config.TextColumn(
+                    "Remarque"
+                )
+            )
+        }
+    )
+
+    # Ligne relevée dès qu'un prix ou une fréquence est saisi.
+    filled = edited[
+        edited["Prix"].notna()
+        | edited["Frequence_Vente_Jour"].notna()
+    ].fillna(
+        {
+            "Prix": 0.0,
+            "Frequence_Vente_Jour": 0.0,
+            "Remarque": ""
+        }
+    )
+
+    if st.button(
+        f"💾 Enregistrer {len(filled)} enquête(s)",
+        use_container_width=True,
+        key="save_survey_grid"
+    ):
+
+        errors = []
+
+        if sujet == PLACEHOLDER:
+            errors.append(
+                "Sélectionnez le sujet de l'enquête."
+            )
+
+        if pos == PLACEHOLDER:
+            errors.append(
+                "Sélectionnez le POS."
+            )
+
+        if not marques_exposees:
+            errors.append(
+                "Sélectionnez au moins une marque exposée."
+            )
+
+        if filled.empty:
+            errors.append(
+                "Renseignez au moins un prix ou une fréquence."
+            )
+
+        if errors:
+
+            for error in errors:
+                st.error(error)
+
+        else:
+
+            rows = [
+                [
+                    str(uuid.uuid4()),
+                    str(datetime.now().date()),
+                    sujet,
+                    pos,
+                    ", ".join(
+                        marques_exposees
+                    ),
+                    marque,
+                    categorie,
+                    item["Famille"],
+                    item["Produit"],
+                    item["Capacité_Dimension"],
+                    float(item["Prix"]),
+                    bool(item["Stock_Disponible"]),
+                    bool(item["Promotion"]),
+                    float(item["Frequence_Vente_Jour"]),
+                    item["Remarque"],
+                    st.session_state.user_id
+                ]
+                for item in filled.to_dict("records")
+            ]
+
+            if append_rows(
+                SHEET_SURVEYS,
+                rows
+            ):
+
+                grid_saved(
+                    "survey",
+                    len(rows)
+                )
+
+
+def render():
+
+    st.header(
+        "📝 Enquête"
+    )
+
+    profiling.mark(
+        "chargement"
+    )
+
+    df_pos = load_sheet(
+        SHEET_POS
+    )
+
+    df_products = load_sheet(
+        SHEET_PRODUCTS
+    )
+
+    df_subjects = load_sheet(
+        SHEET_SURVEY_SUBJECTS
+    )
+
+    if (
+        df_pos.empty
+        or df_products.empty
+    ):
+
+        st.warning(
+            "Les tables POS et Produits "
+            "doivent être renseignées."
+        )
+
+        st.stop()
+
+    if df_subjects.empty:
+
+        st.warning(
+            "Aucun sujet d'enquête disponible."
+        )
+
+        st.stop()
+
+    profiling.mark(
+        "formulaire"
+    )
+
+    if capture_mode("survey") == CAPTURE_MODES[0]:
+
+        survey_form(
+            df_pos,
+            df_products,
+            df_subjects
+        )
+
+    else:
+
+        survey_grid(
+            df_pos,
+            df_products,
+            df_subjects
+        )
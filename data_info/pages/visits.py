@@ -0,0 +1,165 @@
+import time
+import uuid
+from datetime import datetime
+
+import streamlit as st
+
+from data_info import profiling
+from data_info.schema import (
+    RESULTATS_VISITE,
+    SHEET_POS,
+    SHEET_VISITS
+)
+from data_info.ui import (
+    append_dict_row,
+    load_sheet,
+    pos_picker
+)
+
+
+# =========================================================
+# VISITES POS
+# =========================================================
+
+def render():
+
+    st.header(
+        "🚗 Visites POS"
+    )
+
+    profiling.mark(
+        "chargement"
+    )
+
+    df_pos = load_sheet(
+        SHEET_POS
+    )
+
+    df_visits = load_sheet(
+        SHEET_VISITS
+    )
+
+    if df_pos.empty:
+
+        st.warning(
+            "La table POS est vide."
+        )
+
+        st.stop()
+
+    profiling.mark(
+        "formulaire"
+    )
+
+    st.subheader(
+        "📝 Nouvelle visite"
+    )
+
+    pos = pos_picker(
+        df_pos,
+        "visit_pos",
+        label="Point de vente"
+    )
+
+    date_visite = st.date_input(
+        "Date de visite",
+        value=datetime.now().date(),
+        key="visit_date"
+    )
+
+    motif = st.text_input(
+        "Motif de la visite",
+        key="visit_reason"
+    )
+
+    resultat = st.selectbox(
+        "Résultat",
+        RESULTATS_VISITE,
+        key="visit_result"
+    )
+
+    observation = st.text_area(
+        "Observation",
+        key="visit_observation"
+    )
+
+    if st.button(
+        "💾 Enregistrer la visite",
+        use_container_width=True,
+        key="save_visit"
+    ):
+
+        errors = []
+
+        if pos == "--- Sélectionner ---":
+
+            errors.append(
+                "Sélectionnez un POS."
+            )
+
+        if errors:
+
+            for e in errors:
+                st.error(e)
+
+        else:
+
+            success = append_dict_row(
+                SHEET_VISITS,
+                {
+                    "ID_Visite":
+                        str(uuid.uuid4()),
+                    "ID":
+                        str(uuid.uuid4()),
+                    "Date_Visite":
+                        str(date_visite),
+                    "Date":
+                        str(date_visite),
+                    "ID_POS":
+                        pos,
+                    "Motif":
+                        motif,
+                    "Resultat":
+                        resultat,
+                    "Résultat":
+                        resultat,
+                    "Observation":
+                        observation,
+                    "ID_User":
+                        st.session_state.user_id
+                }
+            )
+
+            if success:
+
+                st.success(
+                    "✅ Visite enregistrée."
+                )
+
+                time.sleep(1)
+
+                st.rerun()
+
+    st.markdown("---")
+
+    profiling.mark(
+        "historique"
+    )
+
+    st.subheader(
+        "📋 Historique des visites"
+    )
+
+    if not df_visits.empty:
+
+        st.dataframe(
+            df_visits.tail(50),
+            use_container_width=True,
+            hide_index=True
+        )
+
+    else:
+
+        st.info(
+            "Aucune visite enregistrée."
+        )
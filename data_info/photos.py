@@ -0,0 +1,284 @@
+import hashlib
+import os
+import re
+import tempfile
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from data_info.core import DATA_DIR, setting
+
+
+# =========================================================
+# PHOTOS
+# =========================================================
+
+# Magasin local adressé par contenu : une photo est rangée
+# sous le SHA-256 des octets stockés (photos/ab/abcd….jpg), et
+# c'est ce hash qui est écrit dans la colonne Photo. Deux
+# envois identiques ne sont stockés qu'une fois.
+#
+# Les photos de téléphone trop grandes sont recompressées
+# en JPEG à l'enregistrement, et rangées sous le hash du JPEG
+# produit (le fichier se vérifie en recalculant son hash). Les vignettes sont créées à la
+# première demande puis gardées sur disque : l'historique
+# n'ouvre jamais les photos en pleine résolution.
+
+CHUNK_SIZE = 1 << 20
+
+# Au-delà, la photo est réduite et recompressée.
+MAX_SIDE = 2048
+MAX_BYTES = 1_500_000
+
+JPEG_QUALITY = 85
+
+THUMB_SIDE = 256
+THUMB_QUALITY = 75
+
+HASH_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+def photo_dir():
+
+    return setting(
+        "photo_dir",
+        os.path.join(DATA_DIR, "photos")
+    )
+
+
+def is_photo_hash(value):
+
+    # Les anciennes lignes contiennent un nom de fichier.
+    return bool(HASH_PATTERN.match(str(value or "")))
+
+
+def photo_path(digest, kind="photos"):
+
+    return os.path.join(
+        photo_dir(),
+        kind,
+        digest[:2],
+        f"{digest}.jpg"
+    )
+
+
+def stream_to_temp(source, directory):
+
+    # Copie par blocs en calculant le hash au passage : le
+    # fichier reçu n'est jamais chargé d'un bloc en mémoire.
+    digest = hashlib.sha256()
+
+    if hasattr(source, "seek"):
+        source.seek(0)
+
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory,
+        suffix=".tmp"
+    )
+
+    try:
+
+        with os.fdopen(fd, "wb") as out:
+
+            for chunk in iter(
+                lambda: source.read(CHUNK_SIZE),
+                b""
+            ):
+
+                digest.update(chunk)
+
+                out.write(chunk)
+
+    except BaseException:
+
+        os.remove(tmp_path)
+
+        raise
+
+    return digest.hexdigest(), tmp_path
+
+
+def file_digest(path):
+
+    digest = hashlib.sha256()
+
+    with open(path, "rb") as f:
+
+        for chunk in iter(
+            lambda: f.read(CHUNK_SIZE),
+            b""
+        ):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def save_jpeg(image, path, max_side, quality):
+
+    # draft() laisse le décodeur JPEG réduire l'image à la
+    # lecture (1/2, 1/4, 1/8) au lieu de tout décompresser.
+    image.draft(
+        "RGB",
+        (max_side, max_side)
+    )
+
+    image = ImageOps.exif_transpose(image)
+
+    image.thumbnail(
+        (max_side, max_side),
+        Image.Resampling.LANCZOS
+    )
+
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path),
+        suffix=".tmp"
+    )
+
+    os.close(fd)
+
+    try:
+
+        image.convert("RGB").save(
+            tmp_path,
+            "JPEG",
+            quality=quality,
+            optimize=True
+        )
+
+        os.replace(tmp_path, path)
+
+    except BaseException:
+
+        os.remove(tmp_path)
+
+        raise
+
+
+def store_photo(source):
+
+    # Renvoie le hash à écrire dans la colonne Photo.
+    # ValueError si le fichier n'est pas une image lisible.
+    directory = os.path.join(
+        photo_dir(),
+        "photos"
+    )
+
+    os.makedirs(directory, exist_ok=True)
+
+    digest, tmp_path = stream_to_temp(
+        source,
+        directory
+    )
+
+    jpeg_path = tmp_path + ".jpg"
+
+    try:
+
+        # Déjà stockée telle quelle (même envoi) : rien à
+        # décoder.
+        if os.path.exists(photo_path(digest)):
+            return digest
+
+        try:
+
+            with Image.open(tmp_path) as image:
+
+                oversized = (
+                    max(image.size) > MAX_SIDE
+                    or os.path.getsize(tmp_path) > MAX_BYTES
+                    or image.format != "JPEG"
+                )
+
+                if oversized:
+
+                    save_jpeg(
+                        image,
+                        jpeg_path,
+                        MAX_SIDE,
+                        JPEG_QUALITY
+                    )
+
+        except Image.DecompressionBombError as e:
+
+            raise ValueError(
+                "image trop grande"
+            ) from e
+
+        except (UnidentifiedImageError, OSError) as e:
+
+            raise ValueError(
+                "image illisible (JPEG ou PNG attendu)"
+            ) from e
+
+        # Recompressée : rangée sous le hash du JPEG écrit.
+        # Petit JPEG : gardé tel quel.
+        stored = tmp_path
+
+        if oversized:
+
+            stored = jpeg_path
+
+            digest = file_digest(jpeg_path)
+
+        path = photo_path(digest)
+
+        if not os.path.exists(path):
+
+            os.makedirs(
+                os.path.dirname(path),
+                exist_ok=True
+            )
+
+            os.replace(stored, path)
+
+        return digest
+
+    finally:
+
+        for leftover in [tmp_path, jpeg_path]:
+
+            if os.path.exists(leftover):
+                os.remove(leftover)
+
+
+def thumbnail_path(digest):
+
+    # Vignette créée à la première demande ; None si la photo
+    # n'est pas (ou plus) dans le magasin local.
+    if not is_photo_hash(digest):
+        return None
+
+    path = photo_path(digest, "thumbs")
+
+    if os.path.exists(path):
+        return path
+
+    source = photo_path(digest)
+
+    if not os.path.exists(source):
+        return None
+
+    os.makedirs(
+        os.path.dirname(path),
+        exist_ok=True
+    )
+
+    with Image.open(source) as image:
+
+        save_jpeg(
+            image,
+            path,
+            THUMB_SIDE,
+            THUMB_QUALITY
+        )
+
+    return path
+
+
+def full_path(digest):
+
+    if not is_photo_hash(digest):
+        return None
+
+    path = photo_path(digest)
+
+    return path if os.path.exists(path) else None
@@ -0,0 +1,366 @@
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+
+
+# =========================================================
+# PROFILAGE PAR RERUN
+# =========================================================
+
+# Un RerunProfile chronomètre les sections nommées d'une
+# exécution du script (sections imbriquées via section(),
+# étapes successives via mark()) et relève le pic mémoire
+# tracemalloc du processus (toutes sessions confondues). Les
+# runs s'exportent au format Chrome trace (chrome://tracing,
+# Perfetto).
+
+_local = threading.local()
+
+
+class MemoryTracer:
+
+    # tracemalloc est global au processus : démarré au premier
+    # rerun profilé, arrêté quand plus aucun ne l'utilise. Le
+    # pic aussi est global : chaque rerun profilé le remet à
+    # zéro, `resets` permet de savoir si un autre rerun a
+    # tourné en même temps.
+
+    def __init__(self):
+
+        self.lock = threading.Lock()
+        self.users = 0
+        self.resets = 0
+        self.started_here = False
+
+    def acquire(self):
+
+        with self.lock:
+
+            if self.users == 0 and not tracemalloc.is_tracing():
+
+                tracemalloc.start()
+
+                self.started_here = True
+
+            self.users += 1
+
+            self.resets += 1
+
+            tracemalloc.reset_peak()
+
+            return self.resets
+
+    def peak(self, since):
+
+        # (pic du processus, partagé ?) pour le rerun dont
+        # acquire a renvoyé `since`.
+        with self.lock:
+
+            if not tracemalloc.is_tracing():
+                return 0, False
+
+            return (
+                tracemalloc.get_traced_memory()[1],
+                self.users > 1 or self.resets != since
+            )
+
+    def release(self):
+
+        with self.lock:
+
+            self.users = max(self.users - 1, 0)
+
+            if self.users == 0 and self.started_here:
+
+                tracemalloc.stop()
+
+                self.started_here = False
+
+
+MEMORY = MemoryTracer()
+
+
+class RerunProfile:
+
+    def __init__(self, label="", trace_memory=True):
+
+        self.label = label
+        self.wall_start = time.time()
+        self.started = time.perf_counter()
+        self.events = []
+        self.depth = 0
+        self.current_mark = None
+        self.trace_memory = trace_memory
+        self.memory_since = None
+        self.result = None
+
+        if trace_memory:
+            self.memory_since = MEMORY.acquire()
+
+    def add_event(self, name, start, end, depth, args=None):
+
+        self.events.append(
+            {
+                "name": name,
+                "start": start - self.started,
+                "duration": end - start,
+                "depth": depth,
+                "args": args or {}
+            }
+        )
+
+    @contextmanager
+    def section(self, name, **args):
+
+        start = time.perf_counter()
+
+        level = self.depth + 1 + (self.current_mark is not None)
+
+        self.depth += 1
+
+        try:
+
+            yield args
+
+        finally:
+
+            self.depth -= 1
+
+            self.add_event(
+                name,
+                start,
+                time.perf_counter(),
+                level,
+                args
+            )
+
+    def close_mark(self, end):
+
+        if self.current_mark is None:
+            return
+
+        name, start = self.current_mark
+
+        self.current_mark = None
+
+        self.add_event(name, start, end, 1)
+
+    def mark(self, name):
+
+        # Étape de page : dure jusqu'à la prochaine étape ou la
+        # fin du rerun.
+        now = time.perf_counter()
+
+        self.close_mark(now)
+
+        self.current_mark = (name, now)
+
+    def finish(self, interrupted=False):
+
+        if self.result is not None:
+            return self.result
+
+        end = time.perf_counter()
+
+        self.close_mark(end)
+
+        peak, shared = 0, False
+
+        if self.trace_memory:
+
+            peak, shared = MEMORY.peak(self.memory_since)
+
+            MEMORY.release()
+
+        self.result = {
+            "label": self.label,
+            "wall_start": self.wall_start,
+            "duration": end - self.started,
+            "interrupted": interrupted,
+            "peak_memory": peak,
+            "peak_shared": shared,
+            "events": sorted(
+                self.events,
+                key=lambda event: (event["start"], event["depth"])
+            )
+        }
+
+        if current() is self:
+            _local.profile = None
+
+        return self.result
+
+
+# =========================================================
+# PROFIL COURANT (PAR THREAD DE RERUN)
+# =========================================================
+
+def start(label="", trace_memory=True):
+
+    profile = RerunProfile(label, trace_memory)
+
+    _local.profile = profile
+
+    return profile
+
+
+def detach():
+
+    # Début de rerun : rien ne doit rester du run précédent
+    # exécuté sur ce thread.
+    _local.profile = None
+
+
+def current():
+
+    return getattr(_local, "profile", None)
+
+
+def section(name, **args):
+
+    profile = current()
+
+    if profile is None:
+        return nullcontext({})
+
+    return profile.section(name, **args)
+
+
+def profiled(name):
+
+    def decorator(func):
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+
+            with section(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def mark(name):
+
+    profile = current()
+
+    if profile is not None:
+        profile.mark(name)
+
+
+def set_label(label):
+
+    profile = current()
+
+    if profile is not None:
+        profile.label = label
+
+
+# =========================================================
+# EXPORT
+# =========================================================
+
+def section_totals(run):
+
+    # Durée cumulée et nombre d'appels par nom de section.
+    totals = {}
+
+    for event in run["events"]:
+
+        entry = totals.setdefault(
+            event["name"],
+            {
+                "Section": event["name"],
+                "Niveau": event["depth"],
+                "Appels": 0,
+                "Durée_ms": 0.0
+            }
+        )
+
+        entry["Appels"] += 1
+        entry["Durée_ms"] += event["duration"] * 1000
+
+    for entry in totals.values():
+        entry["Durée_ms"] = round(entry["Durée_ms"], 1)
+
+    return sorted(
+        totals.values(),
+        key=lambda entry: (entry["Niveau"], -entry["Durée_ms"])
+    )
+
+
+def chrome_trace(runs, process_name="Data_Info"):
+
+    pid = os.getpid()
+
+    events = [
+        {
+            "name": "process_name",
+            "ph": "M",
+            "pid": pid,
+            "tid": 0,
+            "args": {"name": process_name}
+        }
+    ]
+
+    for number, run in enumerate(runs, start=1):
+
+        origin = run["wall_start"] * 1_000_000
+
+        label = run["label"] or "rerun"
+
+        events.append(
+            {
+                "name": f"#{number} {label}",
+                "cat": "rerun",
+                "ph": "X",
+                "ts": origin,
+                "dur": run["duration"] * 1_000_000,
+                "pid": pid,
+                "tid": 1,
+                "args": {
+                    "interrupted": run["interrupted"],
+                    "process_peak_memory_mb": round(run["peak_memory"] / 2**20, 2),
+                    "peak_shared": run.get("peak_shared", False)
+                }
+            }
+        )
+
+        for event in run["events"]:
+
+            events.append(
+                {
+                    "name": event["name"],
+                    "cat": "section",
+                    "ph": "X",
+                    "ts": origin + event["start"] * 1_000_000,
+                    "dur": event["duration"] * 1_000_000,
+                    "pid": pid,
+                    "tid": 1,
+                    "args": event["args"]
+                }
+            )
+
+        events.append(
+            {
+                "name": "tracemalloc peak (process)",
+                "ph": "C",
+                "ts": origin,
+                "pid": pid,
+                "tid": 1,
+                "args": {"MB": round(run["peak_memory"] / 2**20, 2)}
+            }
+        )
+
+    return json.dumps(
+        {
+            "traceEvents": events,
+            "displayTimeUnit": "ms"
+        },
+        ensure_ascii=False
+    )
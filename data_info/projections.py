@@ -0,0 +1,433 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from data_info import core
+from data_info.core import resource
+from data_info.schema import (
+    SHEET_DISTRIBUTION,
+    SHEET_MATERIAL_CONTROL,
+    SHEET_MATERIAL_POS,
+    SHEET_PRICES,
+    SHEET_PROFILE
+)
+from data_info.transforms import (
+    brand_presence,
+    clean_text,
+    control_summary,
+    last_readings,
+    latest_records,
+    material_entries,
+    price_groups,
+    text_column
+)
+
+
+# =========================================================
+# PROJECTIONS
+# =========================================================
+
+# Index tenus en mémoire, par processus, sur des feuilles qui
+# ne font que grandir :
+#
+# - une nouvelle copie de la feuille n'applique que les lignes
+#   ajoutées depuis la précédente (sinon, reconstruction
+#   complète) ;
+# - un enregistrement (envoyé ou mis en file locale) met
+#   l'index à jour sans attendre le rechargement.
+#
+# Une recherche est alors un accès dict, quelle que soit la
+# longueur de l'historique. view["changes"] augmente à chaque
+# mise à jour : les calculs dérivés (data_info.fleet) s'en
+# servent comme version.
+
+# Feuilles historisées (une ligne ajoutée par modification) :
+# clé de la vue « dernière ligne », utilisée aussi par
+# data_info.cli compact.
+PROJECTIONS = {
+    SHEET_PROFILE: "ID_POS"
+}
+
+LATEST = "latest"
+
+PRESENCE = "presence"
+
+MATERIALS = "materials"
+
+CONTROLS = "controls"
+
+READINGS = "readings"
+
+PRICE_HISTORY = "price_history"
+
+# Feuilles de relevés : (colonne date, valeurs gardées) de la
+# vue READINGS.
+READING_COLUMNS = {
+    SHEET_PRICES: (
+        "Date_Releve",
+        ["Prix_Vente", "Prix_Promo", "Promotion"]
+    ),
+    SHEET_DISTRIBUTION: (
+        "Date_Visite",
+        ["Quantite"]
+    )
+}
+
+
+def apply_latest(view, df):
+
+    view["records"].update(
+        latest_records(
+            df,
+            PROJECTIONS[view["sheet"]]
+        )
+    )
+
+
+def apply_presence(view, df):
+
+    for pos, brands in brand_presence(df).items():
+        view["records"].setdefault(pos, {}).update(brands)
+
+
+def apply_materials(view, df):
+
+    # Sans ID_Materiel, la clé est le numéro de ligne.
+    for pos, entries in material_entries(
+        df,
+        first_line=view["rows"] + 2
+    ).items():
+        view["records"].setdefault(pos, {}).update(entries)
+
+
+def apply_controls(view, df):
+
+    for key, summary in control_summary(df).items():
+
+        current = view["records"].get(key)
+
+        if current is not None:
+            summary["controls"] |= current["controls"]
+
+        view["records"][key] = summary
+
+
+def reading_order(date):
+
+    if core.ISO_DATE_PATTERN.match(date):
+        return date
+
+    return ""
+
+
+def apply_readings(view, df):
+
+    # Une ligne ajoutée plus ancienne (import d'un historique)
+    # ne remplace pas un relevé plus récent. Dates en
+    # AAAA-MM-JJ (last_readings) : une date illisible passe
+    # avant les autres.
+    readings = view["records"]
+
+    date_column, value_columns = READING_COLUMNS[view["sheet"]]
+
+    for key, (date, record) in last_readings(
+        df,
+        date_column,
+        value_columns
+    ).items():
+
+        current = readings.get(key)
+
+        if current is None or (
+            reading_order(date) >= reading_order(current[0])
+        ):
+            readings[key] = (date, record)
+
+
+def apply_price_history(view, df):
+
+    # Prix ajoutés à la suite de ceux du produit
+    # (data_info.outliers). Chaque ID_Releve ne compte qu'une
+    # fois : la ligne déjà appliquée par record_written revient
+    # au rechargement suivant (de même qu'une ligne rejouée
+    # deux fois depuis la file locale).
+    history = view["records"]
+
+    applied = view.setdefault("applied", set())
+
+    ids = text_column(
+        df,
+        core.record_key_column(view["sheet"]) or ""
+    )
+
+    fresh = ids.eq("") | ~(ids.isin(applied) | ids.duplicated())
+
+    applied.update(ids[fresh & ids.ne("")])
+
+    for key, (pos, prices) in price_groups(df[fresh.to_numpy()]).items():
+
+        current = history.get(key)
+
+        if current is not None:
+
+            pos = np.concatenate([current[0], pos])
+            prices = np.concatenate([current[1], prices])
+
+        history[key] = (pos, prices)
+
+
+VIEWS = {
+    LATEST: apply_latest,
+    PRESENCE: apply_presence,
+    MATERIALS: apply_materials,
+    CONTROLS: apply_controls,
+    READINGS: apply_readings,
+    PRICE_HISTORY: apply_price_history
+}
+
+
+@resource
+def get_projection_store():
+
+    return {
+        "lock": threading.Lock(),
+        "views": {}
+    }
+
+
+def row_signature(df, position):
+
+    return tuple(
+        str(value)
+        for value in df.iloc[position].tolist()
+    )
+
+
+def refresh_view(kind, sheet_name, df):
+
+    store = get_projection_store()
+
+    with store["lock"]:
+
+        view = store["views"].get((kind, sheet_name))
+
+        if df is None or df.empty:
+            return view
+
+        rows = view["rows"] if view else 0
+
+        incremental = (
+            view is not None
+            and view["columns"] == list(df.columns)
+            and 0 < rows <= len(df)
+            and row_signature(df, rows - 1) == view["tail"]
+        )
+
+        if incremental and rows == len(df):
+            return view
+
+        if not incremental:
+
+            view = {
+                "sheet": sheet_name,
+                "columns": list(df.columns),
+                "records": {},
+                "rows": 0,
+                "changes": 0,
+                "frame": None
+            }
+
+            store["views"][(kind, sheet_name)] = view
+
+        VIEWS[kind](
+            view,
+            df.iloc[view["rows"]:]
+        )
+
+        view["rows"] = len(df)
+        view["tail"] = row_signature(df, len(df) - 1)
+        view["changes"] += 1
+        view["frame"] = None
+
+        return view
+
+
+# =========================================================
+# DERNIERE LIGNE PAR CLE
+# =========================================================
+
+def latest_row(sheet_name, df, key):
+
+    # Dernière version de la ligne `key`, ou None.
+    if PROJECTIONS[sheet_name] not in df.columns:
+        return None
+
+    view = refresh_view(
+        LATEST,
+        sheet_name,
+        df
+    )
+
+    if view is None:
+        return None
+
+    record = view["records"].get(
+        str(key).strip()
+    )
+
+    return pd.Series(record) if record is not None else None
+
+
+def latest_frame(sheet_name, df):
+
+    # Une ligne par clé, état courant (onglet Statistiques).
+    if PROJECTIONS[sheet_name] not in df.columns:
+        return df
+
+    view = refresh_view(
+        LATEST,
+        sheet_name,
+        df
+    )
+
+    if view is None:
+        return pd.DataFrame()
+
+    with get_projection_store()["lock"]:
+
+        if view["frame"] is None:
+
+            view["frame"] = pd.DataFrame.from_records(
+                list(view["records"].values()),
+                columns=view["columns"]
+            )
+
+        return view["frame"]
+
+
+# =========================================================
+# PRESENCE DES MARQUES PAR POS
+# =========================================================
+
+def brands_at(df_distribution, pos):
+
+    # {marque en minuscules: dernière quantité} du POS.
+    view = refresh_view(
+        PRESENCE,
+        SHEET_DISTRIBUTION,
+        df_distribution
+    )
+
+    if view is None:
+        return {}
+
+    return view["records"].get(
+        str(pos).strip(),
+        {}
+    )
+
+
+# =========================================================
+# MATERIEL ET CONTROLES
+# =========================================================
+
+def materials_at(df_material_pos, pos):
+
+    # {clé unique: {"label", "row"}} des matériels du POS.
+    view = refresh_view(
+        MATERIALS,
+        SHEET_MATERIAL_POS,
+        df_material_pos
+    )
+
+    if view is None:
+        return {}
+
+    return view["records"].get(
+        str(pos).strip(),
+        {}
+    )
+
+
+def last_control(df_control, material_id):
+
+    # (dernier contrôle, nombre de contrôles) du matériel.
+    view = refresh_view(
+        CONTROLS,
+        SHEET_MATERIAL_CONTROL,
+        df_control
+    )
+
+    summary = (
+        view["records"].get(str(material_id).strip())
+        if view is not None
+        else None
+    )
+
+    if summary is None:
+        return None, 0
+
+    return summary["last"], len(summary["controls"])
+
+
+# =========================================================
+# DERNIER RELEVE PAR POS ET PRODUIT
+# =========================================================
+
+def last_reading(sheet_name, df, pos, product):
+
+    # (date, {valeur: …}) du dernier relevé du produit
+    # (Marque, …, Capacité_Dimension) dans le POS, ou None.
+    view = refresh_view(
+        READINGS,
+        sheet_name,
+        df
+    )
+
+    if view is None:
+        return None
+
+    return view["records"].get(
+        tuple(
+            clean_text(value)
+            for value in (pos, *product)
+        )
+    )
+
+
+# =========================================================
+# ENREGISTREMENTS DE CE PROCESSUS
+# =========================================================
+
+def record_written(sheet_name, records):
+
+    # core.WRITE_HOOKS. Seules les colonnes de la feuille sont
+    # gardées ; un index pas encore construit l'est au prochain
+    # chargement.
+    store = get_projection_store()
+
+    with store["lock"]:
+
+        for (kind, sheet), view in store["views"].items():
+
+            if sheet != sheet_name:
+                continue
+
+            VIEWS[kind](
+                view,
+                pd.DataFrame.from_records(
+                    records
+                ).reindex(
+                    columns=view["columns"],
+                    fill_value=""
+                )
+            )
+
+            view["changes"] += 1
+            view["frame"] = None
+
+
+core.WRITE_HOOKS.append(
+    record_written
+)
@@ -0,0 +1,236 @@
+# =========================================================
+# FEUILLES GOOGLE SHEETS
+# =========================================================
+
+SCOPES = [
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive"
+]
+
+SPREADSHEET_ID = "1SN02jxpV2oyc3tWItY9c2Kc_UEXfqTdtQSL9WgGAi3w"
+
+SHEET_USERS = "Utilisateurs"
+SHEET_POS = "POS"
+SHEET_PRODUCTS = "Produits"
+SHEET_PROFILE = "Profil_Client"
+SHEET_DISTRIBUTION = "Distribution_Numerique"
+SHEET_PRICES = "Releve_Prix"
+SHEET_SURVEYS = "Enquetes"
+SHEET_SURVEY_SUBJECTS = "Enquetes_Sujets"
+SHEET_VISITS = "Visites_POS"
+SHEET_OBJECTIVES = "Objectifs_POS"
+
+SHEET_MATERIAL_TYPES = "Types_Materiel"
+SHEET_MATERIAL_POS = "Materiel_POS"
+SHEET_MATERIAL_CONTROL = "Controle_Materiel"
+
+
+# =========================================================
+# COLONNES
+# =========================================================
+
+# Ordre des colonnes tel qu'écrit par les formulaires.
+# Distribution, Prix et Enquêtes sont écrits par position
+# (append_row) : l'ordre ici doit suivre celui des pages.
+
+SHEET_COLUMNS = {
+    SHEET_USERS: [
+        "ID_User",
+        "Nom",
+        "Email",
+        "Password",
+        "Role",
+        "Statut"
+    ],
+    SHEET_POS: [
+        "ID_POS",
+        "Nom_POS",
+        "Wilaya",
+        "Commune",
+        "Adresse",
+        "Telephone",
+        "Email",
+        "Statut",
+        "Date_Creation"
+    ],
+    SHEET_PRODUCTS: [
+        "Marque",
+        "Catégorie",
+        "Famille",
+        "Produit",
+        "Capacité_Dimension",
+        # Facultative : code-barres EAN ou code interne.
+        "Code_EAN",
+        # Clé stable, attribuée par data_info.cli product-ids.
+        "ID_Produit"
+    ],
+    SHEET_PROFILE: [
+        "ID_Profil",
+        "ID_POS",
+        "Date",
+        "Date_Mise_A_Jour",
+        "Nom_Proprietaire",
+        "Contact_Proprietaire",
+        "Nom_Facade",
+        "Nom_Acheteur",
+        "Contact_Acheteur",
+        "Surface_Magasin",
+        "Surface_Exposition",
+        "Nombre_Vitrines",
+        "Nombre_Travailleurs",
+        "Presence_Digitale",
+        "CA_2025",
+        "Observation",
+        "ID_User"
+    ],
+    SHEET_DISTRIBUTION: [
+        "ID_Distribution",
+        "Date_Visite",
+        "ID_POS",
+        "Marque",
+        "Catégorie",
+        "Famille",
+        "Produit",
+        "Capacité_Dimension",
+        "Quantite",
+        "ID_User",
+        "Remarque",
+        # Codée : les cinq colonnes produit restent vides.
+        "ID_Produit"
+    ],
+    SHEET_PRICES: [
+        "ID_Releve",
+        "Date_Releve",
+        "ID_POS",
+        "Marque",
+        "Catégorie",
+        "Famille",
+        "Produit",
+        "Capacité_Dimension",
+        "Prix_Vente",
+        "Prix_Promo",
+        "Promotion",
+        "Remarque",
+        "ID_User",
+        # Codée : les cinq colonnes produit restent vides.
+        "ID_Produit"
+    ],
+    SHEET_SURVEYS: [
+        "ID_Enquete",
+        "Date",
+        "Sujet",
+        "ID_POS",
+        "Marques_Exposees",
+        "Marque",
+        "Catégorie",
+        "Famille",
+        "Produit",
+        "Capacité_Dimension",
+        "Prix",
+        "Stock_Disponible",
+        "Promotion",
+        "Frequence_Vente_Jour",
+        "Remarque",
+        "ID_User"
+    ],
+    SHEET_SURVEY_SUBJECTS: [
+        "ID_Sujet",
+        "Nom_Enquete",
+        "Statut"
+    ],
+    SHEET_VISITS: [
+        "ID_Visite",
+        "Date_Visite",
+        "ID_POS",
+        "Motif",
+        "Resultat",
+        "Observation",
+        "ID_User"
+    ],
+    SHEET_OBJECTIVES: [
+        "ID_Objectif",
+        "Date",
+        "Annee",
+        "ID_POS",
+        "Type_Objectif",
+        "Objectif",
+        "Commentaire",
+        "ID_User"
+    ],
+    SHEET_MATERIAL_TYPES: [
+        "ID_Type_Materiel",
+        "Type_Materiel",
+        "Categorie_Materiel"
+    ],
+    SHEET_MATERIAL_POS: [
+        "ID_Materiel",
+        "Date_Installation",
+        "ID_POS",
+        "ID_Type_Materiel",
+        "Type_Materiel",
+        "Categorie_Materiel",
+        "Marque_Materiel",
+        "Reference_Materiel",
+        "Quantite",
+        "Etat",
+        "Fonctionnel",
+        "Emplacement",
+        "Photo",
+        "Observation",
+        "ID_User"
+    ],
+    SHEET_MATERIAL_CONTROL: [
+        "ID_Controle",
+        "Date_Controle",
+        "ID_POS",
+        "ID_Materiel",
+        "Etat",
+        "Fonctionnel",
+        "Conforme_Marque",
+        "Produit_Marque_Presente",
+        "Photo",
+        "Observation",
+        "Action_Necessaire",
+        "ID_User"
+    ]
+}
+
+
+# =========================================================
+# VALEURS DES LISTES
+# =========================================================
+
+PLACEHOLDER = "--- Sélectionner ---"
+
+ETATS_MATERIEL = [
+    "Neuf",
+    "Bon état",
+    "État moyen",
+    "Mauvais état",
+    "À remplacer"
+]
+
+ACTIONS_MATERIEL = [
+    "Aucune",
+    "Maintenance",
+    "Réparation",
+    "Remplacement",
+    "Retrait",
+    "Nouvelle installation"
+]
+
+RESULTATS_VISITE = [
+    "Visite effectuée",
+    "POS fermé",
+    "Responsable absent",
+    "Refus",
+    "Autre"
+]
+
+TYPES_OBJECTIF = [
+    "CA",
+    "Volume",
+    "Nombre de commandes",
+    "Distribution",
+    "Autre"
+]
@@ -0,0 +1,372 @@
+import bisect
+import re
+import threading
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+from data_info.core import resource
+from data_info.transforms import (
+    CODE_COLUMNS,
+    PRODUCT_LEVELS,
+    frame_version,
+    normalize_code,
+    product_codes,
+    text_column
+)
+
+
+# =========================================================
+# RECHERCHE POS
+# =========================================================
+
+# Index construit une fois par contenu de la table POS (hash
+# des colonnes indexées) :
+#
+# - les mots (ID_POS, Nom_POS, Wilaya, Commune) sans accents
+#   ni casse, triés : un préfixe est une recherche bisect ;
+# - les trigrammes de ces mots : un fragment de 3 caractères
+#   ou plus est cherché à l'intérieur des mots ;
+# - les POS par Wilaya et par (Wilaya, Commune).
+#
+# Une recherche renvoie les k meilleurs POS, jamais la table
+# entière : le sélecteur n'envoie que ces options au
+# navigateur.
+
+SEARCH_COLUMNS = [
+    ("ID_POS",),
+    ("Nom_POS", "Nom"),
+    ("Wilaya",),
+    ("Commune",)
+]
+
+# Score par mot cherché : mot exact, début de mot, fragment.
+EXACT = 3
+PREFIX = 2
+INFIX = 1
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def normalize(text):
+
+    text = unicodedata.normalize(
+        "NFKD",
+        str(text)
+    )
+
+    return "".join(
+        char
+        for char in text
+        if not unicodedata.combining(char)
+    ).lower()
+
+
+def tokenize(text):
+
+    return TOKEN_PATTERN.findall(
+        normalize(text)
+    )
+
+
+def trigrams(token):
+
+    return {
+        token[i:i + 3]
+        for i in range(len(token) - 2)
+    }
+
+
+class PosIndex:
+
+    def __init__(self, df_pos):
+
+        columns = {
+            names[0]: text_column(df_pos, *names)
+            for names in SEARCH_COLUMNS
+        }
+
+        frame = pd.DataFrame(columns)
+
+        frame = frame[
+            frame["ID_POS"].ne("")
+        ].drop_duplicates(
+            "ID_POS",
+            keep="last"
+        ).sort_values(
+            "ID_POS",
+            kind="stable"
+        )
+
+        self.ids = frame["ID_POS"].tolist()
+        self.positions = {
+            pos: i
+            for i, pos in enumerate(self.ids)
+        }
+
+        self.labels = [
+            " — ".join(
+                part
+                for part in (pos, name, ", ".join(p for p in (commune, wilaya) if p))
+                if part
+            )
+            for pos, name, wilaya, commune in zip(
+                self.ids,
+                frame["Nom_POS"].tolist(),
+                frame["Wilaya"].tolist(),
+                frame["Commune"].tolist()
+            )
+        ]
+
+        # ---------- mots -> POS ----------
+
+        postings = {}
+
+        texts = (
+            frame["ID_POS"]
+            + " "
+            + frame["Nom_POS"]
+            + " "
+            + frame["Wilaya"]
+            + " "
+            + frame["Commune"]
+        ).tolist()
+
+        for i, text in enumerate(texts):
+
+            for token in set(tokenize(text)):
+                postings.setdefault(token, []).append(i)
+
+        self.tokens = sorted(postings)
+
+        self.postings = [
+            np.asarray(postings[token], dtype=np.int64)
+            for token in self.tokens
+        ]
+
+        # ---------- trigrammes -> mots ----------
+
+        grams = {}
+
+        for t, token in enumerate(self.tokens):
+
+            for gram in trigrams(token):
+                grams.setdefault(gram, []).append(t)
+
+        self.grams = {
+            gram: np.asarray(tokens, dtype=np.int64)
+            for gram, tokens in grams.items()
+        }
+
+        # ---------- Wilaya -> Commune -> POS ----------
+
+        self.by_wilaya = {}
+        self.by_commune = {}
+
+        for i, (wilaya, commune) in enumerate(
+            zip(
+                frame["Wilaya"].tolist(),
+                frame["Commune"].tolist()
+            )
+        ):
+
+            self.by_wilaya.setdefault(wilaya, []).append(i)
+            self.by_commune.setdefault((wilaya, commune), []).append(i)
+
+    def __len__(self):
+
+        return len(self.ids)
+
+    def __contains__(self, pos):
+
+        return str(pos).strip() in self.positions
+
+    def label(self, pos):
+
+        i = self.positions.get(pos)
+
+        return self.labels[i] if i is not None else str(pos)
+
+    def wilayas(self):
+
+        return sorted(w for w in self.by_wilaya if w)
+
+    def communes(self, wilaya):
+
+        return sorted(
+            commune
+            for (w, commune) in self.by_commune
+            if w == wilaya and commune
+        )
+
+    def match_token(self, query):
+
+        # [(indices de mots, score)] : exact, préfixe, fragment.
+        start = bisect.bisect_left(self.tokens, query)
+        end = bisect.bisect_left(self.tokens, query + "\uffff")
+
+        prefixed = np.arange(start, end, dtype=np.int64)
+
+        exact = prefixed[:1] if (
+            start < end and self.tokens[start] == query
+        ) else prefixed[:0]
+
+        infix = prefixed[:0]
+
+        if len(query) >= 3:
+
+            candidates = None
+
+            for gram in trigrams(query):
+
+                tokens = self.grams.get(gram)
+
+                if tokens is None:
+                    candidates = prefixed[:0]
+                    break
+
+                candidates = (
+                    tokens
+                    if candidates is None
+                    else np.intersect1d(candidates, tokens, assume_unique=True)
+                )
+
+            infix = np.asarray(
+                [
+                    t
+                    for t in candidates
+                    if query in self.tokens[t]
+                    and not self.tokens[t].startswith(query)
+                ],
+                dtype=np.int64
+            )
+
+        return [
+            (exact, EXACT),
+            (prefixed, PREFIX),
+            (infix, INFIX)
+        ]
+
+    def search(self, query="", wilaya="", commune="", limit=50):
+
+        # POS correspondant à tous les mots cherchés, les mieux
+        # classés d'abord (puis par ID_POS).
+        if commune:
+            scope = self.by_commune.get((wilaya, commune), [])
+        elif wilaya:
+            scope = self.by_wilaya.get(wilaya, [])
+        else:
+            scope = None
+
+        scores = np.zeros(len(self.ids), dtype=np.int64)
+
+        allowed = np.ones(len(self.ids), dtype=bool)
+
+        if scope is not None:
+
+            allowed[:] = False
+            allowed[scope] = True
+
+        for token in tokenize(query):
+
+            token_scores = np.zeros(len(self.ids), dtype=np.int64)
+
+            for tokens, score in self.match_token(token):
+
+                if len(tokens):
+
+                    np.maximum.at(
+                        token_scores,
+                        np.concatenate([self.postings[t] for t in tokens]),
+                        score
+                    )
+
+            allowed &= token_scores > 0
+
+            scores += token_scores
+
+        found = np.flatnonzero(allowed)
+
+        order = found[
+            np.argsort(-scores[found], kind="stable")
+        ][:limit]
+
+        return [self.ids[i] for i in order], len(found)
+
+
+@resource
+def get_search_cache():
+
+    return {
+        "lock": threading.Lock(),
+        "indexes": {}
+    }
+
+
+def cached_index(name, df, columns, build):
+
+    # Reconstruit seulement quand la feuille a été relue
+    # (transforms.frame_version) : une réexécution ne repasse
+    # pas sur toute la table pour trouver l'index en cache.
+    columns = [
+        column
+        for column in columns
+        if column in df.columns
+    ]
+
+    version = frame_version(df, columns)
+
+    cache = get_search_cache()
+
+    with cache["lock"]:
+
+        cached = cache["indexes"].get(name)
+
+        if cached is None or cached[0] != version:
+
+            cached = (version, build(df))
+
+            cache["indexes"][name] = cached
+
+        return cached[1]
+
+
+def pos_index(df_pos):
+
+    return cached_index(
+        "pos",
+        df_pos,
+        [
+            column
+            for names in SEARCH_COLUMNS
+            for column in names
+        ],
+        PosIndex
+    )
+
+
+# =========================================================
+# CODES PRODUITS
+# =========================================================
+
+# Code-barres (EAN) ou code interne -> niveaux de la cascade
+# produit : un code saisi ou scanné remplit les cinq listes
+# d'un coup (ui.product_cascade).
+
+def product_code_index(df_products):
+
+    return cached_index(
+        "product_codes",
+        df_products,
+        CODE_COLUMNS + PRODUCT_LEVELS,
+        product_codes
+    )
+
+
+def find_product(df_products, code):
+
+    # Niveaux du produit, ou None si le code est inconnu.
+    return product_code_index(df_products).get(
+        normalize_code(code)
+    )
@@ -0,0 +1,600 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from data_info.schema import (
+    ACTIONS_MATERIEL,
+    ETATS_MATERIEL,
+    RESULTATS_VISITE,
+    SHEET_COLUMNS,
+    SHEET_DISTRIBUTION,
+    SHEET_MATERIAL_CONTROL,
+    SHEET_MATERIAL_POS,
+    SHEET_MATERIAL_TYPES,
+    SHEET_OBJECTIVES,
+    SHEET_POS,
+    SHEET_PRICES,
+    SHEET_PRODUCTS,
+    SHEET_PROFILE,
+    SHEET_SURVEY_SUBJECTS,
+    SHEET_SURVEYS,
+    SHEET_USERS,
+    SHEET_VISITS,
+    TYPES_OBJECTIF
+)
+from data_info.transforms import PRODUCT_LEVELS
+
+
+# =========================================================
+# DONNEES SYNTHETIQUES
+# =========================================================
+
+# Jeu de données déterministe (même seed = mêmes tables)
+# pour les 13 feuilles. "rows" est la taille des tables de
+# faits (distribution, prix, enquêtes) ; les référentiels
+# suivent avec des cardinalités proches de la production.
+
+N_BRANDS = 40
+
+N_USERS = 50
+
+# Préfixe GS1 Algérie des codes EAN générés.
+EAN_PREFIX = 613
+
+WILAYAS = [
+    "Alger",
+    "Oran",
+    "Constantine",
+    "Annaba",
+    "Blida",
+    "Sétif",
+    "Batna",
+    "Tlemcen",
+    "Béjaïa",
+    "Tizi Ouzou",
+    "Djelfa",
+    "Biskra",
+    "Chlef",
+    "Médéa",
+    "Mostaganem",
+    "Boumerdès",
+    "Skikda",
+    "Ouargla",
+    "Ghardaïa",
+    "Tiaret"
+]
+
+CATEGORIES = {
+    "Réfrigérateur": ["Combiné", "Double porte", "Table top"],
+    "Congélateur": ["Coffre", "Armoire"],
+    "Climatiseur": ["Split", "Mobile", "Cassette"],
+    "Téléviseur": ["LED", "Smart TV", "QLED"],
+    "Machine à laver": ["Frontale", "Top", "Semi-automatique"],
+    "Cuisinière": ["4 feux", "5 feux", "Encastrable"],
+    "Micro-ondes": ["Solo", "Grill"],
+    "Chauffe-eau": ["Gaz", "Électrique"],
+    "Radiateur": ["Gaz", "Bain d'huile"],
+    "Aspirateur": ["Traîneau", "Balai"],
+    "Petit électroménager": ["Mixeur", "Bouilloire", "Fer à repasser"],
+    "Lave-vaisselle": ["Pose libre", "Encastrable"]
+}
+
+CAPACITIES = [
+    "120L",
+    "250L",
+    "350L",
+    "450L",
+    "9000 BTU",
+    "12000 BTU",
+    "18000 BTU",
+    "32 pouces",
+    "43 pouces",
+    "55 pouces",
+    "7 kg",
+    "9 kg",
+    "60 cm",
+    "90 cm",
+    "20L",
+    "30L"
+]
+
+MATERIAL_TYPES = [
+    ("Tinda", "Signalétique"),
+    ("Logo", "Signalétique"),
+    ("Enseigne lumineuse", "Signalétique"),
+    ("Présentoir", "Mobilier"),
+    ("Rack", "Mobilier"),
+    ("Vitrine", "Mobilier"),
+    ("Comptoir", "Mobilier"),
+    ("Poster", "Affichage"),
+    ("Kakémono", "Affichage"),
+    ("Stop rayon", "Affichage"),
+    ("Écran", "Digital"),
+    ("Totem", "Digital")
+]
+
+
+def day_strings(rng, n, start="2024-01-01", days=730):
+
+    offsets = rng.integers(
+        0,
+        days,
+        size=n
+    )
+
+    return (
+        np.datetime64(start)
+        + offsets.astype("timedelta64[D]")
+    ).astype(str)
+
+
+def ids(prefix, n):
+
+    return [
+        f"{prefix}-{i:07d}"
+        for i in range(1, n + 1)
+    ]
+
+
+def pick(rng, values, n):
+
+    values = np.asarray(values, dtype=object)
+
+    return values[
+        rng.integers(
+            0,
+            len(values),
+            size=n
+        )
+    ]
+
+
+def ean13(number):
+
+    # 12 chiffres + clé de contrôle GS1.
+    digits = f"{number:012d}"
+
+    total = sum(
+        int(digit) * (3 if i % 2 else 1)
+        for i, digit in enumerate(digits)
+    )
+
+    return digits + str(-total % 10)
+
+
+def make_products(rng):
+
+    brands = [
+        f"Marque {i:02d}"
+        for i in range(1, N_BRANDS + 1)
+    ]
+
+    rows = []
+
+    for brand in brands:
+
+        # Chaque marque couvre une partie des catégories.
+        n_categories = int(rng.integers(3, 8))
+
+        categories = rng.choice(
+            list(CATEGORIES),
+            size=n_categories,
+            replace=False
+        )
+
+        for categorie in categories:
+
+            for famille in CATEGORIES[categorie]:
+
+                for k in range(int(rng.integers(1, 5))):
+
+                    produit = (
+                        f"{brand.split()[-1]}-"
+                        f"{categorie[:3].upper()}-"
+                        f"{famille[:3].upper()}{k + 1}"
+                    )
+
+                    for capacite in rng.choice(
+                        CAPACITIES,
+                        size=int(rng.integers(1, 4)),
+                        replace=False
+                    ):
+
+                        rows.append(
+                            (
+                                brand,
+                                categorie,
+                                famille,
+                                produit,
+                                capacite
+                            )
+                        )
+
+    products = pd.DataFrame(
+        rows,
+        columns=PRODUCT_LEVELS
+    )
+
+    products["Code_EAN"] = [
+        ean13(EAN_PREFIX * 10 ** 9 + i)
+        for i in range(1, len(products) + 1)
+    ]
+
+    products["ID_Produit"] = ids("PRD", len(products))
+
+    return products[SHEET_COLUMNS[SHEET_PRODUCTS]]
+
+
+def make_pos(rng, n):
+
+    wilaya = pick(rng, WILAYAS, n)
+
+    commune_number = rng.integers(1, 16, size=n)
+
+    return pd.DataFrame(
+        {
+            "ID_POS": ids("POS", n),
+            "Nom_POS": [
+                f"Magasin {i}"
+                for i in range(1, n + 1)
+            ],
+            "Wilaya": wilaya,
+            "Commune": [
+                f"{w} {c:02d}"
+                for w, c in zip(wilaya, commune_number)
+            ],
+            "Adresse": [
+                f"{i} rue du marché"
+                for i in rng.integers(1, 300, size=n)
+            ],
+            "Telephone": [
+                f"0{p}{x:08d}"
+                for p, x in zip(
+                    pick(rng, ["5", "6", "7"], n),
+                    rng.integers(0, 10 ** 8, size=n)
+                )
+            ],
+            "Email": "",
+            "Statut": np.where(
+                rng.random(n) < 0.95,
+                "Actif",
+                "Inactif"
+            ),
+            "Date_Creation": day_strings(rng, n, "2022-01-01")
+        }
+    )
+
+
+def make_fact_keys(rng, n, pos_ids, products):
+
+    product_index = rng.integers(
+        0,
+        len(products),
+        size=n
+    )
+
+    keys = products.iloc[product_index].reset_index(drop=True)
+
+    keys.insert(
+        0,
+        "ID_POS",
+        pick(rng, pos_ids, n)
+    )
+
+    return keys, product_index
+
+
+def generate_tables(rows=1000, seed=42):
+
+    rng = np.random.default_rng(seed)
+
+    n_pos = int(min(max(rows // 20, 200), 50_000))
+
+    products = make_products(rng)
+
+    pos = make_pos(rng, n_pos)
+
+    pos_ids = pos["ID_POS"].to_numpy(dtype=object)
+
+    user_ids = ids("USR", N_USERS)
+
+    # Prix de référence par produit : les relevés s'en écartent
+    # de quelques %, avec de rares erreurs de saisie (x10).
+    base_price = np.round(
+        rng.lognormal(10.5, 0.7, size=len(products)),
+        -2
+    )
+
+    tables = {}
+
+    tables[SHEET_USERS] = pd.DataFrame(
+        {
+            "ID_User": user_ids,
+            "Nom": [
+                f"Agent {i:02d}"
+                for i in range(1, N_USERS + 1)
+            ],
+            "Email": [
+                f"agent{i:02d}@example.com"
+                for i in range(1, N_USERS + 1)
+            ],
+            "Password": "demo",
+            "Role": np.where(
+                np.arange(N_USERS) < 3,
+                "admin",
+                "enqueteur"
+            ),
+            "Statut": "Actif"
+        }
+    )
+
+    tables[SHEET_POS] = pos
+
+    tables[SHEET_PRODUCTS] = products
+
+    # -----------------------------------------------------
+    # DISTRIBUTION
+    # -----------------------------------------------------
+
+    keys, _ = make_fact_keys(rng, rows, pos_ids, products)
+
+    tables[SHEET_DISTRIBUTION] = pd.DataFrame(
+        {
+            "ID_Distribution": ids("DIS", rows),
+            "Date_Visite": day_strings(rng, rows),
+            **keys,
+            "Quantite": rng.poisson(4, size=rows),
+            "ID_User": pick(rng, user_ids, rows),
+            "Remarque": "",
+            # Lignes historiques : libellés en clair, à coder
+            # par data_info.cli product-ids.
+            "ID_Produit": ""
+        }
+    )[SHEET_COLUMNS[SHEET_DISTRIBUTION]]
+
+    # -----------------------------------------------------
+    # PRIX
+    # -----------------------------------------------------
+
+    keys, product_index = make_fact_keys(rng, rows, pos_ids, products)
+
+    price = base_price[product_index] * rng.normal(1, 0.06, size=rows)
+
+    typo = rng.random(rows) < 0.005
+
+    price[typo] = price[typo] * 10
+
+    promo = rng.random(rows) < 0.1
+
+    tables[SHEET_PRICES] = pd.DataFrame(
+        {
+            "ID_Releve": ids("PRX", rows),
+            "Date_Releve": day_strings(rng, rows),
+            **keys,
+            "Prix_Vente": np.round(price, -1),
+            "Prix_Promo": np.where(
+                promo,
+                np.round(price * 0.9, -1),
+                0
+            ),
+            "Promotion": promo,
+            "Remarque": "",
+            "ID_User": pick(rng, user_ids, rows),
+            "ID_Produit": ""
+        }
+    )[SHEET_COLUMNS[SHEET_PRICES]]
+
+    # -----------------------------------------------------
+    # ENQUETES
+    # -----------------------------------------------------
+
+    subjects = [
+        f"Enquête {i:02d}"
+        for i in range(1, 11)
+    ]
+
+    tables[SHEET_SURVEY_SUBJECTS] = pd.DataFrame(
+        {
+            "ID_Sujet": ids("SUJ", len(subjects)),
+            "Nom_Enquete": subjects,
+            "Statut": "Actif"
+        }
+    )
+
+    keys, product_index = make_fact_keys(rng, rows, pos_ids, products)
+
+    brands = products["Marque"].unique()
+
+    tables[SHEET_SURVEYS] = pd.DataFrame(
+        {
+            "ID_Enquete": ids("ENQ", rows),
+            "Date": day_strings(rng, rows),
+            "Sujet": pick(rng, subjects, rows),
+            "ID_POS": keys["ID_POS"],
+            "Marques_Exposees": [
+                ", ".join(x)
+                for x in zip(
+                    pick(rng, brands, rows),
+                    pick(rng, brands, rows)
+                )
+            ],
+            **keys.drop(columns=["ID_POS"]),
+            "Prix": np.round(
+                base_price[product_index]
+                * rng.normal(1, 0.06, size=rows),
+                -1
+            ),
+            "Stock_Disponible": rng.random(rows) < 0.85,
+            "Promotion": rng.random(rows) < 0.1,
+            "Frequence_Vente_Jour": rng.poisson(2, size=rows),
+            "Remarque": "",
+            "ID_User": pick(rng, user_ids, rows)
+        }
+    )[SHEET_COLUMNS[SHEET_SURVEYS]]
+
+    # -----------------------------------------------------
+    # PROFILS (plusieurs révisions par POS)
+    # -----------------------------------------------------
+
+    n_profiles = int(n_pos * 1.5)
+
+    tables[SHEET_PROFILE] = pd.DataFrame(
+        {
+            "ID_Profil": ids("PRF", n_profiles),
+            "ID_POS": pick(rng, pos_ids, n_profiles),
+            "Date": day_strings(rng, n_profiles),
+            "Date_Mise_A_Jour": day_strings(rng, n_profiles),
+            "Nom_Proprietaire": [
+                f"Propriétaire {i}"
+                for i in rng.integers(1, n_pos, size=n_profiles)
+            ],
+            "Contact_Proprietaire": "",
+            "Nom_Facade": "",
+            "Nom_Acheteur": "",
+            "Contact_Acheteur": "",
+            "Surface_Magasin": rng.integers(20, 800, size=n_profiles),
+            "Surface_Exposition": rng.integers(10, 400, size=n_profiles),
+            "Nombre_Vitrines": rng.integers(0, 6, size=n_profiles),
+            "Nombre_Travailleurs": rng.integers(1, 20, size=n_profiles),
+            "Presence_Digitale": rng.random(n_profiles) < 0.4,
+            "CA_2025": np.round(
+                rng.lognormal(15, 1, size=n_profiles),
+                -3
+            ),
+            "Observation": "",
+            "ID_User": pick(rng, user_ids, n_profiles)
+        }
+    )
+
+    # -----------------------------------------------------
+    # VISITES / OBJECTIFS
+    # -----------------------------------------------------
+
+    n_visits = max(rows // 2, 1)
+
+    tables[SHEET_VISITS] = pd.DataFrame(
+        {
+            "ID_Visite": ids("VIS", n_visits),
+            "Date_Visite": day_strings(rng, n_visits),
+            "ID_POS": pick(rng, pos_ids, n_visits),
+            "Motif": "Visite de routine",
+            "Resultat": pick(rng, RESULTATS_VISITE, n_visits),
+            "Observation": "",
+            "ID_User": pick(rng, user_ids, n_visits)
+        }
+    )
+
+    tables[SHEET_OBJECTIVES] = pd.DataFrame(
+        {
+            "ID_Objectif": ids("OBJ", n_pos),
+            "Date": day_strings(rng, n_pos),
+            "Annee": rng.integers(2024, 2027, size=n_pos),
+            "ID_POS": pos_ids,
+            "Type_Objectif": pick(rng, TYPES_OBJECTIF, n_pos),
+            "Objectif": rng.integers(1, 100, size=n_pos) * 1000,
+            "Commentaire": "",
+            "ID_User": pick(rng, user_ids, n_pos)
+        }
+    )
+
+    # -----------------------------------------------------
+    # MATERIEL
+    # -----------------------------------------------------
+
+    types = pd.DataFrame(
+        {
+            "ID_Type_Materiel": ids("TYP", len(MATERIAL_TYPES)),
+            "Type_Materiel": [x[0] for x in MATERIAL_TYPES],
+            "Categorie_Materiel": [x[1] for x in MATERIAL_TYPES]
+        }
+    )
+
+    tables[SHEET_MATERIAL_TYPES] = types
+
+    n_materials = n_pos * 2
+
+    type_index = rng.integers(0, len(types), size=n_materials)
+
+    material_ids = ids("MAT", n_materials)
+
+    material_pos = pick(rng, pos_ids, n_materials)
+
+    tables[SHEET_MATERIAL_POS] = pd.DataFrame(
+        {
+            "ID_Materiel": material_ids,
+            "Date_Installation": day_strings(rng, n_materials, "2023-01-01"),
+            "ID_POS": material_pos,
+            "ID_Type_Materiel": types["ID_Type_Materiel"].to_numpy()[type_index],
+            "Type_Materiel": types["Type_Materiel"].to_numpy()[type_index],
+            "Categorie_Materiel": types["Categorie_Materiel"].to_numpy()[type_index],
+            "Marque_Materiel": pick(rng, brands, n_materials),
+            "Reference_Materiel": "",
+            "Quantite": rng.integers(1, 4, size=n_materials),
+            "Etat": pick(rng, ETATS_MATERIEL, n_materials),
+            "Fonctionnel": rng.random(n_materials) < 0.9,
+            "Emplacement": "",
+            "Photo": "",
+            "Observation": "",
+            "ID_User": pick(rng, user_ids, n_materials)
+        }
+    )
+
+    n_controls = max(rows // 4, 1)
+
+    control_index = rng.integers(0, n_materials, size=n_controls)
+
+    tables[SHEET_MATERIAL_CONTROL] = pd.DataFrame(
+        {
+            "ID_Controle": ids("CTL", n_controls),
+            "Date_Controle": day_strings(rng, n_controls),
+            "ID_POS": material_pos[control_index],
+            "ID_Materiel": np.asarray(material_ids, dtype=object)[control_index],
+            "Etat": pick(rng, ETATS_MATERIEL, n_controls),
+            "Fonctionnel": rng.random(n_controls) < 0.85,
+            "Conforme_Marque": rng.random(n_controls) < 0.7,
+            "Produit_Marque_Presente": rng.random(n_controls) < 0.7,
+            "Photo": "",
+            "Observation": "",
+            "Action_Necessaire": pick(rng, ACTIONS_MATERIEL, n_controls),
+            "ID_User": pick(rng, user_ids, n_controls)
+        }
+    )
+
+    return {
+        name: tables[name][SHEET_COLUMNS[name]]
+        for name in SHEET_COLUMNS
+    }
+
+
+# =========================================================
+# LIGNE DE COMMANDE
+# =========================================================
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(
+        description="Génère un jeu de données synthétique en CSV."
+    )
+
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default="synthetic_data")
+
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.out, exist_ok=True)
+
+    for name, df in generate_tables(args.rows, args.seed).items():
+
+        df.to_csv(
+            os.path.join(args.out, f"{name}.csv"),
+            index=False
+        )
+
+        print(f"{name}: {len(df)} lignes")
+
+
+if __name__ == "__main__":
+    main()
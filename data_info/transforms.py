@@ -0,0 +1,868 @@
+import pandas as pd
+
+from data_info.schema import PLACEHOLDER
+
+
+# =========================================================
+# OUTILS
+# =========================================================
+
+def clean_text(value):
+
+    if pd.isna(value):
+        return ""
+
+    return str(value).strip()
+
+
+def selection(value):
+
+    if value == PLACEHOLDER:
+        return ""
+
+    return value
+
+
+# Cases à cocher saisies dans un fichier ou une feuille
+# (Oui / Non, TRUE / FALSE…), en minuscules.
+TRUE_VALUES = {"oui", "true", "vrai", "1", "yes", "x"}
+
+FALSE_VALUES = {"non", "false", "faux", "0", "no"}
+
+
+def parse_booleans(values):
+
+    # Série texte -> (booléens, valeurs non reconnues). Une
+    # cellule vide vaut Non.
+    lowered = values.str.lower()
+
+    return (
+        lowered.isin(TRUE_VALUES),
+        ~lowered.isin(TRUE_VALUES | FALSE_VALUES) & lowered.ne("")
+    )
+
+
+# Dates saisies dans l'application (ISO) ou importées d'un
+# fichier papier / Excel (JJ/MM/AAAA…).
+DATE_FORMATS = [
+    "%Y-%m-%d",
+    "%d/%m/%Y",
+    "%d-%m-%Y",
+    "%d/%m/%y",
+    "%Y-%m-%d %H:%M:%S"
+]
+
+
+def iso_dates(values):
+
+    # Série texte -> dates AAAA-MM-JJ (NaN si illisible).
+    # Valeurs distinctes seulement, formats explicites tour à
+    # tour (pas d'analyse libre, lente et ambiguë).
+    unique = pd.Series(values[values.ne("")].unique())
+
+    parsed = pd.Series(pd.NaT, index=unique.index)
+
+    for fmt in DATE_FORMATS:
+
+        todo = parsed.isna()
+
+        if not todo.any():
+            break
+
+        parsed[todo] = pd.to_datetime(
+            unique[todo],
+            format=fmt,
+            errors="coerce"
+        )
+
+    return values.map(
+        dict(
+            zip(
+                unique,
+                parsed.dt.strftime("%Y-%m-%d")
+            )
+        )
+    )
+
+
+def unique_sorted(df, column):
+
+    if df is None:
+        return []
+
+    if df.empty:
+        return []
+
+    if column not in df.columns:
+        return []
+
+    values = (
+        df[column]
+        .dropna()
+        .astype(str)
+        .str.strip()
+    )
+
+    values = [
+        x
+        for x in values.unique().tolist()
+        if x
+    ]
+
+    return sorted(values)
+
+
+# Copie d'une feuille lue par core.fetch_sheet_if_changed :
+# df.attrs[SHEET_VERSION] = (feuille, version Drive, heure de
+# lecture). Gardé par st.cache_data (pickle) et par les
+# filtres pandas ; sert de clé aux caches dérivés.
+SHEET_VERSION = "sheet_version"
+
+
+def frame_version(df, columns):
+
+    # Clé de cache des colonnes `columns` de df : la version de
+    # la feuille, sans lire les données ; à défaut (DataFrame
+    # construit ailleurs), un hash du contenu.
+    columns = [
+        column
+        for column in columns
+        if column in df.columns
+    ]
+
+    stamp = df.attrs.get(SHEET_VERSION)
+
+    if stamp is not None:
+        return (stamp, len(df), tuple(columns))
+
+    return (
+        tuple(columns),
+        int(pd.util.hash_pandas_object(df[columns], index=False).sum())
+        if columns and not df.empty
+        else 0
+    )
+
+
+def columns_to_frame(columns):
+
+    if not columns:
+        return pd.DataFrame()
+
+    headers = [
+        str(column[0]).strip()
+        if column
+        else ""
+        for column in columns
+    ]
+
+    n_rows = max(
+        len(column)
+        for column in columns
+    ) - 1
+
+    data = {}
+
+    for position, column in enumerate(columns):
+
+        if not headers[position]:
+            continue
+
+        values = column[1:]
+
+        # L'API tronque les cellules vides en fin de colonne.
+        if len(values) < n_rows:
+            values = values + [""] * (n_rows - len(values))
+
+        data[position] = values
+
+    df = pd.DataFrame(data)
+
+    df.columns = [
+        headers[position]
+        for position in data
+    ]
+
+    return df
+
+
+def frame_to_columns(df):
+
+    # Inverse de columns_to_frame : forme d'une réponse
+    # values.get en majorDimension=COLUMNS.
+
+    return [
+        [column]
+        + df[column].tolist()
+        for column in df.columns
+    ]
+
+
+# =========================================================
+# PRODUITS
+# =========================================================
+
+def filter_products(
+    products,
+    marque="",
+    categorie="",
+    famille="",
+    produit=""
+):
+
+    if products is None:
+        return pd.DataFrame()
+
+    if products.empty:
+        return products
+
+    result = products.copy()
+
+    if marque and "Marque" in result.columns:
+
+        result = result[
+            result["Marque"]
+            .astype(str)
+            .str.strip()
+            == marque.strip()
+        ]
+
+    if categorie and "Catégorie" in result.columns:
+
+        result = result[
+            result["Catégorie"]
+            .astype(str)
+            .str.strip()
+            == categorie.strip()
+        ]
+
+    if famille and "Famille" in result.columns:
+
+        result = result[
+            result["Famille"]
+            .astype(str)
+            .str.strip()
+            == famille.strip()
+        ]
+
+    if produit and "Produit" in result.columns:
+
+        result = result[
+            result["Produit"]
+            .astype(str)
+            .str.strip()
+            == produit.strip()
+        ]
+
+    return result
+
+
+def cascade_options(
+    df_products,
+    column,
+    marque="",
+    categorie="",
+    famille="",
+    produit=""
+):
+
+    return unique_sorted(
+        filter_products(
+            df_products,
+            marque=selection(marque),
+            categorie=selection(categorie),
+            famille=selection(famille),
+            produit=selection(produit)
+        ),
+        column
+    )
+
+
+GRID_COLUMNS = [
+    "Famille",
+    "Produit",
+    "Capacité_Dimension"
+]
+
+
+def grid_products(
+    df_products,
+    marque,
+    categorie,
+    famille=""
+):
+
+    # Une ligne par produit de la marque et de la catégorie,
+    # pour la saisie en grille.
+
+    products = filter_products(
+        df_products,
+        marque=selection(marque),
+        categorie=selection(categorie),
+        famille=selection(famille)
+    )
+
+    columns = [
+        column
+        for column in GRID_COLUMNS
+        if column in products.columns
+    ]
+
+    if products.empty or not columns:
+        return pd.DataFrame(columns=GRID_COLUMNS)
+
+    return (
+        products[columns]
+        .astype(str)
+        .apply(lambda column: column.str.strip())
+        .reindex(columns=GRID_COLUMNS, fill_value="")
+        .drop_duplicates()
+        .sort_values(GRID_COLUMNS)
+        .reset_index(drop=True)
+    )
+
+
+# Niveaux de la cascade, dans l'ordre de product_cascade.
+PRODUCT_LEVELS = [
+    "Marque",
+    "Catégorie",
+    "Famille",
+    "Produit",
+    "Capacité_Dimension"
+]
+
+# Colonne facultative de Produits : EAN lu au scanner ou
+# code interne.
+CODE_COLUMNS = [
+    "Code_EAN",
+    "EAN",
+    "Code_Barre",
+    "SKU"
+]
+
+
+def normalize_code(value):
+
+    # Sans espaces ni casse ; un code numérique perd ses zéros
+    # de tête (UPC-A / EAN-13, cellule lue comme nombre).
+    code = "".join(
+        clean_text(value).split()
+    ).upper()
+
+    if code.isdigit():
+        code = code.lstrip("0") or "0"
+
+    return code
+
+
+def product_codes(df_products):
+
+    # {code normalisé: (Marque, Catégorie, Famille, Produit,
+    # Capacité_Dimension)}. Un code porté par deux produits
+    # différents est écarté : il ne désigne rien.
+    if df_products is None or df_products.empty:
+        return {}
+
+    codes = text_column(
+        df_products,
+        *CODE_COLUMNS
+    ).map(normalize_code).tolist()
+
+    levels = list(
+        zip(
+            *(
+                text_column(df_products, column).tolist()
+                for column in PRODUCT_LEVELS
+            )
+        )
+    )
+
+    index = {}
+    ambiguous = set()
+
+    for code, hierarchy in zip(codes, levels):
+
+        if not code:
+            continue
+
+        if index.setdefault(code, hierarchy) != hierarchy:
+            ambiguous.add(code)
+
+    for code in ambiguous:
+        del index[code]
+
+    return index
+
+
+# =========================================================
+# MATERIEL
+# =========================================================
+
+def brand_present(df_distribution, pos, brand):
+
+    if (
+        df_distribution is None
+        or df_distribution.empty
+        or "Marque" not in df_distribution.columns
+        or "ID_POS" not in df_distribution.columns
+    ):
+        return False
+
+    d = df_distribution[
+        df_distribution[
+            "ID_POS"
+        ]
+        .astype(str)
+        .str.strip()
+        == pos
+    ]
+
+    brands = set(
+        d["Marque"]
+        .astype(str)
+        .str.strip()
+        .str.lower()
+    )
+
+    return brand.lower() in brands
+
+
+def brand_presence(df_distribution):
+
+    # {ID_POS: {marque en minuscules: dernière quantité}},
+    # construit d'un bloc ; les lignes suivent l'ordre de
+    # saisie, la dernière quantité l'emporte.
+    if (
+        df_distribution is None
+        or df_distribution.empty
+        or "Marque" not in df_distribution.columns
+        or "ID_POS" not in df_distribution.columns
+    ):
+        return {}
+
+    column = quantity_column(df_distribution)
+
+    frame = pd.DataFrame(
+        {
+            "pos": df_distribution["ID_POS"].astype(str).str.strip(),
+            "brand": df_distribution["Marque"].astype(str).str.strip().str.lower(),
+            "quantity": pd.to_numeric(
+                df_distribution[column],
+                errors="coerce"
+            )
+            if column
+            else float("nan")
+        }
+    )
+
+    frame = frame[
+        frame["pos"].ne("")
+        & frame["brand"].ne("")
+    ].drop_duplicates(
+        ["pos", "brand"],
+        keep="last"
+    )
+
+    # Quantité absente : None. tolist() avant la boucle :
+    # itérer une colonne texte pandas est bien plus lent.
+    quantities = frame["quantity"].astype(object).where(
+        frame["quantity"].notna(),
+        None
+    )
+
+    index = {}
+
+    for pos, brand, quantity in zip(
+        frame["pos"].tolist(),
+        frame["brand"].tolist(),
+        quantities.tolist()
+    ):
+        index.setdefault(pos, {})[brand] = quantity
+
+    return index
+
+
+def text_column(df, *candidates):
+
+    # Première colonne présente, nettoyée ; "" sinon.
+    column = first_column(df, list(candidates))
+
+    if column is None:
+        return pd.Series("", index=df.index)
+
+    return df[column].fillna("").astype(str).str.strip()
+
+
+def pos_wilayas(df_pos):
+
+    # Series ID_POS -> Wilaya (dernière ligne du POS).
+    if (
+        df_pos is None
+        or df_pos.empty
+        or "ID_POS" not in df_pos.columns
+        or "Wilaya" not in df_pos.columns
+    ):
+        return pd.Series(dtype=object)
+
+    return pd.Series(
+        text_column(df_pos, "Wilaya").tolist(),
+        index=text_column(df_pos, "ID_POS").tolist()
+    ).groupby(level=0).last()
+
+
+def material_keys(df_material_pos, first_line=2):
+
+    # ID_Materiel (ou ID), sinon numéro de ligne dans la
+    # feuille : une clé unique par matériel.
+    ids = text_column(
+        df_material_pos,
+        "ID_Materiel",
+        "ID"
+    )
+
+    lines = pd.Series(
+        range(first_line, first_line + len(df_material_pos)),
+        index=df_material_pos.index
+    ).astype(str)
+
+    return ids.where(
+        ids.ne(""),
+        "ligne " + lines
+    )
+
+
+def material_entries(df_material_pos, first_line=2):
+
+    # {ID_POS: {clé: {"label", "row"}}}, libellés construits
+    # colonne par colonne ; un même ID_Materiel réenregistré
+    # remplace le précédent.
+    if (
+        df_material_pos is None
+        or df_material_pos.empty
+        or "ID_POS" not in df_material_pos.columns
+    ):
+        return {}
+
+    keys = material_keys(
+        df_material_pos,
+        first_line
+    )
+
+    labels = (
+        text_column(df_material_pos, "Type_Materiel")
+        + " | "
+        + text_column(df_material_pos, "Marque_Materiel")
+        + " | "
+        + keys
+    )
+
+    entries = {}
+
+    for pos, key, label, row in zip(
+        df_material_pos["ID_POS"].astype(str).str.strip().tolist(),
+        keys.tolist(),
+        labels.tolist(),
+        df_material_pos.to_dict("records")
+    ):
+        entries.setdefault(pos, {})[key] = {
+            "label": label,
+            "row": row
+        }
+
+    return entries
+
+
+def control_summary(df_control):
+
+    # {ID_Materiel: {"last": dernier contrôle, "controls":
+    # ensemble des ID_Controle}} : un contrôle compté deux fois
+    # (écriture puis rechargement) ne l'est qu'une fois.
+    if (
+        df_control is None
+        or df_control.empty
+        or "ID_Materiel" not in df_control.columns
+    ):
+        return {}
+
+    ids = df_control["ID_Materiel"].astype(str).str.strip()
+
+    control_ids = text_column(
+        df_control,
+        "ID_Controle",
+        "ID"
+    )
+
+    controls = control_ids[ids.ne("")].groupby(
+        ids[ids.ne("")],
+        sort=False
+    ).agg(set).to_dict()
+
+    return {
+        key: {
+            "last": record,
+            "controls": controls[key]
+        }
+        for key, record in latest_records(
+            df_control,
+            "ID_Materiel"
+        ).items()
+    }
+
+
+def latest_records(df, key_column):
+
+    # {clé: dernière ligne (dict)}, sans boucle sur les lignes.
+    keys = df[key_column].astype(str).str.strip()
+
+    latest = df[keys.ne("")].assign(
+        _key=keys
+    ).drop_duplicates(
+        "_key",
+        keep="last"
+    )
+
+    return dict(
+        zip(
+            latest["_key"],
+            latest.drop(columns="_key").to_dict("records")
+        )
+    )
+
+
+def price_groups(df_prices):
+
+    # {(Marque, …, Capacité_Dimension): (ID_POS, prix)} :
+    # tableaux numpy des prix > 0 relevés pour chaque produit.
+    if df_prices is None or df_prices.empty:
+        return {}
+
+    column = price_column(df_prices)
+
+    if column is None:
+        return {}
+
+    prices = pd.to_numeric(
+        df_prices[column],
+        errors="coerce"
+    ).to_numpy(dtype=float)
+
+    valid = prices > 0
+
+    keys = pd.DataFrame(
+        {
+            level: text_column(df_prices, level).to_numpy(dtype=object)[valid]
+            for level in PRODUCT_LEVELS
+        }
+    )
+
+    pos = text_column(df_prices, "ID_POS").to_numpy(dtype=object)[valid]
+
+    prices = prices[valid]
+
+    return {
+        key: (pos[rows], prices[rows])
+        for key, rows in keys.groupby(
+            PRODUCT_LEVELS,
+            sort=False
+        ).indices.items()
+    }
+
+
+def last_readings(df, date_column, value_columns):
+
+    # {(ID_POS, Marque, …, Capacité_Dimension): (date, {colonne:
+    # valeur})} : relevé le plus récent du produit dans le POS,
+    # réduit à value_columns. Dates ramenées en AAAA-MM-JJ
+    # (historiques importés en JJ/MM/AAAA) avant le tri ; une
+    # date illisible passe avant les autres et reste telle
+    # quelle. À date égale, la dernière ligne l'emporte.
+    if df is None or df.empty or "ID_POS" not in df.columns:
+        return {}
+
+    key_columns = ["ID_POS"] + PRODUCT_LEVELS
+
+    keys = pd.DataFrame(
+        {
+            column: text_column(df, column)
+            for column in key_columns
+        }
+    )
+
+    dates = text_column(df, date_column)
+
+    keys["_order"] = iso_dates(dates).fillna("")
+
+    keys["_date"] = keys["_order"].where(
+        keys["_order"].ne(""),
+        dates
+    )
+
+    latest = keys[
+        keys["ID_POS"].ne("")
+    ].sort_values(
+        "_order",
+        kind="stable"
+    ).drop_duplicates(
+        key_columns,
+        keep="last"
+    )
+
+    columns = [
+        column
+        for column in value_columns
+        if column in df.columns
+    ]
+
+    values = df.loc[latest.index, columns]
+
+    # to_numpy(object) : itérer une colonne texte Arrow valeur
+    # par valeur est bien plus lent.
+    records = [
+        dict(zip(columns, row))
+        for row in values.to_numpy(dtype=object).tolist()
+    ]
+
+    return dict(
+        zip(
+            map(
+                tuple,
+                latest[key_columns].to_numpy(dtype=object).tolist()
+            ),
+            zip(
+                latest["_date"].to_numpy(dtype=object).tolist(),
+                records
+            )
+        )
+    )
+
+
+# =========================================================
+# STATISTIQUES
+# =========================================================
+
+def first_column(df, candidates):
+
+    for column in candidates:
+
+        if column in df.columns:
+            return column
+
+    return None
+
+
+def quantity_column(df):
+
+    return first_column(
+        df,
+        [
+            "Quantite",
+            "Quantité"
+        ]
+    )
+
+
+def price_column(df):
+
+    return first_column(
+        df,
+        [
+            "Prix_Vente",
+            "Prix"
+        ]
+    )
+
+
+def frequency_column(df):
+
+    return first_column(
+        df,
+        [
+            "Frequence_Vente_Jour",
+            "Fréquence_Vente_Jour"
+        ]
+    )
+
+
+def sum_by(df, group_column, value_column):
+
+    values = pd.to_numeric(
+        df[value_column],
+        errors="coerce"
+    ).fillna(0)
+
+    return (
+        values
+        .groupby(df[group_column])
+        .sum()
+        .rename(value_column)
+        .sort_values(
+            ascending=False
+        )
+    )
+
+
+def mean_by(df, group_column, value_column):
+
+    values = pd.to_numeric(
+        df[value_column],
+        errors="coerce"
+    )
+
+    return (
+        values
+        .groupby(df[group_column])
+        .mean()
+        .rename(value_column)
+        .sort_values(
+            ascending=False
+        )
+    )
+
+
+def price_summary(df_prices, column):
+
+    price_df = pd.DataFrame(
+        {
+            "Marque": df_prices["Marque"],
+            column: pd.to_numeric(
+                df_prices[column],
+                errors="coerce"
+            )
+        }
+    )
+
+    return (
+        price_df
+        .groupby("Marque")
+        .agg(
+            Prix_Moyen=(
+                column,
+                "mean"
+            ),
+            Prix_Min=(
+                column,
+                "min"
+            ),
+            Prix_Max=(
+                column,
+                "max"
+            ),
+            Nb_Releves=(
+                column,
+                "count"
+            )
+        )
+        .reset_index()
+        .sort_values(
+            "Prix_Moyen",
+            ascending=False
+        )
+    )
+
+
+def value_counts(df, column):
+
+    return (
+        df[column]
+        .astype(str)
+        .value_counts()
+    )
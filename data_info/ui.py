@@ -0,0 +1,1168 @@
+import os
+import time
+from contextlib import contextmanager
+
+import gspread
+import pandas as pd
+import streamlit as st
+
+from data_info import catalog, core, photos, profiling
+from data_info.core import (
+    SPOOL_PATH,
+    SheetsUnavailable,
+    SpoolError,
+    error_status,
+    fetch_sheet_if_changed,
+    flush_spool,
+    get_breaker,
+    get_metrics,
+    get_spreadsheet_version,
+    is_missing_sheet,
+    setting,
+    spool_size
+)
+from data_info.schema import PLACEHOLDER
+from data_info.search import (
+    find_product,
+    pos_index,
+    product_code_index
+)
+from data_info.transforms import (
+    GRID_COLUMNS,
+    cascade_options,
+    grid_products
+)
+
+
+# =========================================================
+# COUCHE STREAMLIT
+# =========================================================
+
+# Adaptation de data_info.core à l'application : cache
+# st.cache_data de load_sheet, messages d'erreur, état du
+# service, cascade produits, session et profilage. Importé
+# par le routeur TSS.py et par les pages.
+
+
+def streamlit_secrets():
+
+    try:
+
+        return st.secrets.to_dict()
+
+    except FileNotFoundError:
+
+        return {}
+
+
+# =========================================================
+# CHARGEMENT DES DONNEES
+# =========================================================
+
+def load_sheet(sheet_name):
+
+    with profiling.section(
+        f"load_sheet {sheet_name}"
+    ) as info, get_metrics().measure(
+        "load_sheet",
+        sheet_name,
+        cache="hit"
+    ) as call:
+
+        df = cached_sheet(sheet_name)
+
+        call["cells"] = int(df.size)
+
+        info["cache"] = call["cache"]
+
+    return df
+
+
+@st.cache_data(
+    ttl=600,
+    show_spinner=False
+)
+def cached_sheet(sheet_name):
+
+    metrics = get_metrics()
+
+    # Exécuté seulement quand st.cache_data n'a pas le résultat.
+    metrics.annotate(
+        "load_sheet",
+        cache="miss"
+    )
+
+    try:
+
+        return fetch_sheet_if_changed(
+            sheet_name
+        )
+
+    except SheetsUnavailable as e:
+
+        metrics.annotate(
+            "load_sheet",
+            error=type(e).__name__
+        )
+
+        st.error(
+            f"❌ Google Sheets est indisponible et aucune "
+            f"copie locale de '{sheet_name}' n'existe encore."
+        )
+
+        return pd.DataFrame()
+
+    except gspread.exceptions.APIError as e:
+
+        metrics.annotate(
+            "load_sheet",
+            error=type(e).__name__
+        )
+
+        error_text = str(e)
+
+        status = error_status(e)
+
+        if status == 429:
+
+            st.error(
+                "❌ Quota Google Sheets dépassé.\n\n"
+                "La limite de lectures par minute a été atteinte.\n\n"
+                "Attendez quelques minutes avant de relancer."
+            )
+
+        elif is_missing_sheet(e):
+
+            st.error(
+                f"❌ La feuille Google Sheets '{sheet_name}' "
+                f"n'existe pas."
+            )
+
+        elif status == 403:
+
+            st.error(
+                "❌ Accès refusé au Google Sheet.\n\n"
+                "Vérifiez que le compte de service utilisé "
+                "dans st.secrets['google'] a accès au fichier."
+            )
+
+        elif status == 404:
+
+            st.error(
+                "❌ Google Sheet introuvable.\n\n"
+                "Vérifiez le SPREADSHEET_ID."
+            )
+
+        else:
+
+            st.error(
+                f"❌ Erreur Google Sheets : {error_text}"
+            )
+
+        return pd.DataFrame()
+
+    except Exception as e:
+
+        metrics.annotate(
+            "load_sheet",
+            error=type(e).__name__
+        )
+
+        st.error(
+            f"❌ Impossible de charger la feuille "
+            f"'{sheet_name}'.\n\n"
+            f"Détail : {e}"
+        )
+
+        return pd.DataFrame()
+
+
+def clear_cached_sheet(sheet_name=None):
+
+    try:
+
+        if sheet_name:
+            cached_sheet.clear(sheet_name)
+
+        else:
+            cached_sheet.clear()
+
+    except Exception:
+
+        cached_sheet.clear()
+
+
+core.set_secrets_provider(
+    streamlit_secrets
+)
+
+catalog.register()
+
+core.INVALIDATION_HOOKS.append(
+    clear_cached_sheet
+)
+
+core.RECOVERY_HOOKS.append(
+    cached_sheet.clear
+)
+
+
+# =========================================================
+# ECRITURE GOOGLE SHEETS
+# =========================================================
+
+def show_write_error(sheet_name, error):
+
+    if isinstance(error, SpoolError):
+
+        st.error(
+            f"❌ Google Sheets est indisponible et "
+            f"l'enregistrement local a échoué : {error}"
+        )
+
+    elif is_missing_sheet(error):
+
+        st.error(
+            f"❌ La feuille Google Sheets '{sheet_name}' "
+            f"n'existe pas."
+        )
+
+    elif isinstance(
+        error,
+        gspread.exceptions.APIError
+    ):
+
+        st.error(
+            f"❌ Erreur Google Sheets : {error}"
+        )
+
+    else:
+
+        st.error(
+            f"❌ Erreur lors de l'enregistrement : {error}"
+        )
+
+
+def show_write_result(result):
+
+    if result == core.SPOOLED:
+
+        st.info(
+            "💾 Google Sheets est momentanément indisponible : "
+            "l'enregistrement est conservé localement et sera "
+            "synchronisé automatiquement."
+        )
+
+    return True
+
+
+def append_row(sheet_name, row):
+
+    try:
+
+        result = core.append_row(
+            sheet_name,
+            row
+        )
+
+    except Exception as e:
+
+        show_write_error(
+            sheet_name,
+            e
+        )
+
+        return False
+
+    return show_write_result(result)
+
+
+def append_dict_row(sheet_name, values):
+
+    try:
+
+        result = core.append_dict_row(
+            sheet_name,
+            values
+        )
+
+    except Exception as e:
+
+        show_write_error(
+            sheet_name,
+            e
+        )
+
+        return False
+
+    return show_write_result(result)
+
+
+def append_rows(sheet_name, rows):
+
+    try:
+
+        result = core.append_rows(
+            sheet_name,
+            rows
+        )
+
+    except core.BatchWriteError as e:
+
+        st.warning(
+            f"⚠️ {e.sent} ligne(s) enregistrée(s) avant l'erreur."
+        )
+
+        show_write_error(
+            sheet_name,
+            e.error
+        )
+
+        return None
+
+    except Exception as e:
+
+        show_write_error(
+            sheet_name,
+            e
+        )
+
+        return None
+
+    if result[core.SPOOLED]:
+
+        show_write_result(
+            core.SPOOLED
+        )
+
+    return result
+
+
+# =========================================================
+# ETAT DU SERVICE
+# =========================================================
+
+@profiling.profiled("état Google Sheets")
+def show_backend_status():
+
+    breaker = get_breaker()
+
+    if not breaker.is_closed():
+
+        # Sonde "half-open" : n'appelle Google qu'une fois
+        # le délai BREAKER_RESET_TIMEOUT écoulé.
+        get_spreadsheet_version(force=True)
+
+    if breaker.is_closed():
+
+        # Pas de verrou ni de lecture de la file ici : seulement
+        # sa taille sur disque (flush_spool est limité dans le
+        # temps).
+        if (
+            os.path.exists(SPOOL_PATH)
+            and os.path.getsize(SPOOL_PATH)
+        ):
+
+            synced = flush_spool()
+
+            if synced:
+
+                st.success(
+                    f"✅ {synced} enregistrement(s) en attente "
+                    f"synchronisé(s) avec Google Sheets."
+                )
+
+        return
+
+    st.warning(
+        "⚠️ Google Sheets est momentanément indisponible.\n\n"
+        "Mode lecture seule : les données affichées sont les "
+        "dernières connues, et les nouveaux enregistrements "
+        f"sont conservés localement ({spool_size()} en attente)."
+    )
+
+
+# =========================================================
+# CASCADE PRODUITS
+# =========================================================
+
+# Clés des listes de product_cascade, dans l'ordre des
+# niveaux (transforms.PRODUCT_LEVELS).
+CASCADE_KEYS = [
+    "marque",
+    "categorie",
+    "famille",
+    "produit",
+    "capacite"
+]
+
+
+def apply_product_code(df_products, prefix):
+
+    # on_change du champ code : appelé avant la réexécution,
+    # les listes de la cascade peuvent donc encore être
+    # modifiées.
+    code = st.session_state.get(f"{prefix}_code", "")
+
+    if not code.strip():
+
+        st.session_state[f"{prefix}_code_status"] = None
+
+        return
+
+    levels = find_product(df_products, code)
+
+    if levels is None:
+
+        st.session_state[f"{prefix}_code_status"] = (
+            False,
+            f"Code « {code.strip()} » inconnu dans la table Produits."
+        )
+
+        return
+
+    for suffix, value in zip(CASCADE_KEYS, levels):
+        st.session_state[f"{prefix}_{suffix}"] = value or PLACEHOLDER
+
+    st.session_state[f"{prefix}_code_status"] = (
+        True,
+        " / ".join(level for level in levels if level)
+    )
+
+
+@profiling.profiled("cascade produits")
+def product_cascade(
+    df_products,
+    prefix="product"
+):
+
+    if df_products.empty:
+
+        st.warning(
+            "La table Produits est vide."
+        )
+
+        return (
+            PLACEHOLDER,
+            PLACEHOLDER,
+            PLACEHOLDER,
+            PLACEHOLDER,
+            PLACEHOLDER
+        )
+
+    # -----------------------------------------------------
+    # CODE-BARRES (si la table Produits en contient)
+    # -----------------------------------------------------
+
+    if product_code_index(df_products):
+
+        st.text_input(
+            "🔖 Code-barres / EAN",
+            placeholder="Scanner ou saisir le code, puis Entrée",
+            key=f"{prefix}_code",
+            on_change=apply_product_code,
+            args=(df_products, prefix)
+        )
+
+        status = st.session_state.get(f"{prefix}_code_status")
+
+        if status:
+
+            found, message = status
+
+            if found:
+                st.caption(f"✅ {message}")
+            else:
+                st.warning(message)
+
+    # -----------------------------------------------------
+    # MARQUE
+    # -----------------------------------------------------
+
+    marque = st.selectbox(
+        "Marque",
+        [PLACEHOLDER]
+        + cascade_options(
+            df_products,
+            "Marque"
+        ),
+        key=f"{prefix}_marque"
+    )
+
+    # -----------------------------------------------------
+    # CATEGORIE
+    # -----------------------------------------------------
+
+    categorie = st.selectbox(
+        "Catégorie",
+        [PLACEHOLDER]
+        + cascade_options(
+            df_products,
+            "Catégorie",
+            marque=marque
+        ),
+        key=f"{prefix}_categorie"
+    )
+
+    # -----------------------------------------------------
+    # FAMILLE
+    # -----------------------------------------------------
+
+    famille = st.selectbox(
+        "Famille",
+        [PLACEHOLDER]
+        + cascade_options(
+            df_products,
+            "Famille",
+            marque=marque,
+            categorie=categorie
+        ),
+        key=f"{prefix}_famille"
+    )
+
+    # -----------------------------------------------------
+    # PRODUIT
+    # -----------------------------------------------------
+
+    produit = st.selectbox(
+        "Produit",
+        [PLACEHOLDER]
+        + cascade_options(
+            df_products,
+            "Produit",
+            marque=marque,
+            categorie=categorie,
+            famille=famille
+        ),
+        key=f"{prefix}_produit"
+    )
+
+    # -----------------------------------------------------
+    # CAPACITE / DIMENSION
+    # -----------------------------------------------------
+
+    capacite = st.selectbox(
+        "Capacité / Dimension",
+        [PLACEHOLDER]
+        + cascade_options(
+            df_products,
+            "Capacité_Dimension",
+            marque=marque,
+            categorie=categorie,
+            famille=famille,
+            produit=produit
+        ),
+        key=f"{prefix}_capacite"
+    )
+
+    return (
+        marque,
+        categorie,
+        famille,
+        produit,
+        capacite
+    )
+
+
+# =========================================================
+# DERNIER RELEVE
+# =========================================================
+
+def show_last_reading(last, column, current, label):
+
+    # last : projections.last_reading. Rappelle la valeur du
+    # dernier relevé du produit dans le POS et l'écart de la
+    # saisie en cours.
+    if last is None:
+
+        st.caption(
+            "🕘 Premier relevé de ce produit dans ce POS."
+        )
+
+        return
+
+    date, values = last
+
+    previous = pd.to_numeric(
+        values.get(column),
+        errors="coerce"
+    )
+
+    if pd.isna(previous):
+
+        st.caption(
+            f"🕘 Dernier relevé le {date}."
+        )
+
+        return
+
+    text = (
+        f"🕘 Dernier relevé le {date} : "
+        f"{label} {previous:,.0f}".replace(",", " ")
+    )
+
+    promo = pd.to_numeric(
+        values.get("Prix_Promo"),
+        errors="coerce"
+    )
+
+    if not pd.isna(promo) and promo > 0:
+        text += f" (promo {promo:,.0f})".replace(",", " ")
+
+    if current and previous > 0:
+        text += f" → {(current - previous) / previous:+.1%}"
+
+    st.caption(text)
+
+
+# =========================================================
+# CHOIX DU POINT DE VENTE
+# =========================================================
+
+# Recherche par ID, nom, commune ou wilaya (data_info.search)
+# et filtre Wilaya -> Commune : le sélecteur ne reçoit que les
+# POS_PICKER_LIMIT premiers résultats, pas toute la table.
+# Renvoie l'ID_POS choisi ou PLACEHOLDER, comme l'ancien
+# selectbox.
+
+POS_PICKER_LIMIT = 50
+
+POS_ALL = "Toutes"
+
+
+@profiling.profiled("choix POS")
+def pos_picker(
+    df_pos,
+    key,
+    label="Point de vente"
+):
+
+    index = pos_index(df_pos)
+
+    col1, col2, col3 = st.columns([2, 1, 1])
+
+    with col1:
+
+        query = st.text_input(
+            "🔎 Rechercher un POS",
+            placeholder="ID, nom, commune…",
+            key=f"{key}_search"
+        )
+
+    with col2:
+
+        wilaya = st.selectbox(
+            "Wilaya",
+            [POS_ALL]
+            + index.wilayas(),
+            key=f"{key}_wilaya"
+        )
+
+    with col3:
+
+        commune = st.selectbox(
+            "Commune",
+            [POS_ALL]
+            + (
+                index.communes(wilaya)
+                if wilaya != POS_ALL
+                else []
+            ),
+            key=f"{key}_commune"
+        )
+
+    ids, total = index.search(
+        query,
+        wilaya=wilaya if wilaya != POS_ALL else "",
+        commune=commune if commune != POS_ALL else "",
+        limit=POS_PICKER_LIMIT
+    )
+
+    # Le POS déjà choisi reste sélectionnable même s'il sort
+    # des résultats.
+    current = st.session_state.get(key)
+
+    if (
+        current
+        and current != PLACEHOLDER
+        and current in index
+        and current not in ids
+    ):
+        ids = [current] + ids
+
+    selected = st.selectbox(
+        label,
+        [PLACEHOLDER]
+        + ids,
+        format_func=lambda pos: (
+            pos
+            if pos == PLACEHOLDER
+            else index.label(pos)
+        ),
+        key=key
+    )
+
+    if total > POS_PICKER_LIMIT:
+
+        st.caption(
+            f"{total} POS correspondants, "
+            f"{POS_PICKER_LIMIT} premiers affichés : "
+            f"précisez la recherche."
+        )
+
+    elif query and not total:
+
+        st.caption(
+            "Aucun POS ne correspond à la recherche."
+        )
+
+    return selected
+
+
+# =========================================================
+# SAISIE EN GRILLE
+# =========================================================
+
+# Une fois le POS, la marque et la catégorie choisis, tous
+# les produits correspondants sont listés dans un tableau
+# éditable ; les lignes renseignées partent en un seul
+# append_rows.
+
+CAPTURE_MODES = [
+    "🧾 Produit par produit",
+    "📋 Grille (tous les produits)"
+]
+
+GRID_ALL_FAMILIES = "Toutes les familles"
+
+
+def capture_mode(prefix):
+
+    return st.radio(
+        "Mode de saisie",
+        CAPTURE_MODES,
+        horizontal=True,
+        key=f"{prefix}_mode"
+    )
+
+
+def grid_selection(df_products, prefix):
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+
+        marque = st.selectbox(
+            "Marque",
+            [PLACEHOLDER]
+            + cascade_options(
+                df_products,
+                "Marque"
+            ),
+            key=f"{prefix}_grid_marque"
+        )
+
+    with col2:
+
+        categorie = st.selectbox(
+            "Catégorie",
+            [PLACEHOLDER]
+            + cascade_options(
+                df_products,
+                "Catégorie",
+                marque=marque
+            ),
+            key=f"{prefix}_grid_categorie"
+        )
+
+    with col3:
+
+        famille = st.selectbox(
+            "Famille",
+            [GRID_ALL_FAMILIES]
+            + cascade_options(
+                df_products,
+                "Famille",
+                marque=marque,
+                categorie=categorie
+            ),
+            key=f"{prefix}_grid_famille"
+        )
+
+    if famille == GRID_ALL_FAMILIES:
+        famille = ""
+
+    return marque, categorie, famille
+
+
+@profiling.profiled("grille produits")
+def product_grid(
+    df_products,
+    prefix,
+    marque,
+    categorie,
+    famille,
+    columns
+):
+
+    # columns : {colonne: (valeur initiale, st.column_config)}.
+    # Les colonnes produit sont en lecture seule.
+
+    data = grid_products(
+        df_products,
+        marque,
+        categorie,
+        famille
+    )
+
+    for column, (default, _) in columns.items():
+        data[column] = default
+
+    # Nouvelle clé à chaque sélection et après chaque envoi :
+    # les saisies ne glissent pas d'une liste à l'autre.
+    runs = st.session_state.get(
+        f"{prefix}_grid_runs",
+        0
+    )
+
+    return st.data_editor(
+        data,
+        column_config={
+            "Capacité_Dimension": "Capacité / Dimension",
+            **{
+                column: config
+                for column, (_, config) in columns.items()
+            }
+        },
+        disabled=GRID_COLUMNS,
+        hide_index=True,
+        num_rows="fixed",
+        use_container_width=True,
+        key=f"{prefix}_grid_{runs}_{marque}_{categorie}_{famille}"
+    )
+
+
+def grid_saved(prefix, count):
+
+    st.session_state[f"{prefix}_grid_runs"] = (
+        st.session_state.get(f"{prefix}_grid_runs", 0) + 1
+    )
+
+    st.success(
+        f"✅ {count} relevé(s) enregistré(s)."
+    )
+
+    time.sleep(1)
+
+    st.rerun()
+
+
+# =========================================================
+# PHOTOS
+# =========================================================
+
+# Photos Matériel / Contrôle : stockées dans le magasin local
+# (data_info.photos), la colonne Photo reçoit leur hash. La
+# galerie n'est construite qu'à la demande, page par page, à
+# partir des vignettes.
+
+PHOTO_PAGE_SIZE = 12
+
+PHOTO_COLUMNS = 4
+
+
+def store_uploaded_photo(photo):
+
+    # Renvoie "" sans photo, le hash si elle est enregistrée,
+    # None (message affiché) si elle est refusée.
+    if photo is None:
+        return ""
+
+    try:
+
+        return photos.store_photo(photo)
+
+    except ValueError as e:
+
+        st.error(
+            f"❌ Photo refusée ({photo.name}) : {e}"
+        )
+
+    except OSError as e:
+
+        st.error(
+            f"❌ Photo non enregistrée sur le disque : {e}"
+        )
+
+    return None
+
+
+@st.fragment
+@profiling.profiled("galerie photos")
+def photo_gallery(df, prefix, caption_columns):
+
+    if not st.toggle(
+        "📷 Afficher les photos",
+        key=f"{prefix}_photos"
+    ):
+        return
+
+    if "Photo" not in df.columns:
+
+        st.info(
+            "Aucune photo."
+        )
+
+        return
+
+    # Plus récentes d'abord.
+    with_photo = df[
+        df["Photo"].map(photos.is_photo_hash)
+    ].iloc[::-1]
+
+    if with_photo.empty:
+
+        st.info(
+            "Aucune photo enregistrée."
+        )
+
+        return
+
+    pages = (len(with_photo) - 1) // PHOTO_PAGE_SIZE + 1
+
+    page = st.number_input(
+        f"Page (sur {pages})",
+        min_value=1,
+        max_value=pages,
+        value=1,
+        step=1,
+        key=f"{prefix}_photos_page"
+    )
+
+    shown = with_photo.iloc[
+        (page - 1) * PHOTO_PAGE_SIZE:page * PHOTO_PAGE_SIZE
+    ]
+
+    columns = st.columns(PHOTO_COLUMNS)
+
+    for i, row in enumerate(shown.to_dict("records")):
+
+        with columns[i % PHOTO_COLUMNS]:
+
+            caption = " | ".join(
+                str(row.get(column, ""))
+                for column in caption_columns
+            )
+
+            thumbnail = photos.thumbnail_path(
+                row["Photo"]
+            )
+
+            if thumbnail is None:
+
+                st.caption(
+                    f"📷 {caption} (photo absente de ce serveur)"
+                )
+
+                continue
+
+            st.image(
+                thumbnail,
+                caption=caption,
+                use_container_width=True
+            )
+
+            if st.button(
+                "🔍 Agrandir",
+                key=f"{prefix}_photo_{page}_{i}"
+            ):
+                st.session_state[f"{prefix}_photo_open"] = row["Photo"]
+
+    opened = photos.full_path(
+        st.session_state.get(f"{prefix}_photo_open")
+    )
+
+    if opened:
+
+        st.image(
+            opened,
+            use_container_width=True
+        )
+
+
+# =========================================================
+# SESSION
+# =========================================================
+
+def init_session():
+
+    if "logged_in" not in st.session_state:
+        st.session_state.logged_in = False
+
+    if "role" not in st.session_state:
+        st.session_state.role = ""
+
+    if "user_name" not in st.session_state:
+        st.session_state.user_name = ""
+
+    if "user_id" not in st.session_state:
+        st.session_state.user_id = ""
+
+
+def logout():
+
+    st.session_state.logged_in = False
+    st.session_state.role = ""
+    st.session_state.user_name = ""
+    st.session_state.user_id = ""
+
+    st.rerun()
+
+
+# =========================================================
+# PROFILAGE
+# =========================================================
+
+# Mode développeur : ?profile=1 pour un administrateur, ou
+# rôle listé dans le réglage profiling_roles. Chaque rerun
+# est chronométré par section (chargement, cascade, appels
+# API, graphiques...) avec le pic mémoire tracemalloc, et
+# les derniers runs s'exportent en Chrome trace.
+
+PROFILING_ROLES = "developpeur"
+
+PROFILE_HISTORY = 30
+
+
+def profiling_enabled():
+
+    flag = str(
+        st.query_params.get("profile", "")
+    ).lower()
+
+    if flag in ("0", "false"):
+        return False
+
+    roles = [
+        role.strip()
+        for role in str(
+            setting(
+                "profiling_roles",
+                PROFILING_ROLES
+            )
+        ).split(",")
+    ]
+
+    if st.session_state.role in roles:
+        return True
+
+    return (
+        flag in ("1", "true")
+        and st.session_state.role == "admin"
+    )
+
+
+def finish_profile(interrupted=False):
+
+    profile = st.session_state.pop(
+        "active_profile",
+        None
+    )
+
+    if profile is None:
+        return
+
+    runs = st.session_state.setdefault(
+        "profile_runs",
+        []
+    )
+
+    runs.append(
+        profile.finish(interrupted)
+    )
+
+    del runs[:-PROFILE_HISTORY]
+
+
+@contextmanager
+def profiled_rerun():
+
+    # Rerun profilé (mode profilage) : clos dans tous les cas,
+    # un rerun sans suite (session fermée après st.stop()) ne
+    # laisse pas tracemalloc actif pour tout le processus.
+    if profiling_enabled():
+
+        st.session_state.active_profile = profiling.start()
+
+    try:
+
+        yield
+
+    except BaseException:
+
+        finish_profile(interrupted=True)
+
+        raise
+
+    finish_profile()
+
+
+def show_profiling_sidebar():
+
+    runs = st.session_state.get(
+        "profile_runs",
+        []
+    )
+
+    with st.sidebar.expander(
+        "⏱️ Profilage",
+        expanded=False
+    ):
+
+        if not runs:
+
+            st.caption(
+                "Aucun rerun terminé pour l'instant."
+            )
+
+            return
+
+        last = runs[-1]
+
+        st.caption(
+            f"Dernier rerun : {last['label'] or '-'} — "
+            f"{last['duration'] * 1000:.0f} ms, "
+            f"pic mémoire du processus {last['peak_memory'] / 2**20:.1f} Mo"
+            + (
+                " (partagé avec d'autres reruns profilés)"
+                if last.get("peak_shared")
+                else ""
+            )
+            + (" (interrompu)" if last["interrupted"] else "")
+        )
+
+        st.dataframe(
+            pd.DataFrame(
+                profiling.section_totals(last)
+            ),
+            use_container_width=True,
+            hide_index=True
+        )
+
+        st.download_button(
+            f"📥 Chrome trace ({len(runs)} runs)",
+            profiling.chrome_trace(runs),
+            file_name="data_info_trace.json",
+            mime="application/json",
+            use_container_width=True
+        )
+
+        if st.button(
+            "🗑️ Vider",
+            use_container_width=True,
+            key="clear_profile_runs"
+        ):
+
+            st.session_state.profile_runs = []
+
+            st.rerun()
@@ -0,0 +1,66 @@
+from data_info import benchmark
+from data_info.benchmark import (
+    build_cases,
+    compare,
+    load_previous,
+    save
+)
+from data_info.synthetic import generate_tables
+
+
+def test_every_case_runs_on_small_tables():
+
+    cases = build_cases(generate_tables(rows=200, seed=1))
+
+    assert cases
+
+    for case, func in cases.items():
+        func()
+
+
+def test_run_measures_selected_cases(monkeypatch):
+
+    monkeypatch.setattr(benchmark, "git_commit", lambda: "abc1234")
+
+    results = benchmark.run([200], repeat=1, only="price_outlier")
+
+    assert [result["case"] for result in results] == [
+        "price_outlier_scoring"
+    ]
+
+    assert results[0]["commit"] == "abc1234"
+
+    assert results[0]["median_ms"] >= 0
+
+
+def test_compare_flags_regressions():
+
+    previous = {
+        ("a", 100): {"median_ms": 10.0},
+        ("b", 100): {"median_ms": 10.0}
+    }
+
+    results = [
+        {"case": "a", "rows": 100, "median_ms": 13.0},
+        {"case": "b", "rows": 100, "median_ms": 11.0},
+        {"case": "c", "rows": 100, "median_ms": 1.0}
+    ]
+
+    regressions = compare(results, previous)
+
+    assert [result["case"] for result in regressions] == ["a"]
+
+    assert [result["ratio"] for result in results] == [1.3, 1.1, None]
+
+
+def test_saved_results_are_reloaded(tmp_path):
+
+    path = str(tmp_path / "bench" / "results.jsonl")
+
+    save([{"case": "a", "rows": 100, "median_ms": 1.0}], path)
+
+    save([{"case": "a", "rows": 100, "median_ms": 2.0}], path)
+
+    # Le dernier résultat de chaque (cas, lignes) sert de
+    # référence.
+    assert load_previous(path)[("a", 100)]["median_ms"] == 2.0
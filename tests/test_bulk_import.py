@@ -0,0 +1,203 @@
+from datetime import date
+
+import pandas as pd
+
+from data_info.bulk_import import (
+    ALREADY_IMPORTED,
+    validate,
+    validate_columns
+)
+from data_info.schema import SHEET_COLUMNS, SHEET_POS, SHEET_PRICES
+
+
+POS = pd.DataFrame({"ID_POS": ["POS-1", "POS-2"]})
+
+PRODUCTS = pd.DataFrame(
+    [["Condor", "TV", "LED", "X1", "43"]],
+    columns=["Marque", "Catégorie", "Famille", "Produit", "Capacité_Dimension"]
+)
+
+TODAY = date(2024, 4, 1)
+
+
+def price_file(*rows):
+
+    return pd.DataFrame(
+        [
+            {
+                "ID_POS": "POS-1",
+                "Marque": "Condor",
+                "Catégorie": "TV",
+                "Famille": "LED",
+                "Produit": "X1",
+                "Capacité_Dimension": "43",
+                "Prix_Vente": "1000",
+                "Date_Releve": "",
+                **row
+            }
+            for row in rows
+        ]
+    )
+
+
+def check(df):
+
+    return validate(SHEET_PRICES, df, POS, PRODUCTS, "U1", TODAY)
+
+
+def errors(report):
+
+    return list(zip(report["Ligne"], report["Colonne"], report["Erreur"]))
+
+
+def test_valid_rows_follow_sheet_columns():
+
+    records, report = check(
+        price_file({"Date_Releve": "15/03/2024", "Promotion": "oui"})
+    )
+
+    assert report.empty
+
+    [row] = records
+
+    columns = SHEET_COLUMNS[SHEET_PRICES]
+
+    values = dict(zip(columns, row))
+
+    assert values["Date_Releve"] == "2024-03-15"
+
+    assert values["Prix_Vente"] == 1000.0
+
+    assert values["Promotion"] is True
+
+    assert values["ID_User"] == "U1"
+
+    assert values["ID_Releve"]
+
+
+def test_empty_date_defaults_to_today():
+
+    [row], _ = check(price_file({}))
+
+    assert row[1] == "2024-04-01"
+
+
+def test_invalid_rows_are_reported_by_line():
+
+    records, report = check(
+        price_file(
+            {},
+            {"ID_POS": "POS-9"},
+            {"Prix_Vente": "abc"},
+            {"Produit": "X9"},
+            {"Date_Releve": "32/13/2024"}
+        )
+    )
+
+    assert len(records) == 1
+
+    assert errors(report) == [
+        (3, "ID_POS", "POS inconnu"),
+        (4, "Prix_Vente", "nombre invalide"),
+        (5, "Produit", "Produit inconnu(e) pour Marque / Catégorie / Famille"),
+        (6, "Date_Releve", "date invalide")
+    ]
+
+
+def test_price_must_be_positive():
+
+    records, report = check(
+        price_file({"Prix_Vente": "0"}, {"Prix_Vente": ""})
+    )
+
+    assert records == []
+
+    assert errors(report) == [
+        (2, "Prix_Vente", "doit être supérieur à 0"),
+        (3, "Prix_Vente", "valeur obligatoire")
+    ]
+
+
+def test_duplicate_ids_are_rejected():
+
+    records, report = check(
+        price_file({"ID_Releve": "REL-1"}, {"ID_Releve": "REL-1"})
+    )
+
+    assert records == []
+
+    assert set(report["Erreur"]) == {"identifiant en double dans le fichier"}
+
+
+def test_generated_ids_are_stable_across_imports():
+
+    file = price_file({}, {}, {"Prix_Vente": "2000"})
+
+    first, _ = check(file)
+
+    second, _ = check(file)
+
+    ids = [row[0] for row in first]
+
+    assert ids == [row[0] for row in second]
+
+    assert len(set(ids)) == 3
+
+
+def test_rows_already_in_sheet_are_skipped():
+
+    file = price_file({}, {"Prix_Vente": "2000"})
+
+    [imported, _], _ = check(file)
+
+    records, report = validate(
+        SHEET_PRICES,
+        file,
+        POS,
+        PRODUCTS,
+        "U1",
+        TODAY,
+        existing_ids=[imported[0]]
+    )
+
+    assert [row[0] for row in records] != [imported[0]]
+
+    assert len(records) == 1
+
+    assert errors(report) == [(2, "ID_Releve", ALREADY_IMPORTED)]
+
+
+def test_validate_columns_checks_header_and_keys():
+
+    records, report = validate_columns(
+        SHEET_POS,
+        pd.DataFrame(
+            {
+                "ID_POS": ["POS-1", "", "POS-3", "POS-3"],
+                "Wilaya": ["Alger", "Oran", "Blida", "Blida"]
+            }
+        )
+    )
+
+    assert records == [{"ID_POS": "POS-1", "Wilaya": "Alger"}]
+
+    assert errors(report) == [
+        (3, "ID_POS", "valeur obligatoire"),
+        (4, "ID_POS", "identifiant en double dans le fichier"),
+        (5, "ID_POS", "identifiant en double dans le fichier")
+    ]
+
+
+def test_validate_columns_rejects_unknown_columns():
+
+    records, report = validate_columns(
+        SHEET_POS,
+        pd.DataFrame({"Wilaya": ["Alger"], "Bogus": ["x"]})
+    )
+
+    assert records == []
+
+    assert errors(report) == [
+        (1, "Bogus", "colonne inconnue de la feuille"),
+        (1, "ID_POS", "colonne absente du fichier")
+    ]
@@ -0,0 +1,127 @@
+import pandas as pd
+import pytest
+
+from data_info import catalog, core
+from data_info.catalog import (
+    PRODUCT_ID,
+    ProductCodec,
+    ProductDictionary
+)
+from data_info.schema import SHEET_COLUMNS, SHEET_PRICES
+
+
+PRODUCTS = pd.DataFrame(
+    [
+        ["Condor", "TV", "LED", "X1", "43", "", "PRD-0000001"],
+        ["Condor", "TV", "LED", "X2", "55", "", "PRD-0000002"]
+    ],
+    columns=[
+        "Marque",
+        "Catégorie",
+        "Famille",
+        "Produit",
+        "Capacité_Dimension",
+        "Code_EAN",
+        PRODUCT_ID
+    ]
+)
+
+COLUMNS = SHEET_COLUMNS[SHEET_PRICES]
+
+
+@pytest.fixture
+def headers(monkeypatch):
+
+    # En-tête de la feuille lu par encode (core.read_headers).
+    sheet = {"headers": list(COLUMNS)}
+
+    monkeypatch.setattr(
+        core,
+        "read_headers",
+        lambda sheet_name, version=None: sheet["headers"]
+    )
+
+    monkeypatch.setattr(core, "get_spreadsheet_version", lambda: "v1")
+
+    monkeypatch.setattr(
+        catalog,
+        "current_dictionary",
+        lambda: ProductDictionary(PRODUCTS)
+    )
+
+    return sheet
+
+
+def price_row(product):
+
+    return [
+        "REL-1", "2024-04-01", "POS-1",
+        "Condor", "TV", "LED", product, "43",
+        1000, 0, False, "", "U1"
+    ]
+
+
+def test_encode_replaces_labels_with_product_id(headers):
+
+    [row] = ProductCodec(SHEET_PRICES).encode([price_row("X1")])
+
+    assert row[COLUMNS.index(PRODUCT_ID)] == "PRD-0000001"
+
+    assert row[3:8] == [""] * 5
+
+    assert row[8] == 1000
+
+
+def test_encode_keeps_unknown_products(headers):
+
+    rows = [price_row("X9")]
+
+    assert ProductCodec(SHEET_PRICES).encode(rows) == rows
+
+
+def test_encode_uses_the_sheet_id_column(headers):
+
+    # Colonne ajoutée à la main avant ID_Produit.
+    headers["headers"] = COLUMNS[:-1] + ["Note", PRODUCT_ID]
+
+    [row] = ProductCodec(SHEET_PRICES).encode([price_row("X1")])
+
+    assert row[len(COLUMNS)] == "PRD-0000001"
+
+    assert row[len(COLUMNS) - 1] == ""
+
+
+def test_encode_refuses_moved_levels(headers):
+
+    headers["headers"] = ["Marque"] + [
+        column
+        for column in COLUMNS
+        if column != "Marque"
+    ]
+
+    with pytest.raises(ValueError):
+        ProductCodec(SHEET_PRICES).encode([price_row("X1")])
+
+
+def test_encode_without_id_column_is_a_no_op(headers):
+
+    headers["headers"] = COLUMNS[:-1]
+
+    rows = [price_row("X1")]
+
+    assert ProductCodec(SHEET_PRICES).encode(rows) == rows
+
+
+def test_decode_restores_labels(headers):
+
+    encoded = ProductCodec(SHEET_PRICES).encode(
+        [price_row("X1"), price_row("X9")]
+    )
+
+    df = ProductCodec(SHEET_PRICES).decode(
+        pd.DataFrame(encoded, columns=COLUMNS)
+    )
+
+    assert df["Produit"].tolist() == ["X1", "X9"]
+
+    assert df["Marque"].tolist() == ["Condor", "Condor"]
@@ -0,0 +1,208 @@
+import pytest
+import requests
+from google.auth.exceptions import TransportError
+
+from data_info import core
+from data_info.core import (
+    CircuitBreaker,
+    ClientPool,
+    RetryPolicy,
+    SheetsUnavailable,
+    is_outage
+)
+
+
+class Flaky:
+
+    # Échoue `failures` fois avec `error`, puis renvoie "ok".
+
+    def __init__(self, failures, error):
+
+        self.failures = failures
+        self.error = error
+        self.calls = 0
+
+    def __call__(self):
+
+        self.calls += 1
+
+        if self.calls <= self.failures:
+            raise self.error
+
+        return "ok"
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+
+    delays = []
+
+    monkeypatch.setattr(core.time, "sleep", delays.append)
+
+    return delays
+
+
+def policy(**kwargs):
+
+    return RetryPolicy(
+        retry_statuses=[429, 503],
+        network_errors=[requests.exceptions.ConnectionError],
+        **kwargs
+    )
+
+
+# ---------- RetryPolicy ----------
+
+def test_retry_policy_retries_network_errors(no_sleep):
+
+    func = Flaky(2, requests.exceptions.ConnectionError())
+
+    assert policy().call(func) == "ok"
+
+    assert func.calls == 3
+
+    assert len(no_sleep) == 2
+
+
+def test_retry_policy_does_not_retry_other_errors(no_sleep):
+
+    func = Flaky(1, ValueError("400"))
+
+    with pytest.raises(ValueError):
+        policy().call(func)
+
+    assert func.calls == 1
+
+    assert no_sleep == []
+
+
+def test_retry_policy_gives_up_after_max_attempts(no_sleep):
+
+    func = Flaky(10, requests.exceptions.ConnectionError())
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        policy(max_attempts=3).call(func)
+
+    assert func.calls == 3
+
+
+def test_retry_policy_delays_stay_under_the_cap():
+
+    retry = policy(base_delay=1.0, max_delay=4.0)
+
+    error = requests.exceptions.ConnectionError()
+
+    for attempt in range(6):
+        assert 0 <= retry.next_delay(attempt, error) <= 4.0
+
+
+# ---------- CircuitBreaker ----------
+
+def test_breaker_opens_after_threshold():
+
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+
+    func = Flaky(10, requests.exceptions.ConnectionError())
+
+    for _ in range(2):
+
+        with pytest.raises(requests.exceptions.ConnectionError):
+            breaker.call(func)
+
+    with pytest.raises(SheetsUnavailable):
+        breaker.call(func)
+
+    assert func.calls == 2
+
+
+def test_breaker_ignores_functional_errors():
+
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+
+    with pytest.raises(ValueError):
+        breaker.call(Flaky(1, ValueError("404")))
+
+    assert breaker.is_closed()
+
+
+def test_breaker_closes_after_successful_probe(monkeypatch):
+
+    monkeypatch.setattr(core, "on_backend_recovered", lambda: None)
+
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        breaker.call(Flaky(1, requests.exceptions.ConnectionError()))
+
+    assert breaker.state == "open"
+
+    assert breaker.call(lambda: "ok") == "ok"
+
+    assert breaker.is_closed()
+
+
+# ---------- pannes ----------
+
+def http_error(status):
+
+    response = requests.Response()
+
+    response.status_code = status
+
+    return requests.exceptions.HTTPError(response=response)
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        requests.exceptions.ConnectionError(),
+        requests.exceptions.ReadTimeout(),
+        TransportError("oauth2.googleapis.com"),
+        http_error(500),
+        http_error(502),
+        http_error(429),
+        SheetsUnavailable("circuit ouvert")
+    ]
+)
+def test_outages(error):
+
+    assert is_outage(error)
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        http_error(400),
+        http_error(403),
+        ValueError("ligne invalide")
+    ]
+)
+def test_functional_errors_are_not_outages(error):
+
+    assert not is_outage(error)
+
+
+class DownCredentials:
+
+    valid = False
+
+    def refresh(self, request):
+        raise TransportError("oauth2.googleapis.com")
+
+
+def test_token_refresh_failures_open_the_breaker(monkeypatch, no_sleep):
+
+    core.get_breaker.clear()
+
+    monkeypatch.setattr(core, "BREAKER_FAILURE_THRESHOLD", 1)
+
+    pool = ClientPool(DownCredentials(), size=1)
+
+    with pytest.raises(TransportError):
+        pool.refresh_token()
+
+    with pytest.raises(SheetsUnavailable):
+        pool.refresh_token()
+
+    core.get_breaker.clear()
+
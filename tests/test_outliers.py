@@ -0,0 +1,192 @@
+import pandas as pd
+import pytest
+
+from data_info import outliers, projections, search
+from data_info.outliers import (
+    cached_scores,
+    check_price,
+    score_prices,
+    suspect_prices
+)
+from data_info.projections import record_written
+from data_info.schema import SHEET_PRICES
+from data_info.transforms import SHEET_VERSION, pos_wilayas
+
+
+PRODUCT = {
+    "Marque": "Condor",
+    "Catégorie": "TV",
+    "Famille": "LED",
+    "Produit": "X1",
+    "Capacité_Dimension": "43"
+}
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+
+    projections.get_projection_store()["views"].clear()
+
+    outliers.get_scores_cache()["scores"].clear()
+
+    search.get_search_cache()["indexes"].clear()
+
+    yield
+
+    projections.get_projection_store()["views"].clear()
+
+    outliers.get_scores_cache()["scores"].clear()
+
+    search.get_search_cache()["indexes"].clear()
+
+
+def price_rows(prices):
+
+    return pd.DataFrame(
+        [
+            {
+                "ID_Releve": f"REL-{index}",
+                "ID_POS": f"POS-{index % 3}",
+                **PRODUCT,
+                "Date_Releve": "2024-04-01",
+                "Prix_Vente": price
+            }
+            for index, price in enumerate(prices)
+        ]
+    )
+
+
+POS = pd.DataFrame(
+    {
+        "ID_POS": ["POS-0", "POS-1", "POS-2"],
+        "Wilaya": ["Alger", "Alger", "Oran"]
+    }
+)
+
+KEY = tuple(PRODUCT.values())
+
+
+def test_score_prices_flags_an_extra_zero():
+
+    scored = score_prices(
+        price_rows([1000, 1010, 990, 1005, 995, 10000])
+    )
+
+    assert scored["Suspect"].tolist() == [False] * 5 + [True]
+
+    assert scored["Mediane"].iloc[0] == 1002.5
+
+    assert suspect_prices(scored)["Prix_Vente"].tolist() == [10000]
+
+
+def test_score_prices_needs_enough_readings():
+
+    scored = score_prices(price_rows([1000, 1010, 10000]))
+
+    assert not scored["Suspect"].any()
+
+
+def test_score_prices_ignores_empty_prices():
+
+    scored = score_prices(price_rows([1000, 0, "", 1010]))
+
+    assert scored["Prix_Vente"].tolist() == [1000, 1010]
+
+
+def test_score_prices_by_wilaya():
+
+    scored = score_prices(
+        price_rows([1000] * 6),
+        POS,
+        by_wilaya=True
+    )
+
+    assert scored["Wilaya"].tolist() == ["Alger", "Alger", "Oran"] * 2
+
+
+def test_check_price_against_product_history():
+
+    df = price_rows([1000, 1010, 990, 1005, 995, 1000])
+
+    result = check_price(df, POS, "POS-2", KEY, 10000)
+
+    assert result["suspect"]
+
+    assert result["readings"] == 6
+
+    # Oran n'a que deux relevés : comparaison à tous les POS.
+    assert result["scope"] == "tous POS"
+
+    assert not check_price(df, POS, "POS-2", KEY, 1020)["suspect"]
+
+
+def test_check_price_unknown_product():
+
+    df = price_rows([1000] * 6)
+
+    assert check_price(df, POS, "POS-1", ("Autre",) * 5, 1000) is None
+
+
+def test_cached_scores_reuse_until_the_sheet_changes():
+
+    df = price_rows([1000, 1010, 990, 1005, 995, 10000])
+
+    scored = cached_scores(df)
+
+    assert cached_scores(df) is scored
+
+    assert scored["Suspect"].tolist() == [False] * 5 + [True]
+
+    record_written(
+        SHEET_PRICES,
+        price_rows([1000] * 7).iloc[6:].to_dict("records")
+    )
+
+    assert cached_scores(df) is not scored
+
+
+def pos_sheet():
+
+    # Copie de la feuille POS telle que rendue par
+    # st.cache_data : nouvel objet, même version.
+    df = POS.copy()
+
+    df.attrs[SHEET_VERSION] = ("POS", "v1", 1.0)
+
+    return df
+
+
+def test_wilayas_are_computed_once_per_pos_version(monkeypatch):
+
+    builds = []
+
+    def counted(df_pos):
+
+        builds.append(len(df_pos))
+
+        return pos_wilayas(df_pos)
+
+    monkeypatch.setattr(outliers, "pos_wilayas", counted)
+
+    df = price_rows([1000, 1010, 990, 1005, 995, 1000])
+
+    # Saisie en grille : une vérification par ligne remplie.
+    for price in [1000, 1020, 10000]:
+        check_price(df, pos_sheet(), "POS-1", KEY, price)
+
+    assert builds == [3]
+
+
+def test_cached_scores_hit_does_not_reread_pos(monkeypatch):
+
+    df = price_rows([1000] * 6)
+
+    scored = cached_scores(df, pos_sheet(), by_wilaya=True)
+
+    def no_hash(*args, **kwargs):
+        pytest.fail("feuille POS relue")
+
+    monkeypatch.setattr(pd.util, "hash_pandas_object", no_hash)
+
+    assert cached_scores(df, pos_sheet(), by_wilaya=True) is scored
+
@@ -0,0 +1,105 @@
+import hashlib
+import io
+import os
+
+import pytest
+from PIL import Image
+
+from data_info import photos
+from data_info.photos import (
+    file_digest,
+    photo_path,
+    store_photo,
+    thumbnail_path
+)
+
+
+@pytest.fixture(autouse=True)
+def photo_dir(tmp_path, monkeypatch):
+
+    monkeypatch.setattr(photos, "photo_dir", lambda: str(tmp_path))
+
+    return tmp_path
+
+
+def upload(size, fmt):
+
+    buffer = io.BytesIO()
+
+    Image.new("RGB", size, (200, 30, 30)).save(buffer, fmt)
+
+    buffer.seek(0)
+
+    return buffer
+
+
+def leftovers(directory):
+
+    return [
+        name
+        for _, _, files in os.walk(directory)
+        for name in files
+        if ".tmp" in name
+    ]
+
+
+def test_small_jpeg_is_stored_as_uploaded(photo_dir):
+
+    source = upload((640, 480), "JPEG")
+
+    digest = store_photo(source)
+
+    assert digest == hashlib.sha256(source.getvalue()).hexdigest()
+
+    assert file_digest(photo_path(digest)) == digest
+
+    assert leftovers(photo_dir) == []
+
+
+def test_recompressed_photo_is_named_after_the_stored_bytes(photo_dir):
+
+    source = upload((3000, 2000), "PNG")
+
+    digest = store_photo(source)
+
+    assert digest != hashlib.sha256(source.getvalue()).hexdigest()
+
+    assert file_digest(photo_path(digest)) == digest
+
+    with Image.open(photo_path(digest)) as image:
+
+        assert image.format == "JPEG"
+
+        assert max(image.size) == photos.MAX_SIDE
+
+    # Même envoi : même photo.
+    assert store_photo(upload((3000, 2000), "PNG")) == digest
+
+    assert leftovers(photo_dir) == []
+
+
+def test_thumbnail_is_created_on_demand():
+
+    digest = store_photo(upload((640, 480), "JPEG"))
+
+    with Image.open(thumbnail_path(digest)) as image:
+        assert max(image.size) == photos.THUMB_SIDE
+
+
+def test_unreadable_file_is_refused(photo_dir):
+
+    with pytest.raises(ValueError, match="illisible"):
+        store_photo(io.BytesIO(b"pas une image"))
+
+    assert leftovers(photo_dir) == []
+
+
+def test_decompression_bomb_is_refused(photo_dir, monkeypatch):
+
+    # Au-delà de 2 × MAX_IMAGE_PIXELS, Pillow refuse l'image.
+    monkeypatch.setattr(Image, "MAX_IMAGE_PIXELS", 1000)
+
+    with pytest.raises(ValueError, match="trop grande"):
+        store_photo(upload((100, 100), "PNG"))
+
+    assert leftovers(photo_dir) == []
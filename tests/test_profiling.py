@@ -0,0 +1,79 @@
+import tracemalloc
+
+import pytest
+
+from data_info import profiling
+from data_info.profiling import RerunProfile
+
+
+@pytest.fixture(autouse=True)
+def no_tracing():
+
+    assert not tracemalloc.is_tracing()
+
+    yield
+
+    profiling.detach()
+
+
+def test_finished_run_stops_tracemalloc():
+
+    profile = RerunProfile("Statistiques")
+
+    assert tracemalloc.is_tracing()
+
+    result = profile.finish()
+
+    assert not tracemalloc.is_tracing()
+
+    assert result["peak_memory"] > 0
+
+    assert not result["peak_shared"]
+
+
+def test_overlapping_runs_report_a_shared_peak():
+
+    first = RerunProfile("Statistiques")
+
+    second = RerunProfile("Prix")
+
+    assert first.finish()["peak_shared"]
+
+    assert tracemalloc.is_tracing()
+
+    second.finish()
+
+    assert not tracemalloc.is_tracing()
+
+
+def test_later_run_marks_the_earlier_peak_as_shared():
+
+    first = RerunProfile("Statistiques")
+
+    RerunProfile("Prix").finish()
+
+    assert first.finish()["peak_shared"]
+
+
+def test_sections_and_marks_are_recorded():
+
+    profile = profiling.start("Prix", trace_memory=False)
+
+    profiling.mark("chargement")
+
+    with profiling.section("load_sheet POS", cache="hit"):
+        pass
+
+    profiling.mark("graphiques")
+
+    run = profile.finish(interrupted=True)
+
+    assert [event["name"] for event in run["events"]] == [
+        "chargement",
+        "load_sheet POS",
+        "graphiques"
+    ]
+
+    assert run["interrupted"]
+
+    assert profiling.current() is None
@@ -0,0 +1,101 @@
+import pandas as pd
+import pytest
+
+from data_info import projections
+from data_info.projections import (
+    PRICE_HISTORY,
+    READINGS,
+    record_written,
+    refresh_view
+)
+from data_info.schema import SHEET_PRICES
+
+
+PRODUCT = {
+    "Marque": "Condor",
+    "Catégorie": "TV",
+    "Famille": "LED",
+    "Produit": "X1",
+    "Capacité_Dimension": "43"
+}
+
+
+@pytest.fixture(autouse=True)
+def empty_store():
+
+    projections.get_projection_store()["views"].clear()
+
+    yield
+
+    projections.get_projection_store()["views"].clear()
+
+
+def price_rows(dates, prices):
+
+    return pd.DataFrame(
+        [
+            {
+                "ID_Releve": f"REL-{index}",
+                "ID_POS": "POS-1",
+                **PRODUCT,
+                "Date_Releve": date,
+                "Prix_Vente": price
+            }
+            for index, (date, price) in enumerate(zip(dates, prices))
+        ]
+    )
+
+
+def test_appended_legacy_reading_does_not_replace_newer():
+
+    df = price_rows(["2024-04-01"], [1200])
+
+    refresh_view(READINGS, SHEET_PRICES, df)
+
+    # Historique importé ensuite, plus ancien mais « plus
+    # grand » en texte.
+    df = price_rows(["2024-04-01", "15/03/2024"], [1200, 1100])
+
+    view = refresh_view(READINGS, SHEET_PRICES, df)
+
+    [(date, values)] = view["records"].values()
+
+    assert date == "2024-04-01"
+
+    assert values["Prix_Vente"] == 1200
+
+
+def test_written_reading_is_not_counted_again_on_refetch():
+
+    df = price_rows(["2024-04-01"] * 6, [1000] * 6)
+
+    refresh_view(PRICE_HISTORY, SHEET_PRICES, df)
+
+    # Envoi depuis ce processus (core.WRITE_HOOKS), puis
+    # rechargement de la feuille qui contient la même ligne.
+    written = price_rows(["2024-04-01"] * 7, [1000] * 6 + [1500])
+
+    record_written(SHEET_PRICES, written.iloc[6:].to_dict("records"))
+
+    view = refresh_view(PRICE_HISTORY, SHEET_PRICES, written)
+
+    [(pos, prices)] = view["records"].values()
+
+    assert len(prices) == 7
+
+    assert prices.tolist().count(1500) == 1
+
+
+def test_replayed_duplicate_reading_counts_once():
+
+    df = price_rows(["2024-04-01"] * 3, [1000, 1100, 1200])
+
+    view = refresh_view(
+        PRICE_HISTORY,
+        SHEET_PRICES,
+        pd.concat([df, df.iloc[2:]], ignore_index=True)
+    )
+
+    [(pos, prices)] = view["records"].values()
+
+    assert prices.tolist() == [1000, 1100, 1200]
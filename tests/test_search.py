@@ -0,0 +1,98 @@
+import pandas as pd
+import pytest
+
+from data_info import search
+from data_info.search import cached_index
+from data_info.transforms import SHEET_VERSION
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+
+    search.get_search_cache()["indexes"].clear()
+
+    yield
+
+    search.get_search_cache()["indexes"].clear()
+
+
+def pos_sheet(names, fetched_at=1.0):
+
+    df = pd.DataFrame(
+        {
+            "ID_POS": [f"POS-{i}" for i in range(len(names))],
+            "Nom_POS": names
+        }
+    )
+
+    df.attrs[SHEET_VERSION] = ("POS", "v1", fetched_at)
+
+    return df
+
+
+class Builds:
+
+    def __init__(self):
+
+        self.count = 0
+
+    def __call__(self, df):
+
+        self.count += 1
+
+        return df["Nom_POS"].tolist()
+
+
+def test_same_sheet_version_is_a_hit_without_reading_the_table(monkeypatch):
+
+    build = Builds()
+
+    cached_index("pos", pos_sheet(["A", "B"]), ["Nom_POS"], build)
+
+    def no_hash(*args, **kwargs):
+        pytest.fail("table relue pour trouver l'index")
+
+    monkeypatch.setattr(pd.util, "hash_pandas_object", no_hash)
+
+    # Nouvel objet (st.cache_data), même lecture de la feuille.
+    assert cached_index(
+        "pos",
+        pos_sheet(["A", "B"]),
+        ["Nom_POS"],
+        build
+    ) == ["A", "B"]
+
+    assert build.count == 1
+
+
+def test_refetched_sheet_rebuilds():
+
+    build = Builds()
+
+    cached_index("pos", pos_sheet(["A"]), ["Nom_POS"], build)
+
+    assert cached_index(
+        "pos",
+        pos_sheet(["A", "C"], fetched_at=2.0),
+        ["Nom_POS"],
+        build
+    ) == ["A", "C"]
+
+    assert build.count == 2
+
+
+def test_frames_without_version_fall_back_to_content():
+
+    build = Builds()
+
+    df = pd.DataFrame({"Nom_POS": ["A"]})
+
+    cached_index("pos", df, ["Nom_POS"], build)
+
+    cached_index("pos", df.copy(), ["Nom_POS"], build)
+
+    assert build.count == 1
+
+    cached_index("pos", pd.DataFrame({"Nom_POS": ["B"]}), ["Nom_POS"], build)
+
+    assert build.count == 2
@@ -0,0 +1,228 @@
+import json
+
+import pytest
+import requests
+
+from data_info import core
+from data_info.schema import SHEET_POS, SHEET_PRICES
+
+
+@pytest.fixture
+def spool(tmp_path, monkeypatch):
+
+    # File locale dans tmp_path, feuilles simulées : present
+    # liste les ID_* déjà dans la feuille, sent les écritures.
+    monkeypatch.setattr(core, "SPOOL_PATH", str(tmp_path / "spool.jsonl"))
+
+    monkeypatch.setattr(
+        core,
+        "SPOOL_REJECTED_PATH",
+        str(tmp_path / "spool_rejected.jsonl")
+    )
+
+    for cached in [core.get_spool_lock, core.get_spool_flush, core.get_breaker]:
+        cached.clear()
+
+    state = {
+        "present": set(),
+        "sent": [],
+        "error": None
+    }
+
+    def read_key_values(sheet_name, key_column, headers=None):
+        return list(state["present"])
+
+    def write(sheet_name, payload):
+
+        if state["error"] is not None:
+            raise state["error"]
+
+        state["sent"].append((sheet_name, payload))
+
+    monkeypatch.setattr(core, "read_key_values", read_key_values)
+    monkeypatch.setattr(core, "write_row", write)
+    monkeypatch.setattr(core, "write_rows", write)
+    monkeypatch.setattr(core, "write_dict_row", write)
+    monkeypatch.setattr(core, "write_dict_rows", write)
+
+    yield state
+
+    for cached in [core.get_spool_lock, core.get_spool_flush, core.get_breaker]:
+        cached.clear()
+
+
+def price_row(key):
+
+    return [key, "2024-04-01", "POS-1", "Condor"]
+
+
+def test_spool_write_records_idempotency_keys(spool):
+
+    core.spool_write(SHEET_PRICES, row=price_row("REL-1"))
+
+    core.spool_write(
+        SHEET_PRICES,
+        rows=[price_row("REL-2"), price_row("REL-3")]
+    )
+
+    items = core.read_spool()
+
+    assert [item["keys"] for item in items] == [
+        ["REL-1"],
+        ["REL-2", "REL-3"]
+    ]
+
+    assert len({item["id"] for item in items}) == 2
+
+    assert core.spool_size() == 3
+
+
+def test_replay_skips_rows_already_in_the_sheet(spool):
+
+    core.spool_write(SHEET_PRICES, row=price_row("REL-1"))
+
+    core.spool_write(
+        SHEET_PRICES,
+        rows=[price_row("REL-2"), price_row("REL-3")]
+    )
+
+    # REL-1 et REL-2 sont arrivés avant la coupure.
+    spool["present"] = {"REL-1", "REL-2"}
+
+    assert core.replay_spool() == 3
+
+    assert spool["sent"] == [(SHEET_PRICES, [price_row("REL-3")])]
+
+    assert core.read_spool() == []
+
+
+def test_replay_sends_each_key_once(spool):
+
+    core.spool_write(SHEET_PRICES, row=price_row("REL-1"))
+
+    core.spool_write(SHEET_PRICES, row=price_row("REL-1"))
+
+    core.replay_spool()
+
+    assert spool["sent"] == [(SHEET_PRICES, price_row("REL-1"))]
+
+
+def test_replay_keeps_items_during_an_outage(spool):
+
+    core.spool_write(SHEET_PRICES, row=price_row("REL-1"))
+
+    spool["error"] = core.SheetsUnavailable("circuit ouvert")
+
+    assert core.replay_spool() == 0
+
+    assert len(core.read_spool()) == 1
+
+
+def test_send_row_spools_on_network_errors(spool):
+
+    # Coupure pendant l'écriture : la ligne a pu arriver, le
+    # rejeu le vérifiera sur l'ID_Releve.
+    spool["error"] = requests.exceptions.ReadTimeout()
+
+    assert core.send_row(SHEET_PRICES, price_row("REL-1")) == core.SPOOLED
+
+    assert [item["keys"] for item in core.read_spool()] == [["REL-1"]]
+
+    spool["error"] = None
+
+    spool["present"] = {"REL-1"}
+
+    assert core.replay_spool() == 1
+
+    assert spool["sent"] == []
+
+
+def test_dict_records_are_spooled_with_their_keys(spool, monkeypatch):
+
+    # En-tête réel dans un autre ordre que SHEET_COLUMNS : la
+    # clé est lue par nom. Circuit ouvert : l'en-tête n'est
+    # même pas lu.
+    monkeypatch.setattr(
+        core,
+        "read_headers",
+        lambda sheet_name, version=None: pytest.fail("en-tête lu")
+    )
+
+    core.get_breaker().state = "open"
+
+    core.get_breaker().opened_at = core.time.time()
+
+    records = [
+        {"Wilaya": "Alger", "ID_POS": "POS-1"},
+        {"Wilaya": "Oran", "ID_POS": "POS-2"}
+    ]
+
+    assert core.append_dict_rows(SHEET_POS, records) == {
+        core.SENT: 0,
+        core.SPOOLED: 2
+    }
+
+    [item] = core.read_spool()
+
+    assert item["keys"] == ["POS-1", "POS-2"]
+
+    assert core.spool_size() == 2
+
+    core.get_breaker().state = "closed"
+
+    spool["present"] = {"POS-1"}
+
+    assert core.replay_spool() == 2
+
+    assert spool["sent"] == [(SHEET_POS, records[1:])]
+
+
+def test_dict_row_outage_spools_the_record(spool, monkeypatch):
+
+    def cut(sheet_name, values):
+        raise requests.exceptions.ConnectionError()
+
+    monkeypatch.setattr(core, "write_dict_row", cut)
+
+    values = {"Wilaya": "Alger", "ID_POS": "POS-1"}
+
+    assert core.send_dict_row(SHEET_POS, values) == core.SPOOLED
+
+    [item] = core.read_spool()
+
+    assert item["values"] == values
+
+    assert item["keys"] == ["POS-1"]
+
+
+def test_replay_sets_rejected_items_aside(spool, tmp_path):
+
+    core.spool_write(SHEET_POS, values={"ID_POS": "POS-9"})
+
+    spool["error"] = ValueError("feuille supprimée")
+
+    assert core.replay_spool() == 0
+
+    assert core.read_spool() == []
+
+    [rejected] = [
+        json.loads(line)
+        for line in open(tmp_path / "spool_rejected.jsonl")
+    ]
+
+    assert rejected["values"] == {"ID_POS": "POS-9"}
+
+    assert "feuille supprimée" in rejected["error"]
+
+
+def test_flush_spool_is_throttled(spool):
+
+    core.spool_write(SHEET_PRICES, row=price_row("REL-1"))
+
+    assert core.flush_spool() == 1
+
+    core.spool_write(SHEET_PRICES, row=price_row("REL-2"))
+
+    assert core.flush_spool() == 0
+
+    assert core.flush_spool(force=True) == 1
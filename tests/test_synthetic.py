@@ -0,0 +1,51 @@
+from data_info.schema import (
+    SHEET_COLUMNS,
+    SHEET_POS,
+    SHEET_PRICES,
+    SHEET_PRODUCTS
+)
+from data_info.synthetic import (
+    ean13,
+    generate_tables
+)
+
+
+def test_tables_follow_sheet_columns():
+
+    tables = generate_tables(rows=200, seed=1)
+
+    assert set(tables) == set(SHEET_COLUMNS)
+
+    for name, df in tables.items():
+        assert list(df.columns) == SHEET_COLUMNS[name]
+
+    assert len(tables[SHEET_PRICES]) == 200
+
+
+def test_tables_are_reproducible_per_seed():
+
+    first = generate_tables(rows=200, seed=7)
+
+    assert first[SHEET_PRICES].equals(
+        generate_tables(rows=200, seed=7)[SHEET_PRICES]
+    )
+
+    assert not first[SHEET_PRICES].equals(
+        generate_tables(rows=200, seed=8)[SHEET_PRICES]
+    )
+
+
+def test_facts_reference_known_pos_and_products():
+
+    tables = generate_tables(rows=200, seed=1)
+
+    prices = tables[SHEET_PRICES]
+
+    assert prices["ID_POS"].isin(tables[SHEET_POS]["ID_POS"]).all()
+
+    assert prices["Marque"].isin(tables[SHEET_PRODUCTS]["Marque"]).all()
+
+
+def test_ean13_check_digit():
+
+    assert ean13(400638133393) == "4006381333931"
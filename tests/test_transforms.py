@@ -0,0 +1,105 @@
+import pandas as pd
+
+from data_info.transforms import (
+    columns_to_frame,
+    iso_dates,
+    last_readings
+)
+
+
+PRODUCT = {
+    "Marque": "Condor",
+    "Catégorie": "TV",
+    "Famille": "LED",
+    "Produit": "X1",
+    "Capacité_Dimension": "43"
+}
+
+
+def readings(dates, prices):
+
+    return pd.DataFrame(
+        [
+            {
+                "ID_POS": "POS-1",
+                **PRODUCT,
+                "Date_Releve": date,
+                "Prix_Vente": price
+            }
+            for date, price in zip(dates, prices)
+        ]
+    )
+
+
+def test_columns_to_frame_pads_truncated_columns():
+
+    # majorDimension COLUMNS : l'API coupe les cellules vides
+    # en fin de colonne.
+    df = columns_to_frame(
+        [
+            ["ID_POS", "POS-1", "POS-2", "POS-3"],
+            [" Wilaya ", "Alger"],
+            [],
+            ["Remarque"]
+        ]
+    )
+
+    assert list(df.columns) == ["ID_POS", "Wilaya", "Remarque"]
+
+    assert df["Wilaya"].tolist() == ["Alger", "", ""]
+
+    assert df["Remarque"].tolist() == ["", "", ""]
+
+
+def test_columns_to_frame_empty_sheet():
+
+    assert columns_to_frame([]).empty
+
+
+def test_iso_dates_reads_legacy_formats():
+
+    dates = iso_dates(
+        pd.Series(["2024-03-15", "15/03/2024", "05-01-2023", "n/a"])
+    )
+
+    assert dates.tolist()[:3] == ["2024-03-15", "2024-03-15", "2023-01-05"]
+
+    assert pd.isna(dates.iloc[3])
+
+
+def test_last_readings_compares_parsed_dates():
+
+    # En texte, "15/03/2024" > "2024-04-01" : le relevé
+    # importé l'emporterait à tort.
+    latest = last_readings(
+        readings(
+            ["2024-04-01", "15/03/2024", "01/02/2024"],
+            [1200, 1100, 1000]
+        ),
+        "Date_Releve",
+        ["Prix_Vente"]
+    )
+
+    [(date, values)] = latest.values()
+
+    assert date == "2024-04-01"
+
+    assert values["Prix_Vente"] == 1200
+
+
+def test_last_readings_legacy_date_wins_when_newer():
+
+    latest = last_readings(
+        readings(
+            ["2024-03-01", "20/03/2024"],
+            [1200, 1300]
+        ),
+        "Date_Releve",
+        ["Prix_Vente"]
+    )
+
+    [(date, values)] = latest.values()
+
+    assert date == "2024-03-20"
+
+    assert values["Prix_Vente"] == 1300